@@ -0,0 +1,13 @@
+"""
+benchmarks – medições de desempenho do lang_hybrid_pdf.
+
+Não faz parte do pacote instalado; rode a partir da raiz do repositório:
+
+    python -m benchmarks --pages 10 50 --baseline baseline.json
+    python -m benchmarks.bench_classify --pages 50
+    python -m benchmarks.bench_adaptive --pages 10
+    python -m benchmarks.bench_raster --pages 10 --dpi 300
+    python -m benchmarks.bench_blocks --pages 10 --blocks 5000
+    python -m benchmarks.bench_dedup --chunks 1000 10000 30000
+    python -m benchmarks.bench_region --pages 6 --slices 4 12 24
+"""
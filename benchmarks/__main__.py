@@ -0,0 +1,52 @@
+"""
+Ponto de entrada da suíte de benchmark.
+
+    python -m benchmarks --pages 10 50 --out results.json
+    python -m benchmarks --pages 10 --baseline baseline.json   # falha se regredir
+    python -m benchmarks --pages 10 --save-baseline baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+
+from .suite import KINDS, STAGES, compare, run_suite
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks")
+    ap.add_argument("--pages", type=int, nargs="+", default=[10])
+    ap.add_argument("--stages", nargs="+", choices=sorted(STAGES))
+    ap.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    ap.add_argument("--out", help="grava o JSON de resultados neste arquivo")
+    ap.add_argument("--baseline", help="JSON de referência para comparar")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="piora relativa aceita (default 0.2 = 20 %%)")
+    ap.add_argument("--save-baseline", help="grava os resultados como baseline")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(tmp, args.pages, args.stages, args.kinds)
+
+    payload = json.dumps(results, indent=2)
+    print(payload)
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as fh:
+            fh.write(payload)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            problems = compare(results, json.load(fh), args.tolerance)
+        if problems:
+            print("\n❌ REGRESSÕES DE DESEMPENHO:", file=sys.stderr)
+            for p in problems:
+                print("  • " + p, file=sys.stderr)
+            return 1
+        print("\n✅ Sem regressões em relação ao baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+bench_adaptive.py – DPI adaptativo × DPI fixo: vazão e acurácia do OCR.
+
+Para PDFs 100 % imagem (pipeline "plain") e híbridos (OCR por bloco do
+HybridPDFLoader) em vários tamanhos de fonte, mede segundos, páginas/s,
+pixels enviados ao Tesseract, DPI escolhido e a similaridade (rapidfuzz
+ratio, 0–100) entre o texto OCR e o texto-verdade de cada página.
+
+    python -m benchmarks.bench_adaptive --pages 10 --fontsizes 8 11 16
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.image_layout_ocr import iter_layout_ocr_from_pdf
+from lang_hybrid_pdf.stats import Stats
+
+from .synth import make_pdf, page_text
+
+_WS = re.compile(r"\s+")
+
+
+def _norm(text: str) -> str:
+    return _WS.sub(" ", text).strip()
+
+
+def _docs(path: Path, kind: str, adaptive: bool, stats: Stats):
+    if kind == "image":
+        return list(iter_layout_ocr_from_pdf(str(path), pipeline="plain",
+                                             stats=stats, adaptive_dpi=adaptive))
+    return HybridPDFLoader(str(path), stats=stats, adaptive_dpi=adaptive,
+                           block_gate=None).load()
+
+
+def _run(path: Path, kind: str, pages: int, adaptive: bool) -> dict:
+    stats = Stats()
+    t0 = time.perf_counter()
+    docs = _docs(path, kind, adaptive, stats)
+    elapsed = time.perf_counter() - t0
+
+    by_page: dict[int, list[str]] = defaultdict(list)
+    for d in docs:
+        p = d.metadata["page"]
+        if kind == "image" or p % 2 == 0:              # híbrido: pares = imagem
+            by_page[p].append(d.page_content)
+    scores = [fuzz.ratio(_norm(" ".join(parts)), _norm(page_text(p)))
+              for p, parts in by_page.items()]
+
+    counters = stats.snapshot()["counters"]
+    return {
+        "seconds":    round(elapsed, 3),
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else None,
+        "ocr_calls":  int(counters.get("ocr.calls", 0)),
+        "ocr_mpixels": round(counters.get("ocr.pixels", 0) / 1e6, 2),
+        "dpi_calls":  {k.rsplit("_", 1)[1]: int(v) for k, v in counters.items()
+                       if k.startswith("ocr.calls.dpi_")},
+        "accuracy":   round(sum(scores) / len(scores), 2) if scores else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, default=6,
+                    help="páginas dos PDFs sintéticos")
+    ap.add_argument("--fontsizes", type=float, nargs="+", default=[8, 11, 16],
+                    help="tamanhos de fonte do texto rasterizado")
+    args = ap.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.fontsizes:
+            for kind in ("image", "hybrid"):
+                path = make_pdf(Path(tmp) / f"{kind}_{size:g}pt.pdf", kind,
+                                args.pages, fontsize=size)
+                for mode, adaptive in (("fixed", False), ("adaptive", True)):
+                    rows.append({"file": path.name, "kind": kind, "mode": mode,
+                                 **_run(path, kind, args.pages, adaptive)})
+
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+bench_blocks.py – custo de memória/GC dos blocos de páginas híbridas.
+
+Monta páginas com muitos blocos pequenos (rótulos, cotas, repetições –
+típico de desenho de engenharia) e compara o pós-processamento do loader:
+
+• documents  – um Document por bloco → `adjust_chunks_to_token_limit` →
+               dedup (caminho antigo)
+• blockstore – `BlockStore` → `chunk_spans` → dedup → Document só na saída
+
+Por modo: segundos, pico de alocações Python (tracemalloc), nº de coletas
+e tempo gasto no GC (`gc.callbacks`) e Documents emitidos.
+
+    python -m benchmarks.bench_blocks --pages 20 --blocks 5000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from lang_hybrid_pdf.blocks import (
+    NATIVE,
+    OCR_SRC,
+    BlockStore,
+    chunk_spans,
+    span_document,
+    span_text,
+)
+from lang_hybrid_pdf.helpers import adjust_chunks_to_token_limit, fingerprint
+
+WORDS = ("cota", "eixo", "viga", "pilar", "laje", "ø12", "CA-50", "detalhe",
+         "corte", "A-A", "escala", "1:50", "nota", "revisão", "fundação")
+
+
+def _make_stores(pages: int, blocks: int, seed: int = 0) -> list[BlockStore]:
+    rnd = random.Random(seed)
+    stores = []
+    for pno in range(1, pages + 1):
+        store = BlockStore()
+        for i in range(blocks):
+            text = " ".join(rnd.choices(WORDS, k=rnd.randint(1, 6)))
+            x, y = rnd.uniform(0, 2000), rnd.uniform(0, 1400)
+            bbox = (x, y, x + rnd.uniform(10, 200), y + rnd.uniform(5, 30))
+            if i % 7 == 0:
+                store.add(pno, bbox, text, OCR_SRC, conf=rnd.uniform(60, 95), dpi=300)
+            else:
+                store.add(pno, bbox, text, NATIVE)
+        stores.append(store)
+    return stores
+
+
+def _documents(stores, token_limit):
+    seen, out = set(), 0
+    for store in stores:
+        docs = [store.document(i) for i in range(len(store))]
+        for d in adjust_chunks_to_token_limit(docs, token_limit):
+            fp = fingerprint(d.page_content)
+            if fp not in seen:
+                seen.add(fp)
+                out += 1
+    return out
+
+
+def _blockstore(stores, token_limit):
+    seen, out = set(), 0
+    for store in stores:
+        for span in chunk_spans(store, token_limit):
+            fp = fingerprint(span_text(store, span))
+            if fp not in seen:
+                seen.add(fp)
+                span_document(store, span)
+                out += 1
+    return out
+
+
+def _run(fn, pages: int, blocks: int, token_limit: int | None) -> dict:
+    gc_time, gc_runs, started = 0.0, 0, [0.0]
+
+    def on_gc(phase, info):
+        nonlocal gc_time, gc_runs
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            gc_time += time.perf_counter() - started[0]
+            gc_runs += 1
+
+    gc.collect()
+    tracemalloc.start()
+    gc.callbacks.append(on_gc)
+    t0 = time.perf_counter()
+    # os blocos nascem aqui, como no loader (não vêm pré-montados)
+    emitted = fn(_make_stores(pages, blocks), token_limit)
+    elapsed = time.perf_counter() - t0
+    gc.callbacks.remove(on_gc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds":    round(elapsed, 3),
+        "py_peak_mb": round(peak / 2**20, 2),
+        "gc_runs":    gc_runs,
+        "gc_ms":      round(gc_time * 1000, 1),
+        "emitted":    emitted,
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--blocks", type=int, default=5000, help="blocos por página")
+    ap.add_argument("--token-limit", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    rows = [
+        {"mode": name, "pages": args.pages, "blocks": args.blocks,
+         "token_limit": args.token_limit,
+         **_run(fn, args.pages, args.blocks, args.token_limit)}
+        for name, fn in (("documents", _documents), ("blockstore", _blockstore))
+    ]
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+bench_classify.py – classificação em camadas × OCR rápido em toda página.
+
+Mede, para cada PDF (tests/data + sintéticos), latência, nº de páginas
+que passaram pelo OCR rápido, páginas inferidas por orçamento, a menor
+confiança por página e se o `kind` bate com o esperado.
+
+    python -m benchmarks.bench_classify --pages 1000 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from lang_hybrid_pdf.extractor_router import fast_classify
+from lang_hybrid_pdf.stats import Stats
+
+from .synth import make_corpus
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "tests" / "data"
+EXPECTED = {
+    "texto_total.pdf": "text",
+    "ocr_total.pdf":   "image",
+    "ocr_e_texto.pdf": "hybrid",
+}
+
+
+def _run(path: Path, tiered: bool, workers: int) -> dict:
+    stats = Stats()
+    t0 = time.perf_counter()
+    res = fast_classify(str(path), tiered=tiered, workers=workers, stats=stats)
+    elapsed = time.perf_counter() - t0
+    counters = stats.snapshot()["counters"]
+    return {
+        "kind": res.kind,
+        "seconds": round(elapsed, 4),
+        "quick_ocr_pages": int(counters.get("classify.quick_ocr_pages", 0)),
+        "inferred_pages": int(counters.get("classify.inferred_pages", 0)),
+        "min_confidence": round(res.confidence, 3),
+        "labelled_pages": len(res.labels),
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, default=30,
+                    help="páginas dos PDFs sintéticos")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="threads de OCR rápido no modo paralelo")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {p.name: (p, EXPECTED[p.name]) for p in
+                 (DATA_DIR / n for n in EXPECTED)}
+        for kind, p in make_corpus(tmp, args.pages).items():
+            cases[p.name] = (p, kind)
+
+        rows = []
+        for name, (path, expected) in cases.items():
+            for mode, tiered, workers in (("quick_ocr_all", False, 1),
+                                          ("tiered", True, 1),
+                                          ("tiered_parallel", True, args.workers)):
+                r = _run(path, tiered, workers)
+                rows.append({"file": name, "mode": mode, "expected": expected,
+                             "correct": r["kind"] == expected, **r})
+
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+bench_dedup.py – dedup de chunks: fingerprint (prefixo) × MinHash + LSH.
+
+Corpus sintético com gabarito:
+
+• chunks distintos (vocabulário grande, comprimentos variados)
+• distintos com o MESMO cabeçalho longo (ex.: "CLÁUSULA … DO OBJETO…")
+  – o fingerprint de 120 caracteres os descarta por engano
+• duplicatas exatas e duplicatas "OCR × nativo" (1–3 % de caracteres
+  trocados, omitidos ou com pontuação extra)
+
+Por método: recall (duplicatas descartadas), descartes errados,
+segundos e chunks/s. `fuzz_bruteforce` (fuzz.ratio ≥ 90 contra tudo,
+O(n²)) é a referência de qualidade e só roda até `--brute-max` chunks.
+
+    python -m benchmarks.bench_dedup --chunks 1000 10000 30000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from rapidfuzz import fuzz, process
+
+from lang_hybrid_pdf.dedup import NearDupIndex
+from lang_hybrid_pdf.helpers import fingerprint
+
+_CONS = "bcdfghjlmnpqrstvxz"
+_VOW  = "aeiouáéíóúãõâêô"
+_HEADER = ("PREFEITURA MUNICIPAL – SECRETARIA DE ADMINISTRAÇÃO. Contrato "
+           "administrativo de prestação de serviços nº 045/2024, firmado entre "
+           "as partes abaixo qualificadas: ")
+
+
+def _words(rnd: random.Random, n: int) -> list[str]:
+    syl = [c + v for c in _CONS for v in _VOW] + list(_VOW)
+    return ["".join(rnd.choices(syl, k=rnd.randint(1, 4))) for _ in range(n)]
+
+
+def _noise(rnd: random.Random, text: str, rate: float) -> str:
+    out = []
+    for ch in text:
+        r = rnd.random()
+        if r < rate / 3:
+            continue                                     # letra perdida
+        if r < 2 * rate / 3:
+            out.append(rnd.choice("ilrnmoce1"))          # troca típica de OCR
+        elif r < rate:
+            out.extend((ch, rnd.choice(".,'| ")))        # sujeira
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def make_chunks(n: int, seed: int = 0) -> tuple[list[str], list[bool]]:
+    """(chunks, é_duplicata_de_um_anterior) – ~20 % duplicatas."""
+    rnd   = random.Random(seed)
+    vocab = _words(rnd, 5000)
+    texts: list[str] = []
+    dup:   list[bool] = []
+    for i in range(n):
+        r = rnd.random()
+        if texts and r < 0.08:
+            texts.append(rnd.choice([t for t, d in zip(texts[-200:], dup[-200:]) if not d]
+                                    or texts[-1:]))
+            dup.append(True)
+        elif texts and r < 0.20:
+            base = rnd.choice([t for t, d in zip(texts[-200:], dup[-200:]) if not d]
+                              or texts[-1:])
+            texts.append(_noise(rnd, base, rnd.uniform(0.01, 0.03)))
+            dup.append(True)
+        else:
+            body = " ".join(rnd.choices(vocab, k=rnd.randint(15, 120)))
+            head = _HEADER if r > 0.85 else ""      # timbre repetido
+            texts.append(head + body + ".")
+            dup.append(False)
+    return texts, dup
+
+
+# ----------------------------------------------------------------------
+def _fingerprint(texts):
+    seen: set[str] = set()
+    out = []
+    for t in texts:
+        fp = fingerprint(t)
+        out.append(fp in seen)
+        seen.add(fp)
+    return out
+
+
+def _minhash(texts):
+    index = NearDupIndex()
+    return [index.add(t) is not None for t in texts]
+
+
+def _bruteforce(texts):
+    kept: list[str] = []
+    out = []
+    for t in texts:
+        hit = kept and process.extractOne(t, kept, scorer=fuzz.ratio,
+                                          processor=None, score_cutoff=90)
+        out.append(bool(hit))
+        if not hit:
+            kept.append(t)
+    return out
+
+
+def _score(dropped, truth, seconds) -> dict:
+    dups   = sum(truth)
+    hits   = sum(d and t for d, t in zip(dropped, truth))
+    wrong  = sum(d and not t for d, t in zip(dropped, truth))
+    return {
+        "seconds":       round(seconds, 3),
+        "chunks_per_s":  round(len(truth) / seconds) if seconds else None,
+        "recall":        round(hits / dups, 3) if dups else None,
+        "false_drops":   wrong,
+        "false_drop_rate": round(wrong / (len(truth) - dups), 4),
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--chunks", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--brute-max", type=int, default=3000)
+    args = ap.parse_args(argv)
+
+    methods = {"fingerprint": _fingerprint, "minhash_lsh": _minhash,
+               "fuzz_bruteforce": _bruteforce}
+    rows = []
+    for n in args.chunks:
+        texts, truth = make_chunks(n)
+        for name, fn in methods.items():
+            if name == "fuzz_bruteforce" and n > args.brute_max:
+                continue
+            t0 = time.perf_counter()
+            dropped = fn(texts)
+            rows.append({"method": name, "chunks": n,
+                         **_score(dropped, truth, time.perf_counter() - t0)})
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_raster.py – bytes movidos por página entre PyMuPDF e o OCR.
+
+Compara o caminho antigo (Pixmap RGB → `Image.frombytes(pix.samples)` →
+PNG temporário do pytesseract) com `raster.render_pixmap` nos modos
+"rgb", "gray" e "binary" (Pixmap → PIL sem cópia → PNG). Por modo:
+segundos, MB entregues ao backend, MB de PNG gravados, pico de
+alocações Python (tracemalloc) e nº de blocos alocados que sobrevivem
+à página.
+
+    python -m benchmarks.bench_raster --pages 10 --dpi 300
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fitz                       # PyMuPDF
+from PIL import Image
+
+from lang_hybrid_pdf.ocr_backends import to_pil
+from lang_hybrid_pdf.raster import render_pixmap
+
+from .synth import make_pdf
+
+
+def _legacy(page: fitz.Page, dpi: int):
+    pix = page.get_pixmap(dpi=dpi)
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    return len(pix.samples), pix, img
+
+
+def _zero_copy(mode: str):
+    def run(page: fitz.Page, dpi: int):
+        pix = render_pixmap(page, dpi, mode=mode)
+        return pix.stride * pix.height, pix, to_pil(pix)
+    return run
+
+
+def _run(path: Path, dpi: int, fn) -> dict:
+    backend = png = 0
+    keep: list = []
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    with fitz.open(path) as doc:
+        for page in doc:
+            start = tracemalloc.take_snapshot()
+            nbytes, pix, img = fn(page, dpi)
+            buf = io.BytesIO()
+            img.save(buf, format="PNG")          # o que o pytesseract grava
+            keep.append((img, pix, buf))         # a imagem antes do Pixmap
+            blocks = sum(s.count_diff for s in
+                         tracemalloc.take_snapshot().compare_to(start, "filename"))
+            keep.clear()
+            backend += nbytes
+            png     += buf.tell()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds":    round(elapsed, 3),
+        "backend_mb": round(backend / 2**20, 2),
+        "png_mb":     round(png / 2**20, 2),
+        "py_peak_mb": round(peak / 2**20, 2),
+        "py_live_blocks": blocks,
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, default=6, help="páginas do PDF sintético")
+    ap.add_argument("--dpi", type=int, default=300)
+    args = ap.parse_args(argv)
+
+    modes = {"legacy_rgb": _legacy, **{m: _zero_copy(m) for m in ("rgb", "gray", "binary")}}
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_pdf(Path(tmp) / "image.pdf", "image", args.pages)
+        for name, fn in modes.items():
+            rows.append({"mode": name, "dpi": args.dpi, **_run(path, args.dpi, fn)})
+
+    base = rows[0]["backend_mb"] or 1
+    for r in rows:
+        r["bytes_vs_legacy"] = round(base / r["backend_mb"], 2) if r["backend_mb"] else None
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+bench_region.py – OCR bloco a bloco × página numa passada (region_ocr).
+
+PDFs "fatiados" (cada página = N faixas-imagem + cabeçalho nativo) pelo
+HybridPDFLoader com `region_ocr=None` (um render + um Tesseract por
+faixa) e com o modo página (um render mascarado + um `image_to_data`).
+Por caso: segundos, páginas/s, chamadas ao OCR, renderizações, Mpixels
+enviados e a similaridade (rapidfuzz ratio, 0–100) com o texto-verdade.
+
+    python -m benchmarks.bench_region --pages 6 --slices 4 12 24
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.settings import RegionCfg
+from lang_hybrid_pdf.stats import Stats
+
+from .synth import make_pdf, page_text
+
+_WS = re.compile(r"\s+")
+MODES = {"per_block": None, "page": RegionCfg(mode="page")}
+
+
+def _norm(text: str) -> str:
+    return _WS.sub(" ", text).strip()
+
+
+def _run(path: Path, pages: int, region: RegionCfg | None, workers: int) -> dict:
+    stats = Stats()
+    t0 = time.perf_counter()
+    docs = HybridPDFLoader(str(path), text_pages=[], ocr_pages=list(range(1, pages + 1)),
+                           block_gate=None, region_ocr=region, workers=workers,
+                           stats=stats).load()
+    elapsed = time.perf_counter() - t0
+
+    by_page: dict[int, list[str]] = defaultdict(list)
+    for d in docs:
+        if "Documento sintético" not in d.page_content:     # cabeçalho nativo
+            by_page[d.metadata["page"]].append(d.page_content)
+    scores = [fuzz.ratio(_norm(" ".join(parts)), _norm(page_text(p)))
+              for p, parts in by_page.items()]
+
+    snap = stats.snapshot()
+    counters = snap["counters"]
+    return {
+        "seconds":     round(elapsed, 3),
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else None,
+        "ocr_calls":   int(counters.get("ocr.calls", 0)),
+        "renders":     snap["stages"].get("render", {}).get("calls", 0),
+        "ocr_mpixels": round(counters.get("ocr.pixels", 0) / 1e6, 2),
+        "accuracy":    round(sum(scores) / len(scores), 2) if scores else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--pages", type=int, default=6, help="páginas do PDF sintético")
+    ap.add_argument("--slices", type=int, nargs="+", default=[4, 12, 24],
+                    help="faixas-imagem por página")
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.slices:
+            path = make_pdf(Path(tmp) / f"sliced_{n}.pdf", "sliced", args.pages, slices=n)
+            for mode, region in MODES.items():
+                rows.append({"slices": n, "mode": mode,
+                             **_run(path, args.pages, region, args.workers)})
+
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+suite.py – throughput/latência/memória das etapas de extração.
+
+Cada caso (etapa × tipo de PDF × nº de páginas) roda num processo
+novo, para que o pico de RSS seja só daquele caso. Métricas:
+
+• pages_per_sec        – páginas / tempo total
+• p50_ms / p95_ms      – latência por página; para etapas em streaming é
+                         o intervalo entre páginas concluídas, nas demais
+                         o tempo total rateado pelas páginas
+• peak_rss_mb          – pico de memória residente do processo
+
+Comparação com baseline: piora acima de `tolerance` em qualquer métrica
+(ou caso que passou a falhar) é regressão → código de saída 1.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from .synth import make_pdf
+
+KINDS = ("text", "image", "hybrid")
+
+# métricas e se “maior é melhor”
+METRICS = {
+    "pages_per_sec": True,
+    "p50_ms":        False,
+    "p95_ms":        False,
+    "peak_rss_mb":   False,
+}
+
+
+# ----------------------------------------------------------------------
+# Etapas: cada uma gera o nº da página (1-based) quando ela termina.
+def _pages_of(docs: Iterable, pages: int) -> Iterator[int]:
+    last = 0
+    for d in docs:
+        p = d.metadata.get("page")
+        if isinstance(p, int) and p > last:
+            for q in range(last + 1, p + 1):
+                yield q
+            last = p
+    for q in range(last + 1, pages + 1):
+        yield q
+
+
+def _stage_fast_classify(path: str, pages: int) -> Iterator[int]:
+    from lang_hybrid_pdf.extractor_router import fast_classify
+    fast_classify(path)
+    yield from range(1, pages + 1)
+
+
+def _stage_loader(path: str, pages: int) -> Iterator[int]:
+    from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+    yield from _pages_of(HybridPDFLoader(path).lazy_load(), pages)
+
+
+def _stage_docling(path: str, pages: int) -> Iterator[int]:
+    from lang_hybrid_pdf.text_docling import load_with_docling
+    load_with_docling(path)
+    yield from range(1, pages + 1)
+
+
+def _stage_layout(pipeline: str) -> Callable[[str, int], Iterator[int]]:
+    def run(path: str, pages: int) -> Iterator[int]:
+        from lang_hybrid_pdf.image_layout_ocr import iter_layout_ocr_from_pdf
+        docs = iter_layout_ocr_from_pdf(path, pipeline=pipeline)
+        if pipeline == "plain":
+            yield from _pages_of(docs, pages)
+        else:
+            list(docs)
+            yield from range(1, pages + 1)
+    return run
+
+
+STAGES: Dict[str, Callable[[str, int], Iterator[int]]] = {
+    "fast_classify":       _stage_fast_classify,
+    "loader":              _stage_loader,
+    "load_with_docling":   _stage_docling,
+    "layout_ocr[docling]": _stage_layout("docling"),
+    "layout_ocr[layout]":  _stage_layout("layout"),
+    "layout_ocr[plain]":   _stage_layout("plain"),
+}
+STREAMING = {"loader", "layout_ocr[plain]"}
+
+
+# ----------------------------------------------------------------------
+def _percentile(values: List[float], pct: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def _measure(stage: str, path: str, pages: int, out) -> None:
+    """Executado no processo filho."""
+    try:
+        per_page: List[float] = []
+        done = 0
+        t0 = last = time.perf_counter()
+        for _ in STAGES[stage](path, pages):
+            now = time.perf_counter()
+            per_page.append((now - last) * 1000)
+            last = now
+            done += 1
+        total = time.perf_counter() - t0
+
+        # etapas não-streaming entregam tudo de uma vez → rateia
+        if stage not in STREAMING and done:
+            per_page = [total * 1000 / done] * done
+
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":            # macOS reporta em bytes
+            rss_kb //= 1024
+        out.send({
+            "pages":         done,
+            "seconds":       round(total, 4),
+            "pages_per_sec": round(done / total, 3) if total else None,
+            "p50_ms":        round(_percentile(per_page, 50), 2),
+            "p95_ms":        round(_percentile(per_page, 95), 2),
+            "peak_rss_mb":   round(rss_kb / 1024, 1),
+        })
+    except ImportError as exc:
+        out.send({"skipped": str(exc).splitlines()[0]})
+    except Exception as exc:                    # pragma: no cover
+        out.send({"error": f"{type(exc).__name__}: {exc}"})
+
+
+def run_case(stage: str, path: str, pages: int, timeout: float = 3600) -> dict:
+    ctx = mp.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure, args=(stage, path, pages, send))
+    proc.start()
+    result = recv.recv() if recv.poll(timeout) else {"error": "timeout"}
+    proc.join(5)
+    if proc.is_alive():
+        proc.kill()
+    return result
+
+
+def run_suite(
+    work_dir: str | Path,
+    page_counts: Iterable[int],
+    stages: Iterable[str] | None = None,
+    kinds: Iterable[str] = KINDS,
+) -> Dict[str, dict]:
+    """Resultados indexados por “etapa/tipo/Np”."""
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, dict] = {}
+    for pages in page_counts:
+        for kind in kinds:
+            pdf = make_pdf(work_dir / f"bench_{kind}_{pages}p.pdf", kind, pages)
+            for stage in stages or STAGES:
+                key = f"{stage}/{kind}/{pages}p"
+                results[key] = run_case(stage, str(pdf), pages)
+                print(f"{key:45s} {results[key]}", file=sys.stderr)
+    return results
+
+
+# ----------------------------------------------------------------------
+def compare(current: Dict[str, dict], baseline: Dict[str, dict],
+            tolerance: float = 0.2) -> List[str]:
+    """Lista de regressões (vazia = ok)."""
+    problems: List[str] = []
+    for key, base in baseline.items():
+        cur = current.get(key)
+        if cur is None or "pages" not in base:
+            continue
+        if "pages" not in cur:
+            problems.append(f"{key}: falhou ({cur})")
+            continue
+        for metric, higher_better in METRICS.items():
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            ratio = c / b if higher_better else b / c if c else float("inf")
+            if ratio < 1 - tolerance:
+                problems.append(
+                    f"{key}: {metric} {b} → {c} ({(ratio - 1) * 100:+.0f} %)"
+                )
+    return problems
@@ -0,0 +1,88 @@
+"""
+synth.py – gera PDFs sintéticos (texto, imagem, híbrido) só com PyMuPDF.
+
+As páginas-imagem são o texto renderizado em bitmap e reinserido como
+imagem de página inteira, reproduzindo um documento escaneado. As
+"fatiadas" ('sliced') são o mesmo bitmap cortado em faixas horizontais
+(como alguns scanners gravam) sob um cabeçalho em texto nativo.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz                       # PyMuPDF
+
+_LOREM = (
+    "CLÁUSULA {n} – DO OBJETO. O presente contrato tem por objeto a "
+    "prestação de serviços de digitalização e indexação de documentos, "
+    "conforme especificações do Anexo I. Parágrafo único. As partes "
+    "elegem o foro da comarca para dirimir quaisquer controvérsias. "
+)
+_RECT = fitz.Rect(50, 50, 545, 792)
+_IMG_DPI = 150
+
+
+def page_text(n: int, paragraphs: int = 6) -> str:
+    """Texto-verdade da página `n` (referência para medir acurácia do OCR)."""
+    return "\n\n".join(_LOREM.format(n=f"{n}.{i}") for i in range(paragraphs))
+
+
+def _add_text_page(doc: fitz.Document, n: int, fontsize: float = 11) -> None:
+    page = doc.new_page()
+    page.insert_textbox(_RECT, page_text(n), fontsize=fontsize)
+
+
+def _add_image_page(doc: fitz.Document, n: int, fontsize: float = 11) -> None:
+    tmp  = fitz.open()
+    src  = tmp.new_page()
+    src.insert_textbox(_RECT, page_text(n), fontsize=fontsize)
+    pix  = src.get_pixmap(dpi=_IMG_DPI)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+    tmp.close()
+
+
+def _add_sliced_page(doc: fitz.Document, n: int, fontsize: float = 11,
+                     slices: int = 12) -> None:
+    tmp  = fitz.open()
+    src  = tmp.new_page()
+    src.insert_textbox(_RECT, page_text(n), fontsize=fontsize)
+    page = doc.new_page()
+    page.insert_text((50, 35), f"Documento sintético – página {n}", fontsize=10)
+    step = _RECT.height / slices
+    for k in range(slices):
+        strip = fitz.Rect(_RECT.x0, _RECT.y0 + k * step, _RECT.x1, _RECT.y0 + (k + 1) * step)
+        page.insert_image(strip, pixmap=src.get_pixmap(dpi=_IMG_DPI, clip=strip))
+    tmp.close()
+
+
+def make_pdf(path: str | Path, kind: str, pages: int, fontsize: float = 11,
+             slices: int = 12) -> Path:
+    """
+    kind = 'text' | 'image' | 'hybrid' (páginas pares = imagem) | 'sliced'
+    (cada página em `slices` faixas-imagem). Devolve o caminho gravado.
+    """
+    doc = fitz.open()
+    for n in range(1, pages + 1):
+        if kind == "text" or (kind == "hybrid" and n % 2):
+            _add_text_page(doc, n, fontsize)
+        elif kind in ("image", "hybrid"):
+            _add_image_page(doc, n, fontsize)
+        elif kind == "sliced":
+            _add_sliced_page(doc, n, fontsize, slices)
+        else:
+            raise ValueError(f"kind inválido: {kind!r}")
+    path = Path(path)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def make_corpus(out_dir: str | Path, pages: int) -> dict[str, Path]:
+    """Um PDF de cada tipo com `pages` páginas → {kind: path}."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return {
+        kind: make_pdf(out_dir / f"synth_{kind}_{pages}p.pdf", kind, pages)
+        for kind in ("text", "image", "hybrid")
+    }
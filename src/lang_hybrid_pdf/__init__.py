@@ -6,27 +6,81 @@ Pacote que fornece:
 
 • HybridPDFLoader – carrega PDFs híbridos (texto + imagem)
 • extract_text     – roteador que escolhe loader adequado
+• iter_extract_text – idem, em modo streaming (gerador)
+• aextract_text / aiter_extract_text – idem para asyncio (não bloqueia o loop)
+• extract_many     – corpus inteiro num pool de processos (+ CLI JSONL)
+• SQLiteOCRCache / MemoryOCRCache – cache de OCR por hash de página
+• Checkpoint       – journal por página para retomar extrações longas
+• Stats            – instrumentação opt-in (tempo por etapa, contadores)
+• set_backend      – escolhe o motor de OCR (pytesseract | tesserocr)
+• set_tokenizer    – contador de tokens usado no `token_limit`
+• warmup           – pré-carga das dependências pesadas (workers de vida longa)
+
+Os nomes acima são resolvidos sob demanda (`__getattr__`): importar o
+pacote não carrega PyMuPDF, pytesseract, LangChain nem Docling.
 
 Instalação completa (Docling + LayoutLMv2):
     pip install "lang-hybrid-pdf[full]"
 """
 
-from importlib.metadata import version, PackageNotFoundError
+from __future__ import annotations
 
-# ---------------------------------------------------------------
-# Versão do pacote (lida do pyproject/dist-info)
-try:
-    __version__: str = version(__name__.replace('.', '-'))
-except PackageNotFoundError:  # editable mode antes de build
-    __version__ = "0.0.0.dev0"
+import importlib
+from typing import TYPE_CHECKING
 
 # ---------------------------------------------------------------
-# APIs públicas
-from .hybrid_pdf_loader import HybridPDFLoader  # noqa: F401
-from .extractor_router  import extract_text     # noqa: F401
-
-__all__ = [
-    "HybridPDFLoader",
-    "extract_text",
-    "__version__",
-]
+# APIs públicas: nome → submódulo (importado no primeiro acesso)
+_EXPORTS = {
+    "HybridPDFLoader":    ".hybrid_pdf_loader",
+    "extract_text":       ".extractor_router",
+    "iter_extract_text":  ".extractor_router",
+    "aextract_text":      ".extractor_router",
+    "aiter_extract_text": ".extractor_router",
+    "extract_many":       ".batch",
+    "OCRCache":           ".ocr_cache",
+    "MemoryOCRCache":     ".ocr_cache",
+    "SQLiteOCRCache":     ".ocr_cache",
+    "Checkpoint":         ".checkpoint",
+    "Stats":              ".stats",
+    "set_backend":        ".ocr_backends",
+    "set_tokenizer":      ".tokenizer",
+    "warmup":             ".preload",
+}
+
+if TYPE_CHECKING:                                   # analisadores estáticos / IDEs
+    from .batch             import extract_many
+    from .checkpoint        import Checkpoint
+    from .extractor_router  import (aextract_text, aiter_extract_text,
+                                    extract_text, iter_extract_text)
+    from .hybrid_pdf_loader import HybridPDFLoader
+    from .ocr_backends      import set_backend
+    from .ocr_cache         import MemoryOCRCache, OCRCache, SQLiteOCRCache
+    from .stats             import Stats
+    from .tokenizer         import set_tokenizer
+    from .preload           import warmup
+
+__all__ = [*_EXPORTS, "__version__"]
+
+
+def _version() -> str:
+    """Versão do pacote (lida do pyproject/dist-info)."""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version(__name__.replace('.', '-'))
+    except PackageNotFoundError:  # editable mode antes de build
+        return "0.0.0.dev0"
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        value = _version()
+    elif name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value                         # próximos acessos: direto
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,111 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/aio.py
+"""
+aio.py – ponte asyncio ↔ extração síncrona em streaming.
+
+A extração (PyMuPDF, Tesseract, Docling) é bloqueante; aqui ela roda
+num executor e os Documents voltam ao event loop por uma fila limitada,
+à medida que ficam prontos:
+
+    async for doc in aiter_in_executor(lambda: loader.lazy_load()):
+        ...
+
+• `executor` – `ThreadPoolExecutor` onde roda a extração (default: o
+  executor do loop); o OCR de páginas em paralelo continua em `workers`
+  threads próprias. Um executor de PROCESSOS não serve: o produtor é uma
+  closure que entrega os Documents ao loop deste processo
+  (`run_coroutine_threadsafe`) – é recusado com TypeError
+• `limiter`  – `asyncio.Semaphore` compartilhado que limita quantas
+  extrações rodam ao mesmo tempo no serviço
+• cancelar a task (ou fechar o gerador) ativa o `CancelScope`: OCR na
+  fila é abortado e os subprocessos tesseract em andamento são mortos
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+from typing import AsyncIterator, Callable, Iterator, TypeVar
+
+from .cancel import CancelScope, cancel_scope
+
+_T = TypeVar("_T")
+
+_DONE = object()
+
+
+class _Raised:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _check_executor(executor: concurrent.futures.Executor | None) -> None:
+    if executor is not None and not isinstance(
+            executor, concurrent.futures.ThreadPoolExecutor):
+        raise TypeError(
+            f"executor deve ser um ThreadPoolExecutor, não {type(executor).__name__}: "
+            "a extração devolve os Documents ao event loop deste processo"
+        )
+
+
+async def aiter_in_executor(
+    factory: Callable[[], Iterator[_T]],
+    *,
+    executor: concurrent.futures.ThreadPoolExecutor | None = None,
+    limiter: asyncio.Semaphore | None = None,
+    max_buffer: int = 16,
+) -> AsyncIterator[_T]:
+    """Consome `factory()` (gerador síncrono) no executor, sem bloquear o loop."""
+    _check_executor(executor)
+    loop  = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(max(1, max_buffer))
+    scope = CancelScope()
+
+    def put(item) -> bool:
+        """Entrega ao loop respeitando a fila cheia; False se cancelado."""
+        fut = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                fut.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                if scope.cancelled:
+                    fut.cancel()
+                    return False
+
+    def produce() -> None:
+        with cancel_scope(scope):
+            gen = None
+            try:
+                gen = factory()                   # erro aqui também vai ao consumidor
+                for item in gen:
+                    if scope.cancelled or not put(item):
+                        return
+            except BaseException as exc:          # repassa ao consumidor
+                if not scope.cancelled:
+                    put(_Raised(exc))
+                return
+            finally:
+                if gen is not None:
+                    gen.close()
+        put(_DONE)
+
+    if limiter is not None:
+        await limiter.acquire()
+    try:
+        task = loop.run_in_executor(executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Raised):
+                    raise item.exc
+                yield item
+            await task
+        finally:
+            scope.cancel()                 # no-op se já terminou
+    finally:
+        if limiter is not None:
+            limiter.release()
@@ -0,0 +1,332 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/batch.py
+"""
+batch.py – ingestão de um corpus inteiro num pool de processos.
+
+    for path, result in extract_many("corpus/**/*.pdf", workers=8):
+        if isinstance(result, Exception):
+            ...                     # falha só deste arquivo
+        else:
+            index(result)           # List[Document]
+
+O OCR é agendado por FAIXA DE PÁGINAS (`chunk_pages`), não por arquivo:
+cada PDF é classificado uma vez (tarefa leve) e as páginas a OCRizar são
+quebradas em faixas que qualquer processo pode pegar. Assim um PDF de 800
+páginas não prende um núcleo enquanto os demais ficam ociosos. O texto
+nativo é UMA tarefa por PDF (o fallback pypdf lê o arquivo inteiro).
+
+• balanceamento – a fila é de prioridade pelo tamanho do PDF: os
+  pequenos terminam logo; os grandes usam os workers livres
+• backpressure  – no máximo `max_inflight_pages` páginas em voo, e só
+  `2 × workers` PDFs abertos (classificados e ainda não entregues)
+• resultados    – `(path, documents | exceção)` à medida que cada PDF
+  fica completo (ordem de conclusão, não de entrada)
+• retomada      – com `checkpoint_path`, as páginas já extraídas (por
+  qualquer processo ou execução anterior) saem do journal
+
+CLI (uma linha JSON por Document; erros como {"path", "error"}):
+
+    python -m lang_hybrid_pdf.batch "corpus/**/*.pdf" -o corpus.jsonl -w 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import heapq
+import json
+import logging
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:                # o processo pai só agenda: nada pesado aqui
+    from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+PathLike = str | os.PathLike
+Result   = "List[Document] | Exception"
+
+_GLOB_CHARS = set("*?[")
+
+
+# ----------------------------------------------------------------------
+# Entrada: arquivos, diretórios (recursivo) e padrões glob
+def iter_paths(paths: PathLike | Iterable[PathLike]) -> Iterator[str]:
+    """Expande `paths` preguiçosamente (um corpus pode ter milhões de arquivos)."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for p in paths:
+        p = os.fspath(p)
+        if _GLOB_CHARS & set(p):
+            yield from sorted(glob.iglob(p, recursive=True))
+        elif os.path.isdir(p):
+            yield from (str(f) for f in sorted(Path(p).rglob("*.pdf")))
+        else:
+            yield p
+
+
+# ----------------------------------------------------------------------
+# Tarefas executadas nos processos do pool
+_worker_cache = None
+_worker_ckpt  = None
+
+
+def _cache(cache_path: str | None):
+    """Um SQLiteOCRCache por processo (conexões não atravessam o pickle)."""
+    global _worker_cache
+    if cache_path and _worker_cache is None:
+        from .ocr_cache import SQLiteOCRCache
+        _worker_cache = SQLiteOCRCache(cache_path)
+    return _worker_cache
+
+
+def _checkpoint(checkpoint_path: str | None):
+    """Um Checkpoint (journal SQLite) por processo, como o cache."""
+    global _worker_ckpt
+    if checkpoint_path and _worker_ckpt is None:
+        from .checkpoint import Checkpoint
+        _worker_ckpt = Checkpoint(checkpoint_path)
+    return _worker_ckpt
+
+
+def _plan(path: str, cache_path: str | None) -> Tuple[str, List[int], List[int], int]:
+    from .document import PDFContext
+    from .extractor_router import fast_classify
+
+    with PDFContext(path) as ctx:
+        kind, text_pages, ocr_pages = fast_classify(ctx, cache=_cache(cache_path))
+        return kind, text_pages, ocr_pages, ctx.page_count
+
+
+def _extract_chunk(
+    path: str,
+    kind: str,
+    text_pages: List[int],
+    ocr_pages: List[int],
+    cache_path: str | None,
+    checkpoint_path: str | None = None,
+) -> List[Document]:
+    """
+    Uma tarefa da rota de `extract_text`: o texto nativo (`text_pages`;
+    na rota "text", o PDF inteiro) e/ou uma faixa de OCR (`ocr_pages`).
+    Nos híbridos a dedup do documento fica para `_DocState.merged`.
+    """
+    from .document import PDFContext
+    from .hybrid_pdf_loader import HybridPDFLoader
+    from .image_layout_ocr import iter_layout_ocr_from_pdf
+    from .text_docling import load_with_docling
+
+    cache = _cache(cache_path)
+    ckpt  = _checkpoint(checkpoint_path)
+    with PDFContext(path) as ctx:
+        if kind == "text":
+            return load_with_docling(ctx)
+        if kind == "image":
+            return list(iter_layout_ocr_from_pdf(ctx, cache=cache, pages=ocr_pages,
+                                                 checkpoint=ckpt))
+        loader = HybridPDFLoader(ctx, text_pages=text_pages, ocr_pages=ocr_pages,
+                                 cache=cache, checkpoint=ckpt)
+        return [d for docs in loader._undeduped(ctx) for d in docs]
+
+
+def _tasks(
+    kind: str, text_pages: List[int], ocr_pages: List[int], npages: int, chunk: int
+) -> List[Tuple[List[int], List[int]]]:
+    """
+    `(text_pages, ocr_pages)` de cada tarefa, na ordem de saída do loader:
+    o texto nativo primeiro (uma tarefa), depois as faixas de OCR.
+    """
+    if kind == "text":
+        return [(list(range(1, npages + 1)), [])]
+    pages = list(range(1, npages + 1)) if kind == "image" else ocr_pages
+    tasks = [([], pages[i:i + chunk]) for i in range(0, len(pages), chunk)]
+    return [(text_pages, [])] + tasks if kind == "hybrid" and text_pages else tasks
+
+
+# ----------------------------------------------------------------------
+class _DocState:
+    __slots__ = ("path", "kind", "parts", "pending")
+
+    def __init__(self, path: str):
+        self.path    = path
+        self.kind    = ""
+        self.parts:  Dict[int, List[Document]] = {}
+        self.pending = 0
+
+    def merged(self) -> List[Document]:
+        docs = [d for i in sorted(self.parts) for d in self.parts[i]]
+        if self.kind != "hybrid":
+            return docs
+        from .dedup import make_index
+
+        seen = make_index()              # dedup do documento inteiro, como o loader
+        return [d for d in docs if seen.add(d.page_content) is None]
+
+
+def extract_many(
+    paths: PathLike | Iterable[PathLike],
+    *,
+    workers: int | None = None,
+    max_inflight_pages: int | None = None,
+    chunk_pages: int = 4,
+    cache_path: str | None = None,
+    checkpoint_path: str | None = None,
+    preload: bool | Sequence[str] = False,
+) -> Iterator[Tuple[str, Result]]:
+    """
+    Extrai vários PDFs em paralelo (processos), gerando `(path, docs)` ou
+    `(path, exceção)` assim que cada arquivo termina.
+
+    • `paths`              – arquivo, diretório, glob ("**/*.pdf") ou lista
+    • `workers`            – processos (default: nº de CPUs)
+    • `max_inflight_pages` – teto de páginas em processamento simultâneo
+                             (default: `2 × workers × chunk_pages`)
+    • `chunk_pages`        – páginas de OCR por tarefa
+    • `cache_path`         – SQLiteOCRCache compartilhado pelos processos
+    • `checkpoint_path`    – journal (checkpoint.Checkpoint) compartilhado:
+                             rodar de novo após uma queda só refaz o que falta
+    • `preload`            – `preload.warmup` ao iniciar cada processo
+                             (True = todas as etapas, ou lista de etapas)
+
+    O agrupamento semântico de PDFs 100 % imagem fica restrito a cada
+    faixa de páginas; nos híbridos as faixas são juntadas na ordem do
+    loader (texto nativo, depois blocos) e deduplicadas uma vez só.
+    """
+    workers   = max(1, workers or os.cpu_count() or 1)
+    chunk     = max(1, chunk_pages)
+    max_pages = max(1, max_inflight_pages or 2 * workers * chunk)
+    max_docs  = 2 * workers
+
+    todo = iter_paths(paths)
+    exhausted = False
+    docs: Dict[int, _DocState] = {}
+    queue: list = []                     # heap (nº de páginas, seq, idx, tarefa)
+    running: Dict[Future, Tuple[int, int | None, int]] = {}
+    inflight = 0
+    seq = 0
+
+    init: dict = {}
+    if preload:
+        from .preload import warmup
+        init = {"initializer": warmup,
+                "initargs": () if preload is True else tuple(preload)}
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                               **init)
+    try:
+        while True:
+            # 1) classifica novos PDFs enquanto há espaço na janela
+            while not exhausted and len(docs) < max_docs:
+                path = next(todo, None)
+                if path is None:
+                    exhausted = True
+                    break
+                seq += 1
+                docs[seq] = _DocState(path)
+                running[pool.submit(_plan, path, cache_path)] = (seq, None, 1)
+                inflight += 1
+
+            # 2) faixas de página, menores PDFs primeiro, sob o teto
+            while queue and (inflight + queue[0][3] <= max_pages or not running):
+                _, s, idx, n, args = heapq.heappop(queue)
+                if s not in docs:                # PDF já falhou
+                    continue
+                running[pool.submit(_extract_chunk, *args)] = (s, idx, n)
+                inflight += n
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                s, idx, n = running.pop(fut)
+                inflight -= n
+                st = docs.get(s)
+                if st is None:
+                    continue
+                exc = fut.exception()
+                if exc is not None:
+                    del docs[s]
+                    yield st.path, exc
+                    continue
+
+                if idx is None:                          # _plan concluído
+                    kind, text_pages, ocr_pages, npages = fut.result()
+                    st.kind = kind
+                    tasks = _tasks(kind, text_pages, ocr_pages, npages, chunk)
+                    for i, (tp, op) in enumerate(tasks):
+                        args = (st.path, kind, tp, op, cache_path, checkpoint_path)
+                        n = len(op) or chunk         # texto nativo pesa uma faixa
+                        heapq.heappush(queue, (npages, s, i, n, args))
+                        st.pending += 1
+                else:
+                    st.parts[idx] = fut.result()
+                    st.pending -= 1
+
+                if st.pending == 0:
+                    del docs[s]
+                    yield st.path, st.merged()
+    finally:
+        for fut in running:
+            fut.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------
+def _to_json(path: str, doc: Document) -> str:
+    return json.dumps(
+        {"path": path, "page_content": doc.page_content, "metadata": doc.metadata},
+        ensure_ascii=False, default=str,
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m lang_hybrid_pdf.batch",
+        description="Extrai um corpus de PDFs para JSONL (um Document por linha).",
+    )
+    ap.add_argument("paths", nargs="+", help="arquivos, diretórios ou globs")
+    ap.add_argument("-o", "--out", default="-", help="arquivo JSONL (default: stdout)")
+    ap.add_argument("-w", "--workers", type=int, default=None)
+    ap.add_argument("--max-inflight-pages", type=int, default=None)
+    ap.add_argument("--chunk-pages", type=int, default=4)
+    ap.add_argument("--cache", default=None, help="SQLiteOCRCache compartilhado")
+    ap.add_argument("--checkpoint", default=None,
+                    help="journal SQLite: retoma as páginas já extraídas")
+    ap.add_argument("--preload", nargs="*", default=None, metavar="STAGE",
+                    help="pré-carrega dependências em cada worker (sem STAGE: todas)")
+    args = ap.parse_args(argv)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    failures = 0
+    try:
+        for path, result in extract_many(
+            args.paths,
+            workers=args.workers,
+            max_inflight_pages=args.max_inflight_pages,
+            chunk_pages=args.chunk_pages,
+            cache_path=args.cache,
+            checkpoint_path=args.checkpoint,
+            preload=False if args.preload is None else (args.preload or True),
+        ):
+            if isinstance(result, Exception):
+                failures += 1
+                logger.error("Erro ao processar %s: %s", path, result)
+                out.write(json.dumps({"path": path, "error": repr(result)},
+                                     ensure_ascii=False) + "\n")
+                continue
+            for doc in result:
+                out.write(_to_json(path, doc) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":                       # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
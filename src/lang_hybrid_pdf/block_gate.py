@@ -0,0 +1,99 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/block_gate.py
+"""
+block_gate.py – filtro barato ANTES do OCR de blocos-imagem.
+
+Logos, assinaturas, carimbos, fotos e filetes quase sempre geram menos
+de `MIN_OCR_CHARS` caracteres e são descartados depois do OCR a 300 DPI.
+O filtro evita esse custo com sinais que não passam pelo Tesseract:
+
+1. área e lado menor do bbox (ícones, filetes – uma linha de texto
+   larga e baixa, ex. 500 × 20 pt, NÃO é filete)
+2. miniatura em cinza a `thumb_dpi`: densidade de tinta e de bordas
+   (branco/sólido/foto lisa não têm as transições típicas de texto)
+3. imagens repetidas (mesmo conteúdo + mesmo tamanho na página, ex. o
+   logo do timbre em toda página): a decisão é memorizada pelo digest
+   dos bytes da imagem, e um OCR curto marca as próximas cópias como
+   "repeat"
+
+Um `BlockGate` vale por documento (a memória é do documento).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Tuple
+
+import fitz                       # PyMuPDF
+import numpy as np
+
+from .settings import GATE, GateCfg
+
+_Key = Tuple[bytes, int, int]
+
+
+# ----------------------------------------------------------------------
+def thumb_stats(pix: fitz.Pixmap) -> Tuple[float, float]:
+    """(tinta, bordas) de um Pixmap em cinza – sem cópia dos pixels."""
+    a = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    a = a.reshape(pix.height, pix.stride)[:, : pix.width].astype(np.int16)
+    if a.size == 0:
+        return 0.0, 0.0
+    ink   = float((a < 192).mean())
+    edges = (np.count_nonzero(np.abs(np.diff(a, axis=1)) > 40)
+             + np.count_nonzero(np.abs(np.diff(a, axis=0)) > 40))
+    return ink, edges / a.size
+
+
+class BlockGate:
+    """Decide se um bloco-imagem merece OCR; devolve o motivo do descarte."""
+
+    def __init__(self, cfg: GateCfg = GATE):
+        self.cfg = cfg
+        self._memo: Dict[_Key, str | None] = {}
+
+    @staticmethod
+    def key(blk: dict) -> _Key | None:
+        """Identidade da imagem: digest dos bytes + tamanho na página."""
+        data = blk.get("image")
+        if not data:
+            return None
+        x0, y0, x1, y1 = blk["bbox"]
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        return digest, round(x1 - x0), round(y1 - y0)
+
+    def _thumb(self, page: fitz.Page, bbox) -> str | None:
+        cfg = self.cfg
+        pix = page.get_pixmap(dpi=cfg.thumb_dpi, clip=fitz.Rect(*bbox),
+                              colorspace=fitz.csGRAY)
+        ink, edges = thumb_stats(pix)
+        if ink < cfg.min_ink:
+            return "blank"
+        if ink > cfg.max_ink:
+            return "solid"
+        if edges < cfg.min_edges:
+            return "smooth"
+        return None
+
+    def check(self, page: fitz.Page, blk: dict) -> str | None:
+        """`None` = fazer OCR; senão, o motivo (small/thin/blank/solid/smooth/repeat)."""
+        cfg = self.cfg
+        x0, y0, x1, y1 = blk["bbox"]
+        w, h = x1 - x0, y1 - y0
+        if w * h < cfg.min_area:
+            return "small"
+        if min(w, h) < cfg.min_side:
+            return "thin"
+
+        key = self.key(blk)
+        if key is not None and key in self._memo:
+            return self._memo[key]
+        reason = self._thumb(page, (x0, y0, x1, y1))
+        if key is not None:
+            self._memo[key] = reason
+        return reason
+
+    def useless(self, blk: dict) -> None:
+        """OCR do bloco saiu curto → próximas cópias da imagem são puladas."""
+        key = self.key(blk)
+        if key is not None:
+            self._memo[key] = "repeat"
@@ -0,0 +1,168 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/blocks.py
+"""
+blocks.py – representação compacta dos blocos de uma página híbrida.
+
+PDFs de engenharia têm dezenas de milhares de blocos; um `Document` (com
+dict de metadados e bbox próprios) por bloco custa memória e tempo de GC,
+e a maioria morre na dedup ou na junção por tokens. Aqui os blocos ficam
+em arrays paralelos (`array`, sem objetos por bloco):
+
+• página, bbox (4 doubles), origem (nativo / OCR), confiança e DPI do OCR
+• as palavras do OCR por página (`region_ocr`), só nos blocos que as têm
+• o texto é um trecho [start, end) de um buffer compartilhado
+
+Ordenação, dedup e corte por tokens trabalham sobre índices e `Span`s;
+o `Document` só é montado na saída (`span_document`), com os mesmos
+metadados que o caminho antigo produzia.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from .helpers import _merge_meta, _split_text
+from .tokenizer import TokenCounter, resolve_tokenizer
+
+NATIVE, OCR_SRC = 0, 1
+
+
+class BlockStore:
+    """Blocos aceitos de uma página (ou mais), em arrays + buffer de texto."""
+
+    __slots__ = ("pages", "boxes", "sources", "confs", "dpis",
+                 "starts", "ends", "words", "_parts", "_size")
+
+    def __init__(self) -> None:
+        self.pages   = array("i")
+        self.boxes   = array("d")           # x0, y0, x1, y1 por bloco
+        self.sources = array("B")           # NATIVE | OCR_SRC
+        self.confs   = array("d")           # confiança do OCR (-1: n/d)
+        self.dpis    = array("H")           # DPI do OCR adaptativo (0: n/d)
+        self.starts  = array("q")
+        self.ends    = array("q")
+        self.words: Dict[int, list] = {}    # bloco → `ocr_words` (esparso)
+        self._parts: List[str] = []         # juntado sob demanda em 1 str
+        self._size   = 0
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def add(
+        self,
+        page: int,
+        bbox: Sequence[float],
+        text: str,
+        source: int = NATIVE,
+        conf: float = -1.0,
+        dpi: int = 0,
+        words: list | None = None,
+    ) -> int:
+        if words:
+            self.words[len(self.pages)] = words
+        self.pages.append(page)
+        self.boxes.extend(bbox)
+        self.sources.append(source)
+        self.confs.append(conf)
+        self.dpis.append(dpi)
+        self.starts.append(self._size)
+        self._parts.append(text)
+        self._size += len(text)
+        self.ends.append(self._size)
+        return len(self.pages) - 1
+
+    # ------------------------------------------------------------------
+    @property
+    def buffer(self) -> str:
+        if len(self._parts) != 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0]
+
+    def text(self, i: int) -> str:
+        return self.buffer[self.starts[i]:self.ends[i]]
+
+    def bbox(self, i: int) -> Tuple[float, float, float, float]:
+        return tuple(self.boxes[4 * i:4 * i + 4])
+
+    def meta(self, i: int, chunk: int = -1) -> dict:
+        """Metadados do bloco como no Document antigo (+ `chunk` se cortado)."""
+        meta = {"page": self.pages[i], "bbox": self.bbox(i)}
+        if self.dpis[i]:
+            meta["ocr_dpi"], meta["ocr_conf"] = self.dpis[i], self.confs[i]
+        if i in self.words:
+            meta["ocr_words"] = self.words[i]
+        if chunk >= 0:
+            meta["chunk"] = chunk
+        return meta
+
+    def document(self, i: int) -> Document:
+        return Document(self.text(i), metadata=self.meta(i))
+
+
+# ----------------------------------------------------------------------
+class Span:
+    """Chunk de saída: texto (None = o bloco inteiro) + (bloco, pedaço) de origem."""
+
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str | None, parts: Tuple[Tuple[int, int], ...]):
+        self.text  = text
+        self.parts = parts
+
+
+def chunk_spans(
+    store: BlockStore,
+    token_limit: int | None = None,
+    tokenizer: str | TokenCounter | None = None,
+) -> List[Span]:
+    """
+    Mesmo corte/junção de `helpers.adjust_chunks_to_token_limit`, mas
+    sobre índices do `store`: nenhum Document intermediário.
+    """
+    if not token_limit:
+        return [Span(None, ((i, -1),)) for i in range(len(store))]
+    count = resolve_tokenizer(tokenizer)
+    sep_n = count("\n")
+
+    out: List[Span] = []
+    buf_text, buf_parts, buf_n, buf_page = "", [], 0, None
+    for i in range(len(store)):
+        pieces = _split_text(store.text(i), token_limit, count)
+        page   = store.pages[i]
+        for k, (text, n) in enumerate(pieces):
+            part = (i, k if len(pieces) > 1 else -1)
+            if buf_text and buf_page == page and buf_n + sep_n + n <= token_limit:
+                buf_text += "\n" + text
+                buf_parts.append(part)
+                buf_n    += sep_n + n
+                continue
+            if buf_text:
+                out.append(Span(buf_text, tuple(buf_parts)))
+            buf_text, buf_parts, buf_n, buf_page = text, [part], n, page
+    if buf_text:
+        out.append(Span(buf_text, tuple(buf_parts)))
+    return out
+
+
+def span_text(store: BlockStore, span: Span) -> str:
+    return store.text(span.parts[0][0]) if span.text is None else span.text
+
+
+def span_document(store: BlockStore, span: Span) -> Document:
+    """Monta o Document de saída (metadados juntados como no caminho antigo)."""
+    (i, k), *rest = span.parts
+    meta = store.meta(i, k)
+    for j, kj in rest:
+        meta = _merge_meta(meta, store.meta(j, kj))
+    return Document(span_text(store, span), metadata=meta)
+
+
+def iter_documents(
+    store: BlockStore,
+    token_limit: int | None = None,
+    tokenizer: str | TokenCounter | None = None,
+) -> Iterator[Document]:
+    for span in chunk_spans(store, token_limit, tokenizer):
+        yield span_document(store, span)
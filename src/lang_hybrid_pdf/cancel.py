@@ -0,0 +1,108 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/cancel.py
+"""
+cancel.py – cancelamento cooperativo de uma extração em andamento.
+
+Um `CancelScope` fica num ContextVar (herdado pelas threads de
+`helpers.ordered_map`). Com ele ativo:
+
+• `ocr._cached` chama `raise_if_cancelled()` antes de cada OCR, então
+  páginas/blocos ainda na fila não chegam ao Tesseract
+• os subprocessos `tesseract` lançados pelo PytesseractBackend são
+  registrados no escopo, e `scope.cancel()` os mata na hora
+
+O tesserocr (em processo) e o Docling não podem ser interrompidos no
+meio de uma chamada; o cancelamento vale a partir da próxima.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Set
+
+
+class ExtractionCancelled(RuntimeError):
+    """A extração foi cancelada (ex.: a task asyncio que a esperava)."""
+
+
+class CancelScope:
+    """Flag de cancelamento + subprocessos vivos da extração."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock  = threading.Lock()
+        self._procs: Set[subprocess.Popen] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+        with self._lock:
+            procs, self._procs = self._procs, set()
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+
+    def register(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.add(proc)
+        if self.cancelled:                     # corrida com cancel()
+            proc.kill()
+
+    def unregister(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+
+_current: contextvars.ContextVar[CancelScope | None] = contextvars.ContextVar(
+    "lang_hybrid_pdf_cancel_scope", default=None
+)
+
+
+@contextmanager
+def cancel_scope(scope: CancelScope) -> Iterator[CancelScope]:
+    """Ativa `scope` no contexto atual (e nas threads de ordered_map)."""
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+
+
+def current_scope() -> CancelScope | None:
+    return _current.get()
+
+
+def raise_if_cancelled() -> None:
+    scope = _current.get()
+    if scope is not None and scope.cancelled:
+        raise ExtractionCancelled("extração cancelada")
+
+
+# ----------------------------------------------------------------------
+class TrackedPopen(subprocess.Popen):
+    """Popen que se registra no CancelScope ativo enquanto roda."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._scope = _current.get()
+        if self._scope is not None:
+            self._scope.register(self)
+
+    def wait(self, timeout=None):
+        try:
+            return super().wait(timeout)
+        finally:
+            if self._scope is not None and self.returncode is not None:
+                self._scope.unregister(self)
+
+    def communicate(self, input=None, timeout=None):
+        try:
+            return super().communicate(input, timeout)
+        finally:
+            if self._scope is not None and self.returncode is not None:
+                self._scope.unregister(self)
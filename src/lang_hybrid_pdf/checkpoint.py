@@ -0,0 +1,215 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/checkpoint.py
+"""
+checkpoint.py – extração retomável (journal por página em SQLite).
+
+Um scan de 1 000 páginas leva horas; se o processo morre (OOM, deploy,
+instância preemptível) tudo o que estava em memória se perde. Com um
+`Checkpoint` cada página concluída é gravada (e `commit`ada) no journal
+assim que sai do OCR; na próxima execução as páginas já gravadas saem
+de lá, sem render nem Tesseract, e só as que faltam são processadas:
+
+    ckpt = Checkpoint("extracao.ckpt.sqlite")
+    docs = HybridPDFLoader("scan.pdf", checkpoint=ckpt).load()
+    docs = layout_ocr_from_pdf("scan.pdf", checkpoint=ckpt)
+
+• job      = hash do CONTEÚDO do PDF + configuração que muda a saída:
+             o mesmo arquivo renomeado ou reenviado retoma; outra
+             configuração começa do zero (sem misturar resultados)
+• entrada  = (job, etapa, página) → bytes; gravar de novo a mesma
+             página é idempotente (`INSERT OR REPLACE`)
+• WAL + `busy_timeout`: vários processos (ex.: faixas de páginas do
+  `batch`) podem gravar no mesmo arquivo
+• o journal é por página, não por chamada: não há "job concluído" – uma
+  execução com `pages=` (ou uma faixa do `batch`) não encerra o job, e
+  páginas pedidas depois reaproveitam o que qualquer faixa já gravou
+
+`resume_map` é o laço comum: páginas do journal + as que faltam,
+calculadas em uma só passada e gravadas à medida que ficam prontas,
+na ordem pedida.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, TypeVar
+
+from langchain_core.documents import Document
+
+from .document import PDFContext
+from .stats import NULL_STATS, Stats
+
+_R = TypeVar("_R")
+
+_READ_CHUNK = 4 * 2**20
+_MISSING    = object()
+
+
+# ----------------------------------------------------------------------
+def document_hash(ctx: PDFContext) -> str:
+    """blake2b dos bytes do PDF (em memória ou lido do disco em blocos)."""
+    h = hashlib.blake2b(digest_size=20)
+    if ctx.data is not None:
+        h.update(ctx.data)
+    else:
+        with open(ctx.path, "rb") as fh:
+            for block in iter(lambda: fh.read(_READ_CHUNK), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def _bboxes(value: Any) -> Any:
+    """JSON → metadados: `bbox` volta a ser tupla (como na extração)."""
+    if isinstance(value, dict):
+        return {k: tuple(v) if k == "bbox" and isinstance(v, list) else _bboxes(v)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_bboxes(v) for v in value]
+    return value
+
+
+def encode_docs(docs: Sequence[Document]) -> bytes:
+    return json.dumps([[d.page_content, d.metadata] for d in docs],
+                      ensure_ascii=False, default=str).encode()
+
+
+def decode_docs(blob: bytes) -> List[Document]:
+    return [Document(text, metadata=_bboxes(meta)) for text, meta in json.loads(blob)]
+
+
+# ----------------------------------------------------------------------
+class Checkpoint:
+    """
+    Journal persistente em SQLite. `job(doc_hash, config)` devolve a
+    visão de um documento + configuração. Seguro para várias threads;
+    vários processos podem abrir o mesmo arquivo.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0):
+        self.path  = str(Path(path).expanduser())
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ckpt_jobs ("
+            " job TEXT PRIMARY KEY, doc TEXT NOT NULL, config TEXT NOT NULL,"
+            " mtime REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ckpt_pages ("
+            " job TEXT NOT NULL, stage TEXT NOT NULL, page INTEGER NOT NULL,"
+            " value BLOB NOT NULL, PRIMARY KEY (job, stage, page))"
+        )
+        self._conn.commit()
+
+    def job(self, doc_hash: str, config: Dict[str, Any]) -> "Journal":
+        cfg = json.dumps(config, sort_keys=True, default=str)
+        key = hashlib.blake2b(f"{doc_hash}\0{cfg}".encode(), digest_size=20).hexdigest()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO ckpt_jobs (job, doc, config, mtime)"
+                " VALUES (?, ?, ?, ?)", (key, doc_hash, cfg, time.time()),
+            )
+            self._conn.commit()
+        return Journal(self, key)
+
+    def discard(self, doc_hash: str) -> int:
+        """Apaga todos os jobs de um documento; devolve quantos."""
+        with self._lock:
+            jobs = [r[0] for r in self._conn.execute(
+                "SELECT job FROM ckpt_jobs WHERE doc = ?", (doc_hash,))]
+            self._conn.executemany("DELETE FROM ckpt_pages WHERE job = ?",
+                                   [(j,) for j in jobs])
+            self._conn.execute("DELETE FROM ckpt_jobs WHERE doc = ?", (doc_hash,))
+            self._conn.commit()
+        return len(jobs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Journal:
+    """Páginas gravadas de UM job (documento + configuração)."""
+
+    __slots__ = ("_ckpt", "key")
+
+    def __init__(self, ckpt: Checkpoint, key: str):
+        self._ckpt = ckpt
+        self.key   = key
+
+    def pages(self, stage: str) -> Dict[int, bytes]:
+        """Página → valor gravado, na etapa `stage`."""
+        with self._ckpt._lock:
+            rows = self._ckpt._conn.execute(
+                "SELECT page, value FROM ckpt_pages WHERE job = ? AND stage = ?",
+                (self.key, stage),
+            ).fetchall()
+        return {page: bytes(value) for page, value in rows}
+
+    def get(self, stage: str, page: int) -> bytes | None:
+        with self._ckpt._lock:
+            row = self._ckpt._conn.execute(
+                "SELECT value FROM ckpt_pages WHERE job = ? AND stage = ? AND page = ?",
+                (self.key, stage, page),
+            ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def put(self, stage: str, page: int, value: bytes) -> None:
+        """Grava (e confirma) uma página – sobrevive a um kill logo depois."""
+        with self._ckpt._lock:
+            self._ckpt._conn.execute(
+                "INSERT OR REPLACE INTO ckpt_pages (job, stage, page, value)"
+                " VALUES (?, ?, ?, ?)", (self.key, stage, page, value),
+            )
+            self._ckpt._conn.execute(
+                "UPDATE ckpt_jobs SET mtime = ? WHERE job = ?", (time.time(), self.key))
+            self._ckpt._conn.commit()
+
+
+
+# ----------------------------------------------------------------------
+def resume_map(
+    journal: Journal,
+    stage: str,
+    pnos: Sequence[int],
+    compute: Callable[[List[int]], Iterator[_R]],
+    encode: Callable[[_R], bytes],
+    decode: Callable[[bytes], _R],
+    stats: Stats = NULL_STATS,
+) -> Iterator[_R]:
+    """
+    Um resultado por página de `pnos`, em ordem: do journal quando já
+    gravado; senão de `compute(faltantes)` – chamado uma vez, com as
+    páginas que faltam, e que deve gerar um resultado por página, na
+    mesma ordem –, gravado assim que chega.
+    """
+    done    = journal.pages(stage)
+    missing = [p for p in pnos if p not in done]
+    stats.incr("checkpoint.pages_resumed", len(pnos) - len(missing))
+    fresh   = compute(missing) if missing else iter(())
+    for pno in pnos:
+        blob = done.get(pno)
+        if blob is not None:
+            yield decode(blob)
+            continue
+        value = next(fresh, _MISSING)
+        if value is _MISSING:
+            raise RuntimeError(
+                f"checkpoint: etapa {stage!r} não gerou resultado para a página {pno} "
+                f"({len(missing)} página(s) pendente(s))"
+            )
+        journal.put(stage, pno, encode(value))
+        stats.incr("checkpoint.pages_saved")
+        yield value
@@ -0,0 +1,252 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/dedup.py
+"""
+dedup.py – quase-duplicatas no documento inteiro (MinHash + LSH).
+
+O fingerprint antigo (MD5 dos 120 primeiros caracteres normalizados)
+errava nos dois sentidos: chunks com o mesmo cabeçalho colidiam e eram
+descartados; o mesmo trecho vindo do texto nativo e do OCR, com poucas
+letras trocadas, passava duas vezes. Aqui:
+
+• texto normalizado como no fingerprint (sem acento, caixa, espaços
+  nem pontuação) → k-gramas de caracteres (`DedupCfg.shingle`)
+• assinatura MinHash de `num_perm` permutações, em NumPy (um produto
+  vetorizado por chunk, sem laço Python por k-grama)
+• índice LSH em `bands` faixas: só os chunks que coincidem em alguma
+  faixa são comparados → custo ~linear no nº de chunks
+• duplicata = Jaccard estimado pelas assinaturas ≥ `threshold` ou, para
+  candidatos com Jaccard ≥ `verify_from`, `fuzz.ratio` ≥ `min_ratio` (o
+  k-grama é sensível a erros de OCR espalhados; a distância de edição,
+  não – e só os poucos candidatos plausíveis pagam por ela)
+• textos idênticos (após normalizar) caem num dict antes de tudo; textos
+  curtos demais para ter k-gramas só têm esse teste exato
+• dentro de uma página (`page_index`) não há LSH: são poucos blocos, e
+  cada texto é comparado com TODOS os anteriores por `fuzz.ratio` ≥
+  `min_ratio` (`extractOne`) – o critério exaustivo do loader antigo; o
+  LSH fica para os índices do documento inteiro
+
+É incremental (`add` a cada chunk) e determinístico entre processos
+(permutações sorteadas com `seed`), então o `batch` pode refazer a
+dedup sobre as faixas de páginas com o mesmo resultado do loader.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List
+
+import numpy as np
+
+from .settings import DEDUP, DedupCfg
+
+_DROP = re.compile(r"[^a-z0-9]")
+
+
+def normalize(text: str) -> str:
+    """Mesma normalização do `helpers.fingerprint`, sem cortar o texto."""
+    txt = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _DROP.sub("", txt.lower())
+
+
+def _shingle_ids(norm: str, k: int) -> np.ndarray:
+    """k-gramas (k ≤ 8) de um texto ASCII como uint64, na ordem (com repetições)."""
+    buf = np.frombuffer(norm.encode(), dtype=np.uint8)
+    n   = buf.size - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    ids = np.zeros(n, dtype=np.uint64)
+    for j in range(k):                               # k ≤ 8 deslocamentos
+        ids |= buf[j:j + n].astype(np.uint64) << np.uint64(8 * j)
+    return ids
+
+
+def shingles(norm: str, k: int) -> np.ndarray:
+    """Conjunto de k-gramas de um texto normalizado (uint64 únicos)."""
+    return np.unique(_shingle_ids(norm, k))
+
+
+def _exact_key(text: str) -> bytes:
+    return hashlib.blake2b(normalize(text).encode(), digest_size=16).digest()
+
+
+class MinHasher:
+    """Permutações `h(x) = (a·x + b) >> 32` (mod 2⁶⁴), `a` ímpar."""
+
+    __slots__ = ("k", "_a", "_b")
+
+    def __init__(self, cfg: DedupCfg = DEDUP) -> None:
+        if not 1 <= cfg.shingle <= 8:
+            raise ValueError("DedupCfg.shingle deve estar entre 1 e 8")
+        if cfg.num_perm % cfg.bands:
+            raise ValueError("DedupCfg.num_perm deve ser múltiplo de DedupCfg.bands")
+        rng     = np.random.default_rng(cfg.seed)
+        self.k  = cfg.shingle
+        self._a = rng.integers(1, 2**63, cfg.num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, cfg.num_perm, dtype=np.uint64)
+
+    def signature(self, norm: str) -> np.ndarray | None:
+        """Assinatura uint32[num_perm] (None: texto curto demais)."""
+        ids = _shingle_ids(norm, self.k)              # repetição não muda o mínimo
+        if not ids.size:
+            return None
+        h = np.multiply(ids[:, None], self._a)        # estouro = mod 2⁶⁴
+        h += self._b
+        return (h.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+
+
+class NearDupIndex:
+    """
+    Índice incremental de chunks: `add(texto)` devolve o id de uma
+    quase-duplicata já vista (e não insere) ou None (e insere).
+    """
+
+    def __init__(self, cfg: DedupCfg = DEDUP) -> None:
+        self.cfg     = cfg
+        self._ratio  = None
+        if cfg.min_ratio:
+            from rapidfuzz.fuzz import ratio
+            self._ratio = ratio
+        self._hasher = MinHasher(cfg)
+        self._rows   = cfg.num_perm // cfg.bands
+        self._exact: Dict[bytes, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(cfg.bands)]
+        self._sigs   = np.empty((64, cfg.num_perm), dtype=np.uint32)
+        self._n_sigs = 0
+        self._slot: List[int] = []                   # id → linha em _sigs (-1: sem)
+        self._texts: List[str] = []                  # só com `min_ratio`
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    # ------------------------------------------------------------------
+    def _keys(self, sig: np.ndarray) -> List[bytes]:
+        r = self._rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.cfg.bands)]
+
+    def _candidates(self, keys: List[bytes]) -> List[int]:
+        found: set[int] = set()
+        for bucket, key in zip(self._buckets, keys):
+            found.update(bucket.get(key, ()))
+        return sorted(found)
+
+    def _match(self, text: str, sig: np.ndarray, cands: List[int]) -> int | None:
+        rows = np.fromiter((self._slot[c] for c in cands), dtype=np.intp, count=len(cands))
+        sim  = (self._sigs[rows] == sig).mean(axis=1)
+        hit  = np.flatnonzero(sim >= self.cfg.threshold)
+        if hit.size:
+            return cands[hit[0]]
+        if self._ratio is not None:
+            cutoff = self.cfg.min_ratio
+            for i in np.flatnonzero(sim >= self.cfg.verify_from):
+                if self._ratio(text, self._texts[cands[i]], score_cutoff=cutoff):
+                    return cands[i]
+        return None
+
+    def query(self, text: str) -> int | None:
+        """Id da primeira quase-duplicata já indexada (sem inserir)."""
+        return self._lookup(text)[0]
+
+    def _lookup(self, text: str):
+        """(id achado, hash exato, assinatura, chaves LSH) – reaproveitados no `add`."""
+        norm  = normalize(text)
+        exact = hashlib.blake2b(norm.encode(), digest_size=16).digest()   # = _exact_key
+        hit   = self._exact.get(exact)
+        if hit is not None:
+            return hit, exact, None, None
+        sig = self._hasher.signature(norm)
+        if sig is None:
+            return None, exact, None, None
+        keys = self._keys(sig)
+        cands = self._candidates(keys)
+        return (self._match(text, sig, cands) if cands else None), exact, sig, keys
+
+    def add(self, text: str) -> int | None:
+        """Quase-duplicata já vista → seu id; senão indexa e devolve None."""
+        hit, exact, sig, keys = self._lookup(text)
+        if hit is not None:
+            return hit
+        new = len(self._slot)
+        self._exact[exact] = new
+        if self._ratio is not None:
+            self._texts.append(text)
+        if sig is None:
+            self._slot.append(-1)
+            return None
+        row = self._n_sigs
+        if row == len(self._sigs):                   # cresce em dobro (amortizado)
+            self._sigs = np.concatenate([self._sigs, np.empty_like(self._sigs)])
+        self._sigs[row] = sig
+        self._n_sigs += 1
+        self._slot.append(row)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(new)
+        return None
+
+
+class ExactIndex:
+    """Só duplicatas exatas (após `normalize`) – `HybridPDFLoader(dedup=None)`."""
+
+    def __init__(self) -> None:
+        self._seen: Dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def query(self, text: str) -> int | None:
+        return self._seen.get(_exact_key(text))
+
+    def add(self, text: str) -> int | None:
+        key = _exact_key(text)
+        hit = self._seen.get(key)
+        if hit is None:
+            self._seen[key] = len(self._seen)
+        return hit
+
+
+def make_index(cfg: DedupCfg | None = DEDUP) -> NearDupIndex | ExactIndex:
+    """Índice de dedup para `cfg` (None: só duplicatas exatas)."""
+    return NearDupIndex(cfg) if cfg is not None else ExactIndex()
+
+
+class PageIndex:
+    """
+    Dedup exaustiva de uma página: `add(texto)` devolve o id do 1º texto
+    já visto com `fuzz.ratio` ≥ `min_ratio` (e não insere) ou None.
+    """
+
+    def __init__(self, min_ratio: float = DEDUP.min_ratio) -> None:
+        from rapidfuzz import fuzz, process
+        self.min_ratio = min_ratio
+        self._ratio    = fuzz.ratio
+        self._extract  = process.extractOne
+        self._texts: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def query(self, text: str) -> int | None:
+        if not self._texts:
+            return None
+        hit = self._extract(text, self._texts, scorer=self._ratio, processor=None,
+                            score_cutoff=self.min_ratio)
+        return None if hit is None else hit[2]
+
+    def add(self, text: str) -> int | None:
+        hit = self.query(text)
+        if hit is None:
+            self._texts.append(text)
+        return hit
+
+
+def page_index(cfg: DedupCfg = DEDUP) -> PageIndex | NearDupIndex:
+    """
+    Índice da dedup dentro de uma página híbrida: `PageIndex` com o
+    `min_ratio` de `cfg` (ex.: o mesmo trecho no texto nativo e no OCR
+    de um bloco); Jaccard alto sem ratio – as mesmas frases em outra
+    ordem – não descarta. Com `min_ratio=0` (ratio desligado) vale o
+    MinHash do documento.
+    """
+    if not cfg.min_ratio:
+        return NearDupIndex(cfg)
+    return PageIndex(cfg.min_ratio)
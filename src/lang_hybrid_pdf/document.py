@@ -0,0 +1,182 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/document.py
+"""
+document.py – contexto compartilhado por documento.
+
+Abre o PDF com PyMuPDF UMA vez e guarda o que as etapas reaproveitam
+entre si. A origem (`PDFSource`) pode ser:
+
+• caminho (str / os.PathLike) – o PyMuPDF lê o arquivo
+• bytes / bytearray / memoryview / mmap – usados no lugar, sem cópia
+• objeto-arquivo binário: BytesIO (buffer interno, sem cópia), arquivo
+  real (mapeado com mmap, sem cópia) ou stream qualquer (um `read()`)
+
+Nada é gravado em disco; só backends que exigem arquivo (PyPDFLoader)
+ou um BytesIO próprio (Docling) copiam os bytes.
+
+Por página, fica memorizado:
+
+• texto nativo por página (`page.get_text()`)
+• retângulos/cobertura de imagens (`page.get_image_info()`)
+• blocos de layout (`page.get_text("dict")`) – LRU pequeno, pois os
+  blocos-imagem carregam os bytes da imagem
+• resultado da classificação feita pelo router
+
+Router, HybridPDFLoader e OCR recebem o mesmo `PDFContext`.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Dict, Iterator, List, Tuple, Union
+
+import fitz                       # PyMuPDF
+
+if TYPE_CHECKING:                 # pragma: no cover
+    from .extractor_router import Classification
+
+_BLOCKS_LRU = 8                   # páginas com get_text("dict") em memória
+
+Buffer    = Union[bytes, bytearray, memoryview, mmap.mmap]
+PDFSource = Union[str, os.PathLike, Buffer, IO[bytes], "PDFContext"]
+
+
+def _as_view(buf: Buffer) -> memoryview:
+    """
+    Buffer → memoryview PRÓPRIA de bytes (o PyMuPDF copiaria bytearray e
+    recusa mmap); liberá-la no `close` não afeta a view do chamador.
+    """
+    view = memoryview(buf)
+    return view if view.format == "B" and view.contiguous else view.cast("B")
+
+
+def _file_view(fh: IO[bytes]) -> Tuple[memoryview | bytes, mmap.mmap | None]:
+    """Objeto-arquivo → (buffer, mmap a fechar depois)."""
+    if isinstance(fh, io.BytesIO):
+        return fh.getbuffer(), None
+    try:
+        fileno = fh.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is not None and os.fstat(fileno).st_size:
+        mm = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return memoryview(mm), mm
+    return fh.read(), None
+
+
+# ----------------------------------------------------------------------
+class PDFContext:
+    """Documento aberto + caches por página (1-based)."""
+
+    def __init__(self, source: PDFSource, *, name: str | None = None):
+        self.path: str | None = None
+        self.data: bytes | memoryview | None = None   # PDF em memória (sem cópia)
+        self._mmap: mmap.mmap | None = None
+        if isinstance(source, (str, os.PathLike)):
+            self.path = os.fspath(source)
+            self.doc  = fitz.open(self.path)
+        else:
+            if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+                data = source
+            else:
+                data, self._mmap = _file_view(source)
+                fname = getattr(source, "name", None)
+                if name is None and isinstance(fname, str):
+                    name = os.path.basename(fname)
+            self.data = data if isinstance(data, bytes) else _as_view(data)
+            self.doc  = fitz.open(stream=self.data, filetype="pdf")
+        self.name = name or (os.path.basename(self.path) if self.path else "document.pdf")
+
+        self._text:   Dict[int, str] = {}
+        self._images: Dict[int, List[fitz.Rect]] = {}
+        self._blocks: OrderedDict[int, List[dict]] = OrderedDict()
+        self.classification: Classification | None = None
+
+    # ------------------------------------------------------------------
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    def page(self, pno: int) -> fitz.Page:
+        return self.doc.load_page(pno - 1)
+
+    def text(self, pno: int) -> str:
+        """`page.get_text()` memorizado."""
+        txt = self._text.get(pno)
+        if txt is None:
+            txt = self._text[pno] = self.page(pno).get_text()
+        return txt
+
+    def image_rects(self, pno: int) -> List[fitz.Rect]:
+        """Retângulos (já recortados à página) de cada imagem – sem renderizar."""
+        rects = self._images.get(pno)
+        if rects is None:
+            page  = self.page(pno)
+            rects = [fitz.Rect(i["bbox"]) & page.rect for i in page.get_image_info()]
+            self._images[pno] = rects
+        return rects
+
+    def image_coverage(self, pno: int) -> float:
+        """Fração (0–1) da área da página coberta por imagens."""
+        area = abs(self.page(pno).rect) or 1.0
+        return min(1.0, sum(abs(r) for r in self.image_rects(pno)) / area)
+
+    def blocks(self, pno: int) -> List[dict]:
+        """`page.get_text("dict")["blocks"]` memorizado (LRU)."""
+        blks = self._blocks.get(pno)
+        if blks is None:
+            blks = self.page(pno).get_text("dict")["blocks"]
+            self._blocks[pno] = blks
+            while len(self._blocks) > _BLOCKS_LRU:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(pno)
+        return blks
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self._text.clear()
+        self._images.clear()
+        self._blocks.clear()
+        self.doc.close()
+        if isinstance(self.data, memoryview):
+            self.data.release()               # só a nossa view; o buffer é do chamador
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "PDFContext":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def open_context(source: PDFSource) -> Iterator[PDFContext]:
+    """
+    Devolve um PDFContext para `source`. Se já for um contexto, apenas o
+    empresta (não fecha); caso contrário abre e fecha ao final.
+    """
+    if isinstance(source, PDFContext):
+        yield source
+        return
+    ctx = PDFContext(source)
+    try:
+        yield ctx
+    finally:
+        ctx.close()
+
+
+def page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """[1, 2, 3, 7, 8] → [(1, 3), (7, 8)] – intervalos contíguos 1-based."""
+    runs: List[Tuple[int, int]] = []
+    for p in sorted(set(pages)):
+        if runs and p == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], p)
+        else:
+            runs.append((p, p))
+    return runs
@@ -7,20 +7,30 @@ extractor_router.py – roteador que decide a estratégia de extração.
 
 A lógica de classificação replica a que funciona no seu RAG Jurídico,
 mas lendo todos os parâmetros a partir de lang_hybrid_pdf.settings.OCR.
+Classificação em camadas: sinais do PyMuPDF sem renderizar (texto
+nativo, fontes, cobertura de imagens) decidem a maioria das páginas;
+o OCR rápido só roda nas páginas ambíguas.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, NamedTuple, Tuple
 
 import fitz                       # PyMuPDF
-import pytesseract
-from PIL import Image
+from langchain_core.documents import Document
 
 from lang_hybrid_pdf.settings import OCR
-from .text_docling import load_with_docling
-from .image_layout_ocr import layout_ocr_from_pdf
-from .hybrid_pdf_loader import HybridPDFLoader
+from .aio import _check_executor, aiter_in_executor
+from .helpers import ordered_map
+from .ocr import image_to_string
+from .ocr_cache import OCRCache
+from .raster import render_pixmap
+from .stats import NULL_STATS, Stats
+from .document import PDFContext, PDFSource, open_context
 
 logger = logging.getLogger(__name__)
 
@@ -28,91 +38,377 @@ CENTRAL_CROP_PCT = 0.25           # 25 % de cada borda → crop central
 
 
 # ────────────────────────────────────────────────────────────────────
-def _quick_ocr(page: fitz.Page, *, central_crop: bool = False) -> int:
-    """OCR rápido (baixa DPI) só para contagem de caracteres."""
-    if central_crop:
-        w, h = page.rect.width, page.rect.height
-        mx, my = w * CENTRAL_CROP_PCT, h * CENTRAL_CROP_PCT
-        clip = fitz.Rect(mx, my, w - mx, h - my)
-        pix  = page.get_pixmap(dpi=OCR.quick_ocr_dpi, clip=clip)
-    else:
-        pix  = page.get_pixmap(dpi=OCR.quick_ocr_dpi)
+def _quick_ocr_clip(page: fitz.Page, central_crop: bool) -> fitz.Rect | None:
+    if not central_crop:
+        return None
+    w, h = page.rect.width, page.rect.height
+    mx, my = w * CENTRAL_CROP_PCT, h * CENTRAL_CROP_PCT
+    return fitz.Rect(mx, my, w - mx, h - my)
+
+
+def _quick_ocr_chars(
+    pix: fitz.Pixmap,
+    clip: fitz.Rect | None = None,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+) -> int:
+    """Parte do OCR rápido que roda em qualquer thread (sem PyMuPDF)."""
+    txt  = image_to_string(pix, lang=OCR.lang, cache=cache, stats=stats,
+                           dpi=OCR.quick_ocr_dpi,
+                           clip=tuple(clip) if clip else None)
+    return len(txt.strip())
 
-    img  = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-    return len(pytesseract.image_to_string(img, lang=OCR.lang).strip())
+
+def _quick_ocr(
+    page: fitz.Page,
+    *,
+    central_crop: bool = False,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+) -> int:
+    """OCR rápido (baixa DPI) só para contagem de caracteres."""
+    clip = _quick_ocr_clip(page, central_crop)
+    pix  = render_pixmap(page, OCR.quick_ocr_dpi, clip)
+    return _quick_ocr_chars(pix, clip, cache, stats)
 
 
 # ────────────────────────────────────────────────────────────────────
-def fast_classify(file_path: str) -> Tuple[str, List[int], List[int]]:
+class PageLabel(NamedTuple):
+    """Rótulo de uma página e o quanto ele é confiável (0.5–1)."""
+    page:       int
+    has_text:   bool
+    has_ocr:    bool
+    confidence: float
+    method:     str               # "native" | "quick_ocr" | "inferred"
+
+
+@dataclass(frozen=True, slots=True)
+class Classification:
+    """
+    Resultado de `fast_classify`. Desempacota como a tupla antiga:
+
+        kind, text_pages, ocr_pages = fast_classify(pdf)
+
+    e traz o rótulo de CADA página (`labels`) com a confiança e o método
+    que o decidiu, além das páginas da amostra estratificada.
+    """
+    kind:       str
+    text_pages: List[int]
+    ocr_pages:  List[int]
+    labels:     Tuple[PageLabel, ...] = ()
+    sampled:    Tuple[int, ...] = ()
+
+    def __iter__(self):
+        return iter((self.kind, self.text_pages, self.ocr_pages))
+
+    def __len__(self) -> int:
+        return 3
+
+    def __getitem__(self, i):
+        return (self.kind, self.text_pages, self.ocr_pages)[i]
+
+    @property
+    def confidence(self) -> float:
+        """Confiança da página menos certa (1.0 se não há páginas)."""
+        return min((l.confidence for l in self.labels), default=1.0)
+
+    @property
+    def low_confidence_pages(self) -> List[int]:
+        return [l.page for l in self.labels if l.confidence < 0.75]
+
+
+def _margin(value: float, threshold: float, span: float) -> float:
+    """Confiança 0.5 (no limiar) → 1.0 (a `span` ou mais de distância)."""
+    if span <= 0:
+        return 1.0
+    return 0.5 + 0.5 * min(1.0, abs(value - threshold) / span)
+
+
+def _native_signals(ctx: PDFContext, pno: int) -> Tuple[bool, bool | None, float]:
+    """
+    Camada 1 – zero renderização. Retorna (has_text, has_ocr, confiança),
+    onde has_ocr = None significa “ambíguo, precisa de OCR rápido”.
+    """
+    page     = ctx.page(pno)
+    n_chars  = len(ctx.text(pno).strip())
+    has_text = n_chars >= OCR.min_native_chars and bool(page.get_fonts())
+    conf     = _margin(n_chars, OCR.min_native_chars, OCR.min_native_chars)
+    cover    = ctx.image_coverage(pno)
+
+    if cover < OCR.image_cover_min:     # sem imagem relevante → nada p/ OCR
+        return has_text, False, min(conf, _margin(cover, OCR.image_cover_min,
+                                                  OCR.image_cover_min))
+    if not has_text and cover >= OCR.image_cover_full:      # página escaneada
+        return has_text, True, min(conf, _margin(cover, OCR.image_cover_full,
+                                                 1 - OCR.image_cover_full))
+    return has_text, None, conf
+
+
+def stratified_sample(n_pages: int, strata: int) -> List[int]:
+    """Uma página (a do meio) de cada uma de `strata` faixas iguais."""
+    strata = max(1, min(strata, n_pages))
+    return sorted({int((i + 0.5) * n_pages / strata) + 1 for i in range(strata)})
+
+
+def _decide_kind(
+    ctx: PDFContext,
+    text_pages: List[int],
+    ocr_pages: List[int],
+    cache: OCRCache | None,
+    stats: Stats,
+) -> Tuple[str, List[int]]:
+    # texto nativo em toda página só é 'text' se nenhuma pede OCR: página
+    # com texto E imagem com texto (has_ocr) é justamente o caso híbrido
+    if not ocr_pages and len(text_pages) == ctx.page_count:
+        return "text", []
+    kind = ("hybrid" if text_pages and ocr_pages
+            else "text" if text_pages else "image")
+    # Sanity-check (remove falso híbrido por cabeçalhos vetoriais)
+    if kind == "hybrid":
+        n_chars = _quick_ocr(ctx.page(ocr_pages[0]), central_crop=True,
+                             cache=cache, stats=stats)
+        if n_chars < OCR.min_ocr_chars:
+            return "text", []
+    return kind, ocr_pages
+
+
+def fast_classify(
+    file_path: PDFSource,
+    *,
+    cache: OCRCache | None = None,
+    tiered: bool = True,
+    stats: Stats = NULL_STATS,
+    workers: int = 1,
+    time_budget: float | None = None,
+) -> Classification:
     """
-    Retorna:
+    Aceita qualquer `PDFSource` – caminho, bytes/memoryview/mmap,
+    objeto-arquivo – ou um PDFContext (o resultado fica guardado em
+    `ctx.classification` e o texto por página no cache do contexto).
+    `tiered=False` força o OCR rápido em toda página (modo antigo,
+    útil para benchmark).
+
+    Todas as páginas recebem rótulo (sem parada antecipada que truncava
+    as listas):
+
+    1. sinais nativos em todas as páginas (sem renderizar);
+    2. OCR rápido nas ambíguas – primeiro as da amostra estratificada
+       (`OCR.classify_strata` faixas), depois as demais – com o OCR em
+       `workers` threads (a renderização fica na thread chamadora);
+    3. estourado `time_budget` segundos (default `OCR.classify_budget_s`),
+       as ambíguas restantes herdam o resultado majoritário do OCR rápido
+       já feito, com confiança reduzida (`method="inferred"`).
+
+    Retorna um `Classification` (desempacota como antes):
         kind        : 'text' | 'image' | 'hybrid'
         text_pages  : páginas 1-based com texto nativo “longo”
         ocr_pages   : páginas onde o OCR rápido detectou texto relevante
     """
-    doc = fitz.open(file_path)
-    try:
-        text_pages: list[int] = []
-        ocr_pages:  list[int] = []
-
-        # 1) Varredura página-a-página -------------------------------------
-        for idx, page in enumerate(doc, 1):
-            has_text = len(page.get_text().strip()) >= OCR.min_native_chars
-            has_ocr  = _quick_ocr(page)             >= OCR.min_ocr_chars
-
-            if has_text:
-                text_pages.append(idx)
-            if has_ocr:
-                ocr_pages.append(idx)               # ⚠️ mesmo que haja texto!
-
-            # Conclusão antecipada a cada *batch_size*
-            if idx % OCR.batch_size == 0 and text_pages and ocr_pages:
-                kind = "hybrid"
-                break
-        else:
-            # Se TODAS as páginas têm texto nativo, é 'text'
-            if len(text_pages) == doc.page_count:
-                kind, ocr_pages = "text", []
+    budget = OCR.classify_budget_s if time_budget is None else time_budget
+    with open_context(file_path) as ctx, stats.stage("classify"):
+        t0      = time.perf_counter()
+        n       = ctx.page_count
+        sampled = stratified_sample(n, OCR.classify_strata) if n else []
+        first   = set(sampled)
+        order   = sampled + [p for p in range(1, n + 1) if p not in first]
+
+        # 1) Camada nativa em todas as páginas -----------------------------
+        labels: Dict[int, PageLabel] = {}
+        text_of: Dict[int, Tuple[bool, float]] = {}
+        ambiguous: List[int] = []
+        for pno in order:
+            if tiered:
+                has_text, has_ocr, conf = _native_signals(ctx, pno)
             else:
-                kind = ("hybrid" if text_pages and ocr_pages
-                        else "text" if text_pages else "image")
+                n_chars  = len(ctx.text(pno).strip())
+                has_text, has_ocr = n_chars >= OCR.min_native_chars, None
+                conf     = _margin(n_chars, OCR.min_native_chars, OCR.min_native_chars)
+            if has_ocr is None:
+                text_of[pno] = (has_text, conf)
+                ambiguous.append(pno)
+            else:
+                stats.incr("classify.native_pages")
+                labels[pno] = PageLabel(pno, has_text, has_ocr, conf, "native")
+
+        # 2) OCR rápido nas ambíguas, amostra primeiro, sob o orçamento ----
+        def jobs():
+            for pno in ambiguous:
+                if time.perf_counter() - t0 > budget:
+                    return
+                yield pno, render_pixmap(ctx.page(pno), OCR.quick_ocr_dpi)
 
-        # 2) Sanity-check (remove falso híbrido por cabeçalhos vetoriais)
-        if kind == "hybrid" and ocr_pages:
-            first_img = ocr_pages[0]
-            page      = doc.load_page(first_img - 1)
-            if _quick_ocr(page, central_crop=True) < OCR.min_ocr_chars:
-                kind, ocr_pages = "text", []
+        def run(job):
+            pno, pix = job
+            return pno, _quick_ocr_chars(pix, cache=cache, stats=stats)
 
-        return kind, text_pages, ocr_pages
+        for pno, n_chars in ordered_map(run, jobs(), workers):
+            stats.incr("classify.quick_ocr_pages")
+            has_text, conf = text_of[pno]
+            conf = min(conf, _margin(n_chars, OCR.min_ocr_chars, OCR.min_ocr_chars))
+            labels[pno] = PageLabel(pno, has_text, n_chars >= OCR.min_ocr_chars,
+                                    conf, "quick_ocr")
 
-    finally:
-        doc.close()
+        # 3) Sem orçamento: ambíguas restantes herdam a maioria -----------
+        left = [p for p in ambiguous if p not in labels]
+        if left:
+            votes = [l.has_ocr for l in labels.values() if l.method == "quick_ocr"]
+            yes   = sum(votes)
+            guess = yes * 2 >= len(votes) if votes else True
+            agree = max(yes, len(votes) - yes) / len(votes) if votes else 0.0
+            stats.incr("classify.inferred_pages", len(left))
+            logger.info("⏱️  orçamento de classificação esgotado: %d página(s) "
+                        "inferida(s) (has_ocr=%s)", len(left), guess)
+            for pno in left:
+                has_text, conf = text_of[pno]
+                labels[pno] = PageLabel(pno, has_text, guess,
+                                        min(conf, 0.5 * agree), "inferred")
+
+        ordered    = tuple(labels[p] for p in range(1, n + 1))
+        text_pages = [l.page for l in ordered if l.has_text]
+        ocr_pages  = [l.page for l in ordered if l.has_ocr]
+        kind, ocr_pages = _decide_kind(ctx, text_pages, ocr_pages, cache, stats)
+
+        result = Classification(kind, text_pages, ocr_pages, ordered, tuple(sampled))
+        ctx.classification = result
+        return result
 
 
 # ────────────────────────────────────────────────────────────────────
-def extract_text(file_path: str):
-    """
-    Entry-point público – delega ao loader adequado.
-    Falhas inesperadas são capturadas para não quebrar aplicações.
-    """
-    try:
-        kind, text_pages, ocr_pages = fast_classify(file_path)
+def _route(
+    file_path: PDFSource,
+    workers: int,
+    cache: OCRCache | None,
+    stats: Stats,
+    adaptive_dpi: bool = False,
+) -> Iterator[Document]:
+    # Um único PDFContext (um único fitz.open) para todas as etapas
+    with open_context(file_path) as ctx:
+        yield from _route_ctx(ctx, workers, cache, stats, adaptive_dpi)
+
+
+def _route_ctx(
+    ctx: PDFContext,
+    workers: int,
+    cache: OCRCache | None,
+    stats: Stats,
+    adaptive_dpi: bool = False,
+) -> Iterator[Document]:
+    kind, text_pages, ocr_pages = fast_classify(ctx, cache=cache, stats=stats,
+                                                workers=workers)
+    stats.label("route", kind)
 
-        if kind == "text":
-            return load_with_docling(file_path)
+    # cada rota importa só o próprio backend (Docling, rapidfuzz, SBERT…)
+    if kind == "text":
+        from .text_docling import load_with_docling
+        yield from load_with_docling(ctx, stats=stats)
 
-        if kind == "image":
-            return layout_ocr_from_pdf(file_path)
+    elif kind == "image":
+        from .image_layout_ocr import iter_layout_ocr_from_pdf
+        yield from iter_layout_ocr_from_pdf(ctx, workers=workers, cache=cache,
+                                            stats=stats, adaptive_dpi=adaptive_dpi)
 
-        # kind == "hybrid"
+    else:  # kind == "hybrid"
+        from .hybrid_pdf_loader import HybridPDFLoader
         loader = HybridPDFLoader(
-            file_path,
+            ctx,
             text_pages=text_pages,
             ocr_pages=ocr_pages,
+            workers=workers,
+            cache=cache,
+            stats=stats,
+            adaptive_dpi=adaptive_dpi,
         )
-        return loader.load()
+        yield from loader.lazy_load()
+
+
+def iter_extract_text(
+    file_path: PDFSource,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    adaptive_dpi: bool = False,
+) -> Iterator[Document]:
+    """
+    Variante streaming de `extract_text`: gera os Documents à medida que
+    as páginas são processadas (memória limitada a uma janela de páginas).
+    Falhas inesperadas são registradas e encerram o gerador.
+    """
+    try:
+        yield from _route(file_path, workers, cache, stats, adaptive_dpi)
+    except Exception as exc:                # pragma: no cover
+        logger.exception("Erro ao processar %s: %s", file_path, exc)
+
+
+def extract_text(
+    file_path: PDFSource,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    adaptive_dpi: bool = False,
+) -> List[Document]:
+    """
+    Entry-point público – delega ao loader adequado.
+    `workers` controla o OCR paralelo (1 = serial); `cache` reaproveita
+    OCR de páginas inalteradas (ver lang_hybrid_pdf.ocr_cache); `stats`
+    coleta tempos/contadores por etapa e a rota escolhida.
+    `adaptive_dpi=True` OCRiza em DPI baixo e só sobe quando a confiança
+    do Tesseract é baixa (DPI/confiança em `ocr_dpi`/`ocr_conf`).
+    Falhas inesperadas são capturadas para não quebrar aplicações.
+    """
+    try:
+        return list(_route(file_path, workers, cache, stats, adaptive_dpi))
 
     except Exception as exc:                # pragma: no cover
         logger.exception("Erro ao processar %s: %s", file_path, exc)
         return []                           # fallback seguro
+
+
+# ────────────────────────────────────────────────────────────────────
+async def aiter_extract_text(
+    file_path: PDFSource,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    adaptive_dpi: bool = False,
+    executor: ThreadPoolExecutor | None = None,
+    limiter: asyncio.Semaphore | None = None,
+) -> AsyncIterator[Document]:
+    """
+    `iter_extract_text` para asyncio: a extração roda no `executor` e os
+    Documents chegam ao event loop à medida que são gerados. `limiter`
+    (Semaphore compartilhado) limita extrações simultâneas; cancelar a
+    task interrompe o OCR e mata os subprocessos tesseract. `executor`
+    precisa ser um ThreadPoolExecutor (TypeError, não engolido, se não).
+    """
+    _check_executor(executor)
+
+    def run() -> Iterator[Document]:
+        return _route(file_path, workers, cache, stats, adaptive_dpi)
+
+    try:
+        async for doc in aiter_in_executor(run, executor=executor, limiter=limiter):
+            yield doc
+    except Exception as exc:                # pragma: no cover
+        logger.exception("Erro ao processar %s: %s", file_path, exc)
+
+
+async def aextract_text(
+    file_path: PDFSource,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    adaptive_dpi: bool = False,
+    executor: ThreadPoolExecutor | None = None,
+    limiter: asyncio.Semaphore | None = None,
+) -> List[Document]:
+    """`extract_text` sem bloquear o event loop (mesmos parâmetros + executor/limiter)."""
+    return [
+        d async for d in aiter_extract_text(
+            file_path, workers=workers, cache=cache, stats=stats,
+            adaptive_dpi=adaptive_dpi, executor=executor, limiter=limiter,
+        )
+    ]
@@ -1,13 +1,19 @@
 #lang-hybrid-pdf/src/lang_hybrid_pdf/helpers.py
 """
-helpers.py – utilidades leves, sem dependências pesadas.
+helpers.py – utilidades leves: só stdlib, NumPy (BoxIndex) e langchain_core.
 """
 
 from __future__ import annotations
-import re, unicodedata, hashlib
-from typing import Tuple, List
+import re, unicodedata, hashlib, contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+import numpy as np
 from langchain_core.documents import Document
 
+from .tokenizer import TokenCounter, resolve_tokenizer
+
 # ----------------------------------------------------------------------
 # Sort key para blocos (top-left → bottom-right)
 def bbox_sort_key(bbox: Tuple[float, float, float, float]):
@@ -25,6 +31,43 @@ def boxes_iou(a: Tuple[float, ...], b: Tuple[float, ...]) -> float:
     area_b  = (bx1 - bx0) * (by1 - by0)
     return inter / max(area_a + area_b - inter, 1)
 
+# Índice de bboxes em array NumPy: IoU de 1 caixa contra N em lote
+class BoxIndex:
+    """
+    Caixas (x0, y0, x1, y1) acumuladas numa matriz N×4 que cresce por
+    dobra. `iou`/`overlaps` fazem a mesma conta de `boxes_iou`, mas
+    vetorizada sobre todas as caixas de uma vez.
+    """
+
+    __slots__ = ("_boxes", "_n")
+
+    def __init__(self, capacity: int = 32):
+        self._boxes = np.empty((max(capacity, 1), 4), dtype=np.float64)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def add(self, bbox: Tuple[float, ...]) -> None:
+        if self._n == len(self._boxes):
+            self._boxes = np.concatenate([self._boxes, np.empty_like(self._boxes)])
+        self._boxes[self._n] = bbox[:4]
+        self._n += 1
+
+    def iou(self, bbox: Tuple[float, ...]) -> np.ndarray:
+        b = self._boxes[: self._n]
+        ax0, ay0, ax1, ay1 = bbox[:4]
+        inter_w = np.maximum(0, np.minimum(ax1, b[:, 2]) - np.maximum(ax0, b[:, 0]))
+        inter_h = np.maximum(0, np.minimum(ay1, b[:, 3]) - np.maximum(ay0, b[:, 1]))
+        inter   = inter_w * inter_h
+        area_a  = (ax1 - ax0) * (ay1 - ay0)
+        area_b  = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+        return inter / np.maximum(area_a + area_b - inter, 1)
+
+    def overlaps(self, bbox: Tuple[float, ...], threshold: float = 0.5) -> bool:
+        """Alguma caixa com IoU ≥ `threshold`?"""
+        return bool(self._n) and bool((self.iou(bbox) >= threshold).any())
+
 # “Fingerprint” de texto para deduplicação barata
 def fingerprint(text: str, n: int = 120) -> str:
     txt = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
@@ -32,8 +75,172 @@ def fingerprint(text: str, n: int = 120) -> str:
     txt = re.sub(r"[^a-z0-9]", "", txt)
     return hashlib.md5(txt[:n].encode()).hexdigest()
 
-# Stub simples: mantém chunks se não houver token_limit
+# ----------------------------------------------------------------------
+# Map paralelo (threads) que preserva a ordem de entrada
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+def ordered_map(
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    workers: int = 1,
+    window: int | None = None,
+) -> Iterator[_R]:
+    """
+    Aplica `fn` a cada item e gera os resultados NA ORDEM de `items`.
+
+    • workers <= 1 → execução serial, sem pool.
+    • workers  > 1 → ThreadPoolExecutor; ideal para o Tesseract,
+      que rodam em subprocessos e liberam o GIL.
+    • `window` limita quantos itens ficam em voo (default 2 × workers);
+      `items` é consumido na thread chamadora, então pode renderizar
+      com PyMuPDF (que não é thread-safe) sem problemas.
+    • cada tarefa roda numa cópia do contexto (ContextVars) da chamadora
+      – é assim que o `cancel.CancelScope` chega às threads do pool.
+    """
+    if workers <= 1:
+        for it in items:
+            yield fn(it)
+        return
+
+    window = max(window or workers * 2, 1)
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for it in items:
+                pending.append(pool.submit(contextvars.copy_context().run, fn, it))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for fut in pending:          # gerador fechado antes do fim
+                fut.cancel()
+
+# ----------------------------------------------------------------------
+# Corte/junção de chunks por limite de tokens
+_SEPARATORS = (
+    (re.compile(r"\n\s*\n"), "\n\n"),          # parágrafos
+    (re.compile(r"\n"), "\n"),                   # linhas
+    (re.compile(r"(?<=[.!?;:])\s+"), " "),        # frases
+    (re.compile(r"\s+"), " "),                    # palavras
+)
+
+def _hard_split(text: str, limit: int, count: TokenCounter) -> List[Tuple[str, int]]:
+    """Último recurso (palavra gigante): fatia por caracteres."""
+    out: List[Tuple[str, int]] = []
+    while text:
+        n    = count(text)
+        if n <= limit:
+            out.append((text, n))
+            break
+        step = max(1, len(text) * limit // n)
+        while step > 1 and count(text[:step]) > limit:
+            step //= 2
+        out.append((text[:step], count(text[:step])))
+        text = text[step:]
+    return out
+
+def _split_text(
+    text: str, limit: int, count: TokenCounter, level: int = 0, n: int | None = None
+) -> List[Tuple[str, int]]:
+    """
+    Divide `text` em pedaços de até `limit` tokens, preferindo quebrar em
+    parágrafo → linha → frase → palavra. Devolve (texto, nº de tokens).
+    """
+    n = count(text) if n is None else n
+    if n <= limit:
+        return [(text, n)]
+    if level >= len(_SEPARATORS):
+        return _hard_split(text, limit, count)
+
+    pat, joiner = _SEPARATORS[level]
+    parts = [p for p in pat.split(text) if p.strip()]
+    if len(parts) <= 1:
+        return _split_text(text, limit, count, level + 1, n)
+
+    sep_n = count(joiner)
+    out: List[Tuple[str, int]] = []
+    buf, buf_n = "", 0
+    for part in parts:
+        for piece, pn in _split_text(part, limit, count, level + 1):
+            if buf and buf_n + sep_n + pn <= limit:
+                buf, buf_n = buf + joiner + piece, buf_n + sep_n + pn
+            else:
+                if buf:
+                    out.append((buf, buf_n))
+                buf, buf_n = piece, pn
+    if buf:
+        out.append((buf, buf_n))
+    return out
+
+def _merge_meta(a: dict, b: dict) -> dict:
+    """
+    Metadados de dois chunks juntados: bbox → união; números → faixa;
+    palavras do OCR e `dl_meta.doc_items` do Docling → concatenados;
+    chaves só de `b` são copiadas (nada do 2º chunk se perde).
+    """
+    out = dict(a)
+    for key, vb in b.items():
+        if key not in a:
+            out[key] = vb
+            continue
+        va = a[key]
+        if key == "bbox" and va is not None and vb is not None:
+            out["bbox"] = (min(va[0], vb[0]), min(va[1], vb[1]),
+                           max(va[2], vb[2]), max(va[3], vb[3]))
+        elif key == "ocr_words" and va is not None:
+            out[key] = va + vb
+        elif key == "dl_meta" and isinstance(va, dict) and isinstance(vb, dict):
+            out[key] = {**vb, **va,
+                        "doc_items": list(va.get("doc_items", [])) + list(vb.get("doc_items", []))}
+        elif isinstance(vb, int) and isinstance(va, int) and vb != va:
+            out[f"{key}_end"] = vb
+    return out
+
 def adjust_chunks_to_token_limit(
-    docs: List[Document], token_limit: int | None = None
+    docs: List[Document],
+    token_limit: int | None = None,
+    tokenizer: str | TokenCounter | None = None,
 ) -> List[Document]:
-    return docs if token_limit else docs
+    """
+    Garante no máximo `token_limit` tokens por Document.
+
+    • chunks grandes são divididos (parágrafo → linha → frase → palavra);
+      cada pedaço herda os metadados e ganha `chunk` (0, 1, …)
+    • chunks pequenos ADJACENTES e da MESMA página são juntados enquanto
+      couberem no limite; `bbox` vira a união e campos numéricos
+      (ex.: `line`) ganham `<campo>_end`. Sem `page` (ex.: DOC_CHUNKS do
+      Docling) não há como saber a página: o chunk nunca é juntado
+    • `token_limit=None` devolve `docs` inalterado
+
+    `tokenizer` aceita o mesmo que `tokenizer.set_tokenizer` (default:
+    o global, aproximado).
+    """
+    if not token_limit:
+        return docs
+    count = resolve_tokenizer(tokenizer)
+    sep_n = count("\n")
+
+    out: List[Document] = []
+    buf_text, buf_meta, buf_n = "", {}, 0
+    for d in docs:
+        pieces = _split_text(d.page_content, token_limit, count)
+        for k, (text, n) in enumerate(pieces):
+            meta = dict(d.metadata, chunk=k) if len(pieces) > 1 else d.metadata
+            if (
+                buf_text
+                and meta.get("page") is not None
+                and buf_meta.get("page") == meta.get("page")
+                and buf_n + sep_n + n <= token_limit
+            ):
+                buf_text += "\n" + text
+                buf_meta  = _merge_meta(buf_meta, meta)
+                buf_n    += sep_n + n
+                continue
+            if buf_text:
+                out.append(Document(buf_text, metadata=buf_meta))
+            buf_text, buf_meta, buf_n = text, meta, n
+    if buf_text:
+        out.append(Document(buf_text, metadata=buf_meta))
+    return out
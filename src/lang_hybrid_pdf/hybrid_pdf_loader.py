@@ -6,30 +6,84 @@ Loader híbrido: extrai texto nativo via Docling quando disponível
 e aplica OCR seletivo (bloco-a-bloco) em páginas ou PDFs onde o
 texto está “embutido” em imagens. Mantém deduplicação barata e
 pode receber as páginas já classificadas pelo extractor_router.
+Aceita caminho, bytes/memoryview/mmap, objeto-arquivo (ver
+`document.PDFSource`) ou um PDFContext compartilhado com o router. Um
+stream sem `fileno`/buffer (ex.: corpo HTTP) é lido no 1º `load()`:
+para carregar de novo, passe bytes ou um PDFContext.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import List, Tuple
+import os
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from typing import (TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterable, Iterator,
+                    List, NamedTuple, Tuple)
 
 import fitz                       # PyMuPDF
-import pytesseract
-from PIL import Image
-from rapidfuzz import fuzz
-from pdf2image import convert_from_path
 from langchain_core.documents import Document
-from langchain_community.document_loaders.base import BaseLoader
-from lang_hybrid_pdf.settings import OCR
+from langchain_core.document_loaders import BaseLoader   # sem langchain_community
+from lang_hybrid_pdf.settings import (DEDUP, GATE, OCR, REGION, DedupCfg, GateCfg,
+                                      RegionCfg)
 
 from .helpers import (
     bbox_sort_key,
-    boxes_iou,
-    fingerprint,
+    BoxIndex,
     adjust_chunks_to_token_limit,
+    ordered_map,
 )
+from .aio import aiter_in_executor
+from .block_gate import BlockGate
+from .checkpoint import Checkpoint, decode_docs, document_hash, encode_docs, resume_map
+from .dedup import ExactIndex, NearDupIndex, make_index, page_index
+from .blocks import (
+    NATIVE,
+    OCR_SRC,
+    BlockStore,
+    chunk_spans,
+    iter_documents,
+    span_document,
+    span_text,
+)
+from .ocr import (
+    AdaptiveResult,
+    adaptive_ocr,
+    dpi_ladder,
+    image_to_data,
+    image_to_string,
+    mean_confidence,
+    ocr_with_confidence,
+)
+from .region_ocr import RegionPlan, make_plan, render_region, split_words, use_page_mode
+from .incremental import (
+    DOC_ID_KEY,
+    STAGES,
+    IncrementalResult,
+    PageDocs,
+    make_manifest,
+    old_documents,
+    page_fingerprints,
+    read_manifest,
+    reusable_pages,
+    with_id,
+    write_manifest,
+)
+from .ocr_cache import OCRCache
+from .raster import render_pixmap
+from .stats import NULL_STATS, Stats
+from .document import PDFContext, PDFSource, open_context
 from .text_docling import load_with_docling
-from .image_layout_ocr import layout_ocr_from_pdf  # caso router peça fallback
+if TYPE_CHECKING:
+    from PIL import Image
+
+from .image_layout_ocr import (  # caso router peça fallback
+    layout_ocr_from_pdf,
+    render_page,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +93,32 @@ _MIN_NATIVE_CHARS = OCR.min_native_chars
 _MIN_OCR_CHARS    = OCR.min_ocr_chars
 _DPI_PAGE_IMAGE   = OCR.page_image_dpi
 _DPI_BLOCK_IMAGE  = int(OCR.quick_ocr_dpi * 2.5)
+_PAGE             = -1            # job do modo página em `_prefetch_ocr`
+_REPEAT           = object()      # cópia de imagem cujo 1º OCR saiu curto
+
+
+class _Job(NamedTuple):
+    """Um OCR de `_prefetch_ocr` (bloco, página no modo página ou vazio)."""
+    pno:  int
+    idx:  int | None              # bloco, `_PAGE` ou None (página sem candidatos)
+    bbox: object                  # bbox do bloco ou o RegionPlan
+    img:  fitz.Pixmap | None
+    last: bool                    # último job da página
+    own:  Future | None = None    # 1ª cópia da imagem: publica "saiu curto?"
+    wait: Future | None = None    # cópia seguinte: espera a 1ª
+
+
+def _settle(fut: Future, short: bool) -> None:
+    if not fut.done():
+        try:
+            fut.set_result(short)
+        except InvalidStateError:   # corrida worker × thread principal
+            pass
+
+
+def _page1(d: Document) -> int:
+    """Página 1-based de um Document do Docling (que devolve 0-based)."""
+    return (d.metadata.get("page") or 0) + 1
 
 # ----------------------------------------------------------------------
 class HybridPDFLoader(BaseLoader):
@@ -46,11 +126,31 @@ class HybridPDFLoader(BaseLoader):
     Extrai texto nativo + aplica OCR seletivo em PDFs híbridos.
     Se `text_pages`/`ocr_pages` forem passados (via router), pula
     a classificação local e usa esses rótulos diretamente.
+    Com `workers > 1` o OCR (páginas e blocos) roda num pool de threads
+    em volta dos subprocessos do Tesseract; a saída é idêntica à serial.
+    `cache` (OCRCache) reaproveita o OCR de blocos/páginas inalterados.
+    `stats` (Stats) coleta tempos por etapa/página e contadores de dedup.
+    `token_limit` corta/junta os chunks (ver `tokenizer.set_tokenizer`).
+    `block_gate` (GateCfg) pula, sem OCR, blocos-imagem que não parecem
+    texto (logos, fotos, filetes); `None` OCRiza todos como antes.
+    `adaptive_dpi=True` OCRiza primeiro em DPI baixo (OCR.adaptive_dpis) e
+    só re-renderiza mais alto se a confiança do Tesseract ficar abaixo de
+    OCR.adaptive_min_conf; DPI e confiança vão para `ocr_dpi`/`ocr_conf`.
+    `region_ocr` (RegionCfg) OCRiza numa passada só (página renderizada
+    uma vez, texto nativo mascarado) as páginas com muitos blocos-imagem;
+    as palavras vão para `ocr_words`. `None` mantém o bloco a bloco.
+    `checkpoint` (Checkpoint) grava os Documents de cada página assim que
+    ficam prontos; se a extração cair, o próximo `load()` do mesmo PDF
+    (mesmo conteúdo e configuração) só processa as páginas que faltam.
+    `dedup` (DedupCfg) descarta quase-duplicatas no documento inteiro
+    (MinHash + LSH, ver dedup.py); `None` só descarta textos idênticos.
+    `load_incremental(manifest)` re-extrai só as páginas alteradas desde a
+    rodada anterior e devolve o diff de Documents (ver incremental.py).
     """
 
     def __init__(
         self,
-        file_path: str,
+        file_path: PDFSource,
         *,
         # --- overrides de OCR ---
         ocr_lang: str = "por+eng",
@@ -60,9 +160,25 @@ class HybridPDFLoader(BaseLoader):
         dpi_block_image: int = int(_DPI_BLOCK_IMAGE),
         # --- controle de chunk ---
         token_limit: int | None = None,
+        tokenizer: str | Callable[[str], int] | None = None,
         # --- rótulos vindos de fora (opcional) ---
         text_pages: list[int] | None = None,
         ocr_pages:  list[int] | None = None,
+        # --- paralelismo / cache ---
+        workers: int = 1,
+        cache: OCRCache | None = None,
+        # --- DPI adaptativo (OCR em DPI baixo, sobe se confiança baixa) ---
+        adaptive_dpi: bool = False,
+        # --- filtro pré-OCR de blocos-imagem (None desliga) ---
+        block_gate: GateCfg | None = GATE,
+        # --- OCR da página numa passada (None: sempre bloco a bloco) ---
+        region_ocr: RegionCfg | None = REGION,
+        # --- dedup de quase-duplicatas (None: só textos idênticos) ---
+        dedup: DedupCfg | None = DEDUP,
+        # --- extração retomável (journal por página) ---
+        checkpoint: Checkpoint | None = None,
+        # --- instrumentação (opt-in) ---
+        stats: Stats | None = None,
     ):
         self.file_path = file_path
 
@@ -72,6 +188,16 @@ class HybridPDFLoader(BaseLoader):
         self.DPI_PAGE_IMAGE    = dpi_page_image
         self.DPI_BLOCK_IMAGE   = dpi_block_image
         self.token_limit       = token_limit
+        self.tokenizer         = tokenizer
+        self.workers           = max(1, workers)
+        self.cache             = cache
+        self.stats             = stats or NULL_STATS
+        self.block_gate        = block_gate
+        self.adaptive_dpi      = adaptive_dpi
+        self.dedup             = dedup
+        self.region_ocr        = region_ocr
+        self.checkpoint        = checkpoint
+        self._gate_skipped     = 0
 
         self._text_pages_in = text_pages
         self._ocr_pages_in  = ocr_pages
@@ -79,12 +205,11 @@ class HybridPDFLoader(BaseLoader):
     # ------------------------------------------------------------------
     # Helpers internos
     # ------------------------------------------------------------------
-    def _classify_pages(self) -> Tuple[str, list[int], list[int]]:
+    def _classify_pages(self, ctx: PDFContext) -> Tuple[str, list[int], list[int]]:
         """Rótula cada página como text / ocr e devolve o tipo global."""
-        doc = fitz.open(self.file_path)
         text_pages, ocr_pages = [], []
-        for pno, page in enumerate(doc, 1):
-            if len(page.get_text().strip()) >= self.MIN_NATIVE_CHARS:
+        for pno in range(1, ctx.page_count + 1):
+            if len(ctx.text(pno).strip()) >= self.MIN_NATIVE_CHARS:
                 text_pages.append(pno)
             else:
                 ocr_pages.append(pno)
@@ -97,19 +222,149 @@ class HybridPDFLoader(BaseLoader):
         logger.info("📑 %s | text=%s | ocr=%s", kind, text_pages, ocr_pages)
         return kind, text_pages, ocr_pages
 
-    def _extract_blocks_hybrid(self, page: fitz.Page, pno: int) -> List[Document]:
-        """Executa OCR seletivo bloco-a-bloco numa página híbrida."""
-        collected: list[tuple[Tuple[float, ...], str]] = []
-        docs: List[Document] = []
-
-        blocks = sorted(
-            page.get_text("dict")["blocks"],
+    @staticmethod
+    def _sorted_blocks(ctx: PDFContext, pno: int) -> list[dict]:
+        return sorted(
+            ctx.blocks(pno),
             key=lambda b: bbox_sort_key(tuple(b["bbox"])),
         )
 
-        for blk in blocks:
+    def _render_block(self, page: fitz.Page, bbox, dpi: int | None = None) -> fitz.Pixmap:
+        """Pixmap do bloco (cinza por padrão) – vai direto ao backend de OCR."""
+        with self.stats.stage("render", page=page.number + 1):
+            return render_pixmap(page, dpi or self.DPI_BLOCK_IMAGE, bbox)
+
+    def _ocr_image(self, img: Image.Image | fitz.Pixmap, **key_extra) -> str:
+        return image_to_string(img, lang=self.ocr_lang, cache=self.cache,
+                               stats=self.stats, **key_extra).strip()
+
+    def _ocr_block(self, img: fitz.Pixmap, bbox) -> str:
+        return self._ocr_image(img, dpi=self.DPI_BLOCK_IMAGE, clip=tuple(bbox))
+
+    # ---- DPI adaptativo ---------------------------------------------
+    def _ladder(self, max_dpi: int) -> list[int]:
+        if not self.adaptive_dpi:
+            return [max_dpi]
+        return dpi_ladder(max_dpi, OCR.adaptive_dpis)
+
+    def _adaptive(self, render, dpis, first=None, **key_extra) -> Tuple[str, dict]:
+        res = adaptive_ocr(render, dpis, lang=self.ocr_lang,
+                           min_conf=OCR.adaptive_min_conf, cache=self.cache,
+                           stats=self.stats, first=first, **key_extra)
+        return res.text, {"ocr_dpi": res.dpi, "ocr_conf": round(res.conf, 1)}
+
+    def _block_text(
+        self, page: fitz.Page, bbox, first: AdaptiveResult | None = None
+    ) -> Tuple[str, dict]:
+        """OCR de um bloco → (texto, metadados extras de DPI/confiança)."""
+        if not self.adaptive_dpi:
+            return self._ocr_block(self._render_block(page, bbox), bbox), {}
+        return self._adaptive(
+            lambda dpi: self._render_block(page, bbox, dpi),
+            self._ladder(self.DPI_BLOCK_IMAGE), first, clip=tuple(bbox),
+        )
+
+    def _ocr_candidates(
+        self, ctx: PDFContext, pno: int, gate: BlockGate | None = None
+    ) -> tuple[list[tuple[int, Tuple[float, ...]]], Dict[int, str]]:
+        """
+        Blocos-imagem que o caminho serial *pode* OCRizar: os que não
+        se sobrepõem (IoU ≥ 0.5) a texto nativo anterior. É um superconjunto
+        – o filtro final continua em `_extract_blocks_hybrid`.
+        Devolve também os barrados pelo `gate` (idx → motivo).
+        """
+        native = BoxIndex()
+        cands: list[tuple[int, Tuple[float, ...]]] = []
+        gated: Dict[int, str] = {}
+        page = ctx.page(pno) if gate is not None else None
+        for idx, blk in enumerate(self._sorted_blocks(ctx, pno)):
+            bbox = blk["bbox"]
+            if blk["type"] == 0:
+                native.add(bbox)
+            elif blk["type"] == 1 and not native.overlaps(bbox, 0.5):
+                reason = gate.check(page, blk) if gate is not None else None
+                if reason:
+                    gated[idx] = reason
+                else:
+                    cands.append((idx, bbox))
+        return cands, gated
+
+    # ---- OCR da página numa passada (ver region_ocr.py) --------------
+    def _region_plan(
+        self, ctx: PDFContext, pno: int, gate: BlockGate | None = None
+    ) -> Tuple[RegionPlan | None, Dict[int, str]]:
+        """
+        Plano do modo página (None: bloco a bloco) + os barrados pelo
+        `gate`. A escolha olha os candidatos sem o filtro (barato); o
+        filtro só roda se o modo página for escolhido.
+        """
+        cfg = self.region_ocr
+        if cfg is None:
+            return None, {}
+        cands, _ = self._ocr_candidates(ctx, pno)
+        if not use_page_mode(ctx.page(pno).rect, cands, cfg):
+            return None, {}
+        gated: Dict[int, str] = {}
+        if gate is not None:
+            cands, gated = self._ocr_candidates(ctx, pno, gate)
+        self.stats.incr("blocks.region_pages")
+        return make_plan(self._sorted_blocks(ctx, pno), cands), gated
+
+    def _render_region(self, page: fitz.Page, plan: RegionPlan, dpi: int) -> fitz.Pixmap:
+        with self.stats.stage("render", page=page.number + 1):
+            return render_region(page, plan, dpi)
+
+    def _region_data(self, img: fitz.Pixmap, plan: RegionPlan, dpi: int) -> Dict[str, list]:
+        return image_to_data(img, lang=self.ocr_lang, cache=self.cache, stats=self.stats,
+                             dpi=dpi, clip=plan.clip)
+
+    def _region_text(
+        self, page: fitz.Page, plan: RegionPlan, first: Dict[str, list] | None = None
+    ) -> Dict[int, Tuple[str, dict]]:
+        """
+        OCR do plano → {idx do bloco: (texto, metadados)}, no formato do
+        `prefetched` de `_extract_blocks_hybrid`. No modo adaptativo sobe
+        o DPI da página inteira enquanto a confiança média ficar baixa;
+        `first` é o `image_to_data` já feito no 1º DPI (ex.: num worker).
+        """
+        if not plan.boxes:
+            return {}
+        dpis = self._ladder(self.DPI_BLOCK_IMAGE)
+        for n, dpi in enumerate(dpis):
+            data = first if not n and first is not None else \
+                self._region_data(self._render_region(page, plan, dpi), plan, dpi)
+            if not self.adaptive_dpi or mean_confidence(data) >= OCR.adaptive_min_conf:
+                break
+        if self.adaptive_dpi:
+            self.stats.incr("ocr.adaptive_escalations", dpis.index(dpi))
+            self.stats.incr(f"ocr.adaptive_dpi_{dpi}")
+        texts, lost = split_words(data, plan, dpi)
+        if lost:
+            self.stats.incr("blocks.region_words_unmapped", lost)
+        return {idx: texts.get(idx, ("", {})) for idx, _ in plan.boxes}
+
+    def _extract_blocks_hybrid(
+        self,
+        ctx: PDFContext,
+        pno: int,
+        prefetched: Dict[int, Tuple[str, dict]] | None = None,
+        gated: Dict[int, str] | None = None,
+        gate: BlockGate | None = None,
+    ) -> BlockStore:
+        """
+        Executa OCR seletivo bloco-a-bloco numa página híbrida e devolve
+        os blocos aceitos num `BlockStore` (Documents só na saída).
+        `prefetched` (idx do bloco → texto OCR, metadados) e `gated` (idx → motivo
+        do descarte pelo filtro pré-OCR) vêm do modo paralelo; no serial
+        o `gate` é consultado aqui, antes de renderizar.
+        """
+        # caixas (índice NumPy) e textos já guardados (fuzz.ratio, ver page_index)
+        boxes = BoxIndex()
+        texts = page_index(self.dedup or DEDUP)
+        store = BlockStore()
+
+        for idx, blk in enumerate(self._sorted_blocks(ctx, pno)):
             bbox, btype = blk["bbox"], blk["type"]
-            meta = {"page": pno, "bbox": bbox}
 
             # ---- A. texto nativo ---------------------------------
             if btype == 0:
@@ -117,86 +372,439 @@ class HybridPDFLoader(BaseLoader):
                     w["text"] for l in blk["lines"] for w in l["spans"]
                 ).strip()
                 if line:
-                    collected.append((bbox, line))
-                    docs.append(Document(line, metadata=meta))
+                    boxes.add(bbox)
+                    texts.add(line)
+                    store.add(pno, bbox, line, NATIVE)
 
             # ---- B. imagem → OCR --------------------------------
             elif btype == 1:
                 # se a imagem cobre >=50 % de bloco com texto já capturado → pula
-                if any(boxes_iou(bbox, tbx) >= 0.5 for tbx, _ in collected):
+                if boxes.overlaps(bbox, 0.5):
+                    self.stats.incr("blocks.skipped_iou")
+                    continue
+
+                # filtro pré-OCR: logo, assinatura, foto, filete…
+                if prefetched is not None:
+                    reason = (gated or {}).get(idx)
+                else:
+                    reason = gate.check(ctx.page(pno), blk) if gate else None
+                if reason:
+                    self.stats.incr("blocks.skipped_gate", reason=reason)
+                    self.stats.incr(f"blocks.skipped_gate.{reason}")
+                    self._gate_skipped += 1
                     continue
 
-                pix = page.get_pixmap(dpi=self.DPI_BLOCK_IMAGE,
-                                      clip=fitz.Rect(*bbox))
-                img = Image.frombytes("RGB", (pix.width, pix.height),
-                                      pix.samples)
-                ocr = pytesseract.image_to_string(img,
-                                                  lang=self.ocr_lang).strip()
+                if prefetched is not None and idx in prefetched:
+                    ocr, extra = prefetched[idx]
+                else:
+                    ocr, extra = self._block_text(ctx.page(pno), bbox)
 
                 if len(ocr) < self.MIN_OCR_CHARS:
+                    self.stats.incr("blocks.skipped_short_ocr")
+                    if gate is not None:
+                        gate.useless(blk)
                     continue
-                if any(fuzz.ratio(ocr, txt) >= 90 for _, txt in collected):
+                if texts.add(ocr) is not None:
+                    self.stats.incr("blocks.skipped_fuzzy")
                     continue  # muito parecido com algo já guardado
 
-                collected.append((bbox, ocr))
-                docs.append(Document(ocr, metadata=meta))
+                boxes.add(bbox)
+                store.add(pno, bbox, ocr, OCR_SRC, extra.get("ocr_conf", -1.0),
+                          extra.get("ocr_dpi", 0), extra.get("ocr_words"))
+
+        return store
+
+    def _prefetch_ocr(
+        self, ctx: PDFContext, pnos: list[int], gate: BlockGate | None = None
+    ) -> Iterator[tuple[int, Dict[int, Tuple[str, dict]], Dict[int, str]]]:
+        """
+        Renderiza os blocos candidatos (thread principal – PyMuPDF não é
+        thread-safe) e OCRiza no pool. Gera (pno, {idx: (texto, meta)},
+        {idx: motivo do filtro}) em ordem. No modo adaptativo o pool faz
+        o 1º DPI; as re-renderizações (raras) ficam na thread principal.
+        Páginas no modo página viram um único job (`_PAGE`).
 
-        return docs
+        Com `gate`, cópias de uma imagem (mesmo `BlockGate.key`, ex.: o
+        logo do timbre) não são OCRizadas antes de a 1ª terminar: a cópia
+        espera, no worker, o resultado da 1ª e vira "repeat" sem OCR se
+        ele saiu curto – como no serial, embora as páginas à frente já
+        tenham passado pelo filtro antes de `gate.useless()`.
+        """
+        gated_by_page: Dict[int, Dict[int, str]] = {}
+        dpis  = self._ladder(self.DPI_BLOCK_IMAGE)
+        first: Dict[tuple, Future] = {}          # key da imagem → 1º OCR saiu curto?
+
+        def jobs():
+            for pno in pnos:
+                page  = ctx.page(pno)
+                plan, gated_by_page[pno] = self._region_plan(ctx, pno, gate)
+                if plan is not None:
+                    img = self._render_region(page, plan, dpis[0]) if plan.boxes else None
+                    yield _Job(pno, _PAGE, plan, img, True)
+                    continue
+                cands, gated_by_page[pno] = self._ocr_candidates(ctx, pno, gate)
+                if not cands:
+                    yield _Job(pno, None, None, None, True)
+                blocks = self._sorted_blocks(ctx, pno) if gate is not None else ()
+                for n, (idx, bbox) in enumerate(cands, 1):
+                    key = gate.key(blocks[idx]) if gate is not None else None
+                    own = wait = None
+                    if key is not None:
+                        wait = first.get(key)
+                        if wait is None:
+                            own = first[key] = Future()
+                    if wait is not None and wait.done() and wait.result():
+                        img = None                          # já se sabe: "repeat"
+                    else:
+                        img = self._render_block(page, bbox, dpis[0])
+                    yield _Job(pno, idx, bbox, img, n == len(cands), own, wait)
+
+        def run(job: _Job):
+            # FIFO do pool: a 1ª cópia já saiu da fila quando esta começa
+            if job.wait is not None and job.wait.result():
+                return job, _REPEAT
+            try:
+                if job.img is None:
+                    res = None
+                elif job.idx == _PAGE:
+                    res = self._region_data(job.img, job.bbox, dpis[0])
+                elif self.adaptive_dpi:
+                    res = ocr_with_confidence(job.img, dpis[0], lang=self.ocr_lang,
+                                              cache=self.cache, stats=self.stats,
+                                              clip=tuple(job.bbox))
+                else:
+                    res = (self._ocr_block(job.img, job.bbox), {})
+            except BaseException:
+                if job.own is not None:                 # não prende as cópias
+                    _settle(job.own, False)
+                raise
+            if job.own is not None and not self.adaptive_dpi:
+                _settle(job.own, len(res[0]) < self.MIN_OCR_CHARS)
+            return job, res
+
+        acc: Dict[int, Tuple[str, dict]] = {}
+        results = ordered_map(run, jobs(), self.workers)
+        try:
+            for job, res in results:
+                pno, idx = job.pno, job.idx
+                if idx == _PAGE:
+                    acc = self._region_text(ctx.page(pno), job.bbox, first=res)
+                elif res is _REPEAT:
+                    gated_by_page[pno][idx] = "repeat"
+                elif idx is not None:
+                    if self.adaptive_dpi:               # texto final (após subir DPI)
+                        res = self._block_text(ctx.page(pno), job.bbox, first=res)
+                        if job.own is not None:
+                            _settle(job.own, len(res[0]) < self.MIN_OCR_CHARS)
+                    acc[idx] = res
+                if job.last:
+                    yield pno, acc, gated_by_page.pop(pno, {})
+                    acc = {}
+        finally:
+            for fut in first.values():                  # erro/fechamento: libera as
+                _settle(fut, False)                     # cópias antes de fechar o pool
+            results.close()
 
     # ------------------------------------------------------------------
     # API pública (BaseLoader)
     # ------------------------------------------------------------------
-    def load(self) -> List[Document]:
-        # 0) Usa rótulos do router caso venham preenchidos
+    def _iter_batches(
+        self,
+        ctx: PDFContext,
+        kind: str,
+        text_pages: list[int],
+        ocr_pages: list[int],
+        image_pages: list[int] | None = None,
+    ) -> Iterator[List[Document] | BlockStore]:
+        """
+        Gera lotes assim que ficam prontos: o texto nativo num lote só e,
+        depois, UM por página – listas de Documents ou, nas páginas
+        híbridas, o `BlockStore` da página.
+        `image_pages` restringe o caminho de PDF 100 % imagem (default:
+        todas as páginas).
+        """
+        # 1) Texto nativo (Docling só nas páginas selecionadas) -------
+        if text_pages:
+            docs_text = load_with_docling(ctx, pages=text_pages, stats=self.stats)
+            # CORREÇÃO 0-based → 1-based
+            yield [d for d in docs_text if _page1(d) in text_pages]
+
+        # 2) PDF 100 % imagem (uma página renderizada por vez) --------
+        if kind == "image" and not text_pages:
+            dpis = self._ladder(self.DPI_PAGE_IMAGE)
+
+            def _render(pno: int, dpi: int) -> fitz.Pixmap:
+                with self.stats.stage("render", page=pno):
+                    return render_page(ctx, pno, dpi)
+
+            def _ocr_page(item: Tuple[int, fitz.Pixmap]):
+                pno, img = item
+                with self.stats.stage("page", page=pno):
+                    if self.adaptive_dpi:
+                        return ocr_with_confidence(img, dpis[0], lang=self.ocr_lang,
+                                                   cache=self.cache, stats=self.stats)
+                    return self._ocr_image(img, dpi=dpis[0]), {}
+
+            # PyMuPDF só nesta thread: renderiza aqui, OCR no pool; as
+            # re-renderizações do modo adaptativo também ficam aqui
+            pnos = range(1, ctx.page_count + 1) if image_pages is None else image_pages
+            jobs = ((pno, _render(pno, dpis[0])) for pno in pnos)
+            for i, res in zip(pnos, ordered_map(_ocr_page, jobs, self.workers)):
+                if self.adaptive_dpi:
+                    res = self._adaptive(partial(_render, i), dpis, first=res)
+                txt, extra = res            # um lote por página, mesmo vazio
+                yield [Document(txt, metadata={"page": i, **extra})] if txt else []
+
+        # 3) Páginas híbridas -----------------------------------------
+        if ocr_pages:
+            gate = BlockGate(self.block_gate) if self.block_gate else None
+            self._gate_skipped = 0
+            if self.workers > 1:
+                for pno, pre, gated in self._prefetch_ocr(ctx, ocr_pages, gate):
+                    with self.stats.stage("page", page=pno):
+                        store = self._extract_blocks_hybrid(ctx, pno, pre, gated, gate)
+                    yield store
+            else:
+                for pno in ocr_pages:
+                    with self.stats.stage("page", page=pno):
+                        plan, gated = self._region_plan(ctx, pno, gate)
+                        pre = None if plan is None else self._region_text(ctx.page(pno), plan)
+                        store = self._extract_blocks_hybrid(ctx, pno, pre, gated, gate)
+                    yield store
+            if self._gate_skipped:
+                logger.info("🚫 %d bloco(s)-imagem pulados pelo filtro pré-OCR",
+                            self._gate_skipped)
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Versão streaming: renderiza/OCRiza uma página (ou uma janela de
+        `2 × workers` páginas) por vez e já devolve os Documents,
+        deduplicando (quase-duplicatas, ver dedup.py) à medida que avança.
+        """
+        with open_context(self.file_path) as ctx:
+            seen = make_index(self.dedup)
+            if self.checkpoint is not None:     # lotes já cortados por token_limit
+                for docs in self._journaled(ctx):
+                    yield from (d for d in docs if self._keep(d.page_content, seen))
+                return
+            kind, text_pages, ocr_pages = self._labels(ctx)
+            # Token-limit (por lote) + deduplicação incremental --------
+            for batch in self._iter_batches(ctx, kind, text_pages, ocr_pages):
+                if isinstance(batch, BlockStore):   # Document só p/ quem sobrevive
+                    for span in chunk_spans(batch, self.token_limit, self.tokenizer):
+                        if self._keep(span_text(batch, span), seen):
+                            yield span_document(batch, span)
+                    continue
+                for d in adjust_chunks_to_token_limit(batch, self.token_limit,
+                                                      self.tokenizer):
+                    if self._keep(d.page_content, seen):
+                        yield d
+
+    def _undeduped(self, ctx: PDFContext) -> Iterator[List[Document]]:
+        """
+        Os lotes de `lazy_load` ainda SEM a dedup do documento (o `batch`
+        junta os lotes de várias tarefas e deduplica uma vez só).
+        """
+        if self.checkpoint is not None:
+            return self._journaled(ctx)
+        kind, text_pages, ocr_pages = self._labels(ctx)
+        return map(self._documents, self._iter_batches(ctx, kind, text_pages, ocr_pages))
+
+    def _documents(self, batch: List[Document] | BlockStore) -> List[Document]:
+        """Lote → Documents já cortados por `token_limit` (sem dedup)."""
+        if isinstance(batch, BlockStore):
+            return list(iter_documents(batch, self.token_limit, self.tokenizer))
+        return adjust_chunks_to_token_limit(batch, self.token_limit, self.tokenizer)
+
+    def _labels(self, ctx: PDFContext) -> Tuple[str, list[int], list[int]]:
+        # Usa rótulos do router caso venham preenchidos
         if self._text_pages_in is not None and self._ocr_pages_in is not None:
             kind = "hybrid"
             text_pages, ocr_pages = self._text_pages_in, self._ocr_pages_in
+        elif ctx.classification is not None:
+            kind, text_pages, ocr_pages = ctx.classification
         else:
-            kind, text_pages, ocr_pages = self._classify_pages()
+            with self.stats.stage("classify"):
+                kind, text_pages, ocr_pages = self._classify_pages(ctx)
+        self.stats.label("loader_kind", kind)
+        return kind, text_pages, ocr_pages
 
-        all_docs: List[Document] = []
+    def _keep(self, text: str, seen: NearDupIndex | ExactIndex) -> bool:
+        """False se uma (quase-)duplicata do texto já saiu; senão indexa."""
+        if seen.add(text) is not None:
+            self.stats.incr("dedup.near_dropped")
+            return False
+        self.stats.incr("docs.emitted")
+        return True
 
-        # 1) Texto nativo ---------------------------------------------
-        if text_pages:
-            docs_text = load_with_docling(self.file_path)
+    def _dedup(self, docs: Iterable[Document]) -> Iterator[Document]:
+        """Descarta (quase-)duplicatas de Documents já saídos (ordem preservada)."""
+        seen = make_index(self.dedup)
+        return (d for d in docs if self._keep(d.page_content, seen))
 
-            # --- CORREÇÃO 0-based → 1-based ---------------------------------
-            def _page1(d):
-                """Retorna página 1-based mesmo quando o loader devolve 0-based."""
-                return (d.metadata.get("page") or 0) + 1
+    def load(self) -> List[Document]:
+        return list(self.lazy_load())
 
-            docs_text = [d for d in docs_text if _page1(d) in text_pages]
-            # ----------------------------------------------------------------
+    # ------------------------------------------------------------------
+    # Re-extração incremental (ver incremental.py)
+    # ------------------------------------------------------------------
+    def _config(self) -> dict:
+        """Tudo o que muda a saída; manifesto de outra config é descartado."""
+        tok = self.tokenizer
+        return {
+            "ocr_lang":         self.ocr_lang,
+            "min_native_chars": self.MIN_NATIVE_CHARS,
+            "min_ocr_chars":    self.MIN_OCR_CHARS,
+            "dpi_page_image":   self.DPI_PAGE_IMAGE,
+            "dpi_block_image":  self.DPI_BLOCK_IMAGE,
+            "token_limit":      self.token_limit,
+            "tokenizer":        tok if tok is None or isinstance(tok, str)
+                                else getattr(tok, "__qualname__", repr(tok)),
+            "adaptive_dpi":     self.adaptive_dpi,
+            "block_gate":       asdict(self.block_gate) if self.block_gate else None,
+            "dedup":            asdict(self.dedup) if self.dedup else None,
+            "region_ocr":       asdict(self.region_ocr) if self.region_ocr else None,
+            "ocr":              asdict(OCR),
+        }
 
-            all_docs.extend(docs_text)
+    @staticmethod
+    def _stage_pages(ctx: PDFContext, kind: str, text_pages: list[int],
+                     ocr_pages: list[int]) -> Dict[str, list[int]]:
+        """Páginas de cada etapa de `_iter_batches`, na ordem em que saem."""
+        image = list(range(1, ctx.page_count + 1)) if kind == "image" and not text_pages else []
+        return {"text": list(text_pages), "image": image, "blocks": list(ocr_pages)}
 
-        # 2) PDF 100 % imagem -----------------------------------------
-        if kind == "image" and not text_pages:
-            for i, img in enumerate(
-                convert_from_path(self.file_path, dpi=self.DPI_PAGE_IMAGE), 1
-            ):
-                txt = pytesseract.image_to_string(img,
-                                                  lang=self.ocr_lang).strip()
-                if txt:
-                    all_docs.append(Document(txt, metadata={"page": i}))
+    def _page_docs(
+        self,
+        ctx: PDFContext,
+        kind: str,
+        stage_pages: Dict[str, list[int]],
+        pages: set[int],
+    ) -> Dict[int, PageDocs]:
+        """Extrai só `pages`, agrupando por página e etapa (antes da dedup)."""
+        out: Dict[int, PageDocs] = {p: tuple([] for _ in STAGES) for p in pages}
+        for n, stage in enumerate(STAGES):
+            wanted = [p for p in stage_pages[stage] if p in pages]
+            for pno, docs in zip(wanted, self._stage_docs(ctx, kind, stage, wanted)):
+                out[pno][n].extend(docs)
+        return out
 
-        # 3) Páginas híbridas -----------------------------------------
-        if ocr_pages:
-            with fitz.open(self.file_path) as doc:
-                for pno in ocr_pages:
-                    all_docs.extend(
-                        self._extract_blocks_hybrid(
-                            doc.load_page(pno - 1), pno
-                        )
-                    )
-
-        # 4) Token-limit + deduplicação ------------------------------
-        chunks = adjust_chunks_to_token_limit(all_docs, self.token_limit)
-        seen, dedup = set(), []
-        for d in chunks:
-            fp = fingerprint(d.page_content)
-            if fp not in seen:
-                dedup.append(d)
-                seen.add(fp)
-
-        return dedup
+    def _stage_docs(
+        self, ctx: PDFContext, kind: str, stage: str, pnos: list[int]
+    ) -> Iterator[List[Document]]:
+        """Documents (já cortados por `token_limit`) de cada página de `pnos`, em ordem."""
+        if not pnos:
+            return
+        if stage == "text":                 # Docling: um lote para todas as páginas
+            by_page: Dict[int, List[Document]] = {p: [] for p in pnos}
+            for batch in self._iter_batches(ctx, kind, pnos, []):
+                for d in self._documents(batch):
+                    by_page[_page1(d)].append(d)
+            yield from by_page.values()
+            return
+        batches = (self._iter_batches(ctx, kind, [], [], pnos) if stage == "image"
+                   else self._iter_batches(ctx, "hybrid", [], pnos))
+        yield from map(self._documents, batches)
+
+    # ------------------------------------------------------------------
+    # Extração retomável (ver checkpoint.py)
+    # ------------------------------------------------------------------
+    def _journaled(self, ctx: PDFContext) -> Iterator[List[Document]]:
+        """
+        Como `_iter_batches` + `_documents`, página a página, passando pelo
+        journal: páginas gravadas saem de lá, as demais são extraídas e
+        gravadas ao ficar prontas. A classificação também é gravada (só
+        quando feita aqui – rótulos vindos de fora valem só para esta
+        chamada).
+        """
+        journal = self.checkpoint.job(document_hash(ctx),
+                                      {"scope": "loader", **self._config()})
+        saved = journal.get("labels", 0) if self._text_pages_in is None else None
+        if saved is not None:
+            kind, text_pages, ocr_pages = json.loads(saved)
+            self.stats.label("loader_kind", kind)
+        else:
+            kind, text_pages, ocr_pages = self._labels(ctx)
+            if self._text_pages_in is None:
+                journal.put("labels", 0, json.dumps([kind, text_pages, ocr_pages]).encode())
+
+        stage_pages = self._stage_pages(ctx, kind, text_pages, ocr_pages)
+        for stage in STAGES:
+            compute = partial(self._stage_docs, ctx, kind, stage)
+            yield from resume_map(journal, stage, stage_pages[stage], compute,
+                                  encode_docs, decode_docs, self.stats)
+
+    def load_incremental(
+        self, manifest: str | os.PathLike | dict | None = None
+    ) -> IncrementalResult:
+        """
+        Re-extrai só as páginas cuja impressão digital mudou desde o
+        `manifest` anterior (caminho JSON ou dict; ausente = extração
+        completa) e devolve o conjunto completo + o diff `added`/`removed`
+        por `metadata["doc_id"]`. Um caminho é regravado com o manifesto
+        novo; o dict fica em `result.manifest`.
+        """
+        old = read_manifest(manifest)
+        with open_context(self.file_path) as ctx:
+            kind, text_pages, ocr_pages = self._labels(ctx)
+            with self.stats.stage("fingerprint"):
+                fps = page_fingerprints(ctx)
+            stage_pages = self._stage_pages(ctx, kind, text_pages, ocr_pages)
+            labels = {p: "+".join(s for s in STAGES if p in stage_pages[s]) or None
+                      for p in fps}
+
+            config = self._config()
+            page_docs = reusable_pages(old, config, kind, fps, labels)
+            changed = sorted(set(fps) - set(page_docs))
+            self.stats.incr("incremental.pages_reused", len(page_docs))
+            self.stats.incr("incremental.pages_extracted", len(changed))
+            if changed:
+                page_docs.update(self._page_docs(ctx, kind, stage_pages, set(changed)))
+
+        # mesma ordem (e dedup) da extração integral: etapa a etapa
+        merged = (d for n, s in enumerate(STAGES)
+                  for p in stage_pages[s] for d in page_docs[p][n])
+        docs = [with_id(d) for d in self._dedup(merged)]
+
+        ids     = [d.metadata[DOC_ID_KEY] for d in docs]
+        old_ids = set(old.get("ids", [])) if old else set()
+        new_ids = set(ids)
+        before  = old_documents(old)
+        result  = IncrementalResult(
+            documents=docs,
+            added=[d for d in docs if d.metadata[DOC_ID_KEY] not in old_ids],
+            removed=[before[i] for i in (old.get("ids", []) if old else [])
+                     if i not in new_ids and i in before],
+            changed_pages=changed,
+            manifest=make_manifest(config, kind, fps, labels, page_docs, ids),
+        )
+        logger.info("♻️  %d página(s) reaproveitada(s), %d extraída(s); +%d / -%d docs",
+                    len(fps) - len(changed), len(changed),
+                    len(result.added), len(result.removed))
+        if manifest is not None and not isinstance(manifest, dict):
+            write_manifest(manifest, result.manifest)
+        return result
+
+    async def alazy_load(
+        self,
+        *,
+        executor: ThreadPoolExecutor | None = None,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> AsyncIterator[Document]:
+        """
+        `lazy_load` sem bloquear o event loop: roda no `executor` e entrega
+        cada Document assim que fica pronto. Cancelar a task aborta o OCR
+        pendente e mata os subprocessos tesseract (ver aio.py). `executor`
+        precisa ser um ThreadPoolExecutor.
+        """
+        async for doc in aiter_in_executor(self.lazy_load, executor=executor,
+                                           limiter=limiter):
+            yield doc
+
+    async def aload(
+        self,
+        *,
+        executor: ThreadPoolExecutor | None = None,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> List[Document]:
+        return [d async for d in self.alazy_load(executor=executor, limiter=limiter)]
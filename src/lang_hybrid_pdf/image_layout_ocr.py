@@ -2,20 +2,107 @@
 """
 image_layout_ocr.py – OCR fallback para PDFs 100 % imagem.
 • pipeline LEVE  = OCR → regex → SBERT (opcional extra [layout])
-• pipeline PRECISO = gera PDF OCR + Docling (extra [docling])
+• pipeline PRECISO = PDF OCR montado em memória + Docling (extra [docling])
+Com `checkpoint` o resultado do OCR de cada página (texto, linhas ou o
+PDF de 1 página) vai para o journal e uma nova execução só OCRiza as
+páginas que faltam; o agrupamento/Docling roda de novo sobre o conjunto.
 """
 
 from __future__ import annotations
-import os, re, io, tempfile, logging, gc
-from typing import List
-import pytesseract
-from PIL import Image
-from pdf2image import convert_from_path
+import re, json, logging, threading
+from dataclasses import asdict
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Sequence, TypeVar
+import fitz                       # PyMuPDF
 from langchain_core.documents import Document
-from .helpers import adjust_chunks_to_token_limit
+from .helpers import adjust_chunks_to_token_limit, ordered_map
+from .ocr import (
+    AdaptiveResult,
+    OCRImage,
+    adaptive_ocr,
+    dpi_ladder,
+    image_to_data,
+    image_to_pdf,
+    image_to_string,
+    ocr_with_confidence,
+)
+from .settings import OCR
+from .checkpoint import Checkpoint, Journal, document_hash, resume_map
+from .ocr_cache import OCRCache
+from .raster import render_pixmap
+from .stats import NULL_STATS, Stats
+from .document import PDFContext, PDFSource, open_context
 
 logger   = logging.getLogger(__name__)
 OCR_LANG = "por+eng"
+PAGE_DPI = 300
+
+_R = TypeVar("_R")
+
+
+class _Codec(NamedTuple):
+    """Etapa do journal + (de)serialização do resultado por página."""
+    stage:  str
+    encode: Callable[[object], bytes]
+    decode: Callable[[bytes], object]
+
+
+_PLAIN    = _Codec("plain", str.encode, bytes.decode)
+_ADAPTIVE = _Codec("plain_adaptive", lambda r: json.dumps(list(r)).encode(),
+                   lambda b: AdaptiveResult(*json.loads(b)))
+_LINES    = _Codec("layout", lambda v: json.dumps(v, ensure_ascii=False).encode(),
+                   lambda b: [tuple(x) for x in json.loads(b)])
+_PAGE_PDF = _Codec("docling", bytes, bytes)
+
+# ------------- renderização página-a-página ------------------------
+def render_page(ctx: PDFContext, pno: int, dpi: int = PAGE_DPI) -> fitz.Pixmap:
+    """
+    Rasteriza UMA página (1-based) – nunca o PDF inteiro em RAM – com o
+    PyMuPDF do próprio contexto (sem subprocesso do poppler nem releitura
+    do arquivo). Em cinza (ou binarizada) conforme `OCR.render_mode`.
+    PyMuPDF não é thread-safe: chame na thread que consome o contexto.
+    """
+    return render_pixmap(ctx.page(pno), dpi)
+
+def _page_list(ctx: PDFContext, pages: Sequence[int] | None) -> List[int]:
+    """Páginas 1-based a processar (todas quando `pages` é None)."""
+    return list(pages) if pages is not None else list(range(1, ctx.page_count + 1))
+
+def _rendered(
+    ctx: PDFContext, pnos: Iterable[int], stats: Stats, dpi: int = PAGE_DPI
+) -> Iterator[tuple[int, fitz.Pixmap]]:
+    """(página, Pixmap) sob demanda – consumido na thread chamadora."""
+    for pno in pnos:
+        with stats.stage("render", page=pno):
+            yield pno, render_page(ctx, pno, dpi)
+
+def _map_pages(
+    fn: Callable[[OCRImage], _R],
+    ctx: PDFContext,
+    workers: int = 1,
+    stats: Stats = NULL_STATS,
+    pages: Sequence[int] | None = None,
+    journal: Journal | None = None,
+    codec: _Codec | None = None,
+) -> Iterator[_R]:
+    """
+    Renderiza (thread chamadora) + aplica `fn` por página (pool), em
+    ordem; a janela do `ordered_map` limita os Pixmaps em memória.
+    Com `journal`, páginas já gravadas (etapa `codec.stage`) não são
+    renderizadas e as novas são gravadas ao terminar.
+    """
+    def job(item: tuple[int, fitz.Pixmap]) -> _R:
+        pno, img = item
+        with stats.stage("page", page=pno):
+            return fn(img)
+
+    def run(pnos: Sequence[int]) -> Iterator[_R]:
+        return ordered_map(job, _rendered(ctx, pnos, stats), workers)
+
+    pnos = _page_list(ctx, pages)
+    if journal is None:
+        return run(pnos)
+    return resume_map(journal, codec.stage, pnos, run, codec.encode, codec.decode, stats)
 
 # ------------- helpers para lazy import ----------------------------
 def _require(pkg: str, extra: str):
@@ -28,21 +115,30 @@ def _require(pkg: str, extra: str):
         ) from err
 
 # ------------- pipeline leve (LayoutLMv2 + SBERT) ------------------
-def _load_layout_models():
-    tr  = _require("transformers", "layout")
-    st  = _require("sentence_transformers", "layout")
-    processor = tr.LayoutLMv2Processor.from_pretrained(
-        "microsoft/layoutlmv2-base-uncased", apply_ocr=False
-    )
-    semantic_model = st.SentenceTransformer(
-        "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
-    )
-    return processor, semantic_model
-
-def _ocr_to_lines(img: Image.Image) -> List[tuple[str, int]]:
-    data = pytesseract.image_to_data(
-        img, output_type=pytesseract.Output.DICT, lang=OCR_LANG
-    )
+SEMANTIC_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+ENCODE_BATCH   = 64
+
+_model_lock = threading.Lock()
+_semantic_model = None
+
+def _load_semantic_model():
+    """
+    SentenceTransformer carregado UMA vez por processo (singleton lazy).
+    O LayoutLMv2Processor não é mais carregado: o pipeline nunca o usava.
+    """
+    global _semantic_model
+    if _semantic_model is None:
+        with _model_lock:
+            if _semantic_model is None:
+                st = _require("sentence_transformers", "layout")
+                _semantic_model = st.SentenceTransformer(SEMANTIC_MODEL)
+    return _semantic_model
+
+def _ocr_to_lines(
+    img: OCRImage, cache: OCRCache | None = None, stats: Stats = NULL_STATS
+) -> List[tuple[str, int]]:
+    data = image_to_data(img, lang=OCR_LANG, cache=cache, stats=stats,
+                         dpi=PAGE_DPI)
     lines: dict[int, list[str]] = {}
     for txt, ln in zip(data["text"], data["line_num"]):
         if txt.strip():
@@ -71,80 +167,258 @@ def _split_juridico(txt: str) -> List[str]:
 
 # agrupa chunks semânticos similares
 def _group_similar(chunks: List[str], model) -> List[str]:
+    """
+    Junta chunks adjacentes similares ao *primeiro* chunk do grupo atual.
+    Todos os embeddings saem de UM `encode` em lote (normalizados), então
+    a similaridade de cosseno vira um produto interno na matriz.
+    """
     if not chunks:
         return []
-    import torch
-    out, cur = [], chunks[0]
-    cur_emb = model.encode(cur, convert_to_tensor=True)
-    for nxt in chunks[1:]:
-        nxt_emb = model.encode(nxt, convert_to_tensor=True)
+    import numpy as np
+    emb = np.asarray(model.encode(chunks, batch_size=ENCODE_BATCH,
+                                  convert_to_numpy=True,
+                                  normalize_embeddings=True), dtype=np.float32)
+    out, cur, head = [], chunks[0], 0
+    for i in range(1, len(chunks)):
         thr = 0.8 if len(cur) < 300 else 0.7
-        if torch.cosine_similarity(cur_emb, nxt_emb, dim=0).item() >= thr:
-            cur += "\n" + nxt
+        if float(emb[head] @ emb[i]) >= thr:
+            cur += "\n" + chunks[i]
         else:
             out.append(cur)
-            cur, cur_emb = nxt, nxt_emb
+            cur, head = chunks[i], i
     out.append(cur)
     return out
 
-def _layout_pipeline(pages, embedding_limit):
-    processor, semantic_model = _load_layout_models()
+def _layout_pipeline(ctx, embedding_limit, workers: int = 1, cache=None,
+                     stats: Stats = NULL_STATS, pages: Sequence[int] | None = None,
+                     journal: Journal | None = None):
+    semantic_model = _load_semantic_model()
     docs = []
-    for i, img in enumerate(pages, 1):
-        lines = _ocr_to_lines(img)
+    ocr = partial(_ocr_to_lines, cache=cache, stats=stats)
+    pnos = _page_list(ctx, pages)
+    for i, lines in zip(pnos, _map_pages(ocr, ctx, workers, stats, pnos, journal, _LINES)):
         for txt, ln in lines:
             for chunk in _split_juridico(txt):
                 docs.append(Document(chunk, metadata={"page": i, "line": ln}))
-    chunks = _group_similar([d.page_content for d in docs], semantic_model)
+    with stats.stage("semantic_grouping"):
+        chunks = _group_similar([d.page_content for d in docs], semantic_model)
     docs_out = [Document(c, metadata={}) for c in chunks]
     return adjust_chunks_to_token_limit(docs_out, embedding_limit)
 
 # ------------- pipeline Docling (gera PDF OCR) ----------------------
-def _docling_pipeline(pages, embedding_limit):
-    PdfWriter = _require("PyPDF2", "docling").PdfWriter
-    PdfReader = _require("PyPDF2", "docling").PdfReader
-    from .text_docling import load_with_docling
+def _page_to_ocr_pdf(
+    img: OCRImage, cache: OCRCache | None = None, stats: Stats = NULL_STATS
+) -> bytes:
+    return image_to_pdf(img, lang=OCR_LANG, config="--psm 6", cache=cache,
+                        stats=stats, dpi=PAGE_DPI)
 
-    writer = PdfWriter()
-    for img in pages:
-        pdf_bytes = pytesseract.image_to_pdf_or_hocr(
-            img, extension="pdf", lang=OCR_LANG, config="--psm 6"
-        )
-        writer.add_page(PdfReader(io.BytesIO(pdf_bytes)).pages[0])
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-        writer.write(tmp_pdf)
-        tmp_path = tmp_pdf.name
+DOCLING_CHUNK_PAGES = 32          # páginas OCR por PDF entregue ao Docling
 
+def _build_ocr_pdf(page_pdfs: Iterable[bytes]) -> bytes:
+    """Junta os PDFs de 1 página (camada OCR) em memória, à medida que chegam."""
+    out = fitz.open()
     try:
-        docs = load_with_docling(tmp_path)
+        for pdf_bytes in page_pdfs:
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as src:
+                out.insert_pdf(src)
+        return out.tobytes(garbage=1, deflate=True)
     finally:
-        writer.close()
-        gc.collect()
-        os.remove(tmp_path)
+        out.close()
+
+def _remap_pages(docs: List[Document], pnos: Sequence[int]) -> None:
+    """Página do PDF OCR (parcial) → página do documento original."""
+    for d in docs:
+        p = d.metadata.get("page")                     # 0-based (PyPDF)
+        if isinstance(p, int) and 0 <= p < len(pnos):
+            d.metadata["page"] = pnos[p] - 1
+        for item in d.metadata.get("dl_meta", {}).get("doc_items", []):
+            for prov in item.get("prov", []):          # 1-based (Docling)
+                q = prov.get("page_no")
+                if isinstance(q, int) and 1 <= q <= len(pnos):
+                    prov["page_no"] = pnos[q - 1]
 
-    return adjust_chunks_to_token_limit(docs, embedding_limit)
+def _docling_pipeline(ctx, embedding_limit, workers: int = 1, cache=None,
+                      stats: Stats = NULL_STATS, pages: Sequence[int] | None = None,
+                      journal: Journal | None = None,
+                      chunk_pages: int = DOCLING_CHUNK_PAGES) -> Iterator[Document]:
+    """
+    OCR → PDF com camada de texto montado em memória (PyMuPDF) → Docling
+    lendo de um DocumentStream, sem arquivo temporário. Processa faixas
+    de `chunk_pages` páginas: só uma faixa de PDF OCR fica em memória.
+    """
+    _require("langchain_docling", "docling")        # falha cedo → fallback
+    from .text_docling import load_with_docling
+
+    ocr  = partial(_page_to_ocr_pdf, cache=cache, stats=stats)
+    pnos = _page_list(ctx, pages)
+    step = max(1, chunk_pages)
+
+    def run() -> Iterator[Document]:
+        for i in range(0, len(pnos), step):
+            chunk = pnos[i:i + step]
+            data  = _build_ocr_pdf(_map_pages(ocr, ctx, workers, stats, chunk,
+                                              journal, _PAGE_PDF))
+            docs  = load_with_docling(data, stats=stats)
+            del data
+            if chunk != list(range(1, len(chunk) + 1)):
+                _remap_pages(docs, chunk)
+            yield from adjust_chunks_to_token_limit(docs, embedding_limit)
+    return run()
 
 # ------------- API pública -----------------------------------------
-def layout_ocr_from_pdf(file_path: str, embedding_limit: int | None = None) -> List[Document]:
-    pages = convert_from_path(file_path, dpi=300)
+def _ocr_plain(
+    img: OCRImage, cache: OCRCache | None = None, stats: Stats = NULL_STATS
+) -> str:
+    return image_to_string(img, lang=OCR_LANG, cache=cache, stats=stats,
+                           dpi=PAGE_DPI).strip()
+
+def _adaptive_pages(
+    ctx: PDFContext, pnos: Sequence[int], workers: int = 1,
+    cache: OCRCache | None = None, stats: Stats = NULL_STATS,
+) -> Iterator[AdaptiveResult]:
+    """
+    OCR em DPI crescente. O 1º DPI é renderizado aqui e OCRizado no pool;
+    as re-renderizações (páginas de baixa confiança) ficam nesta thread,
+    pois o PyMuPDF não é thread-safe.
+    """
+    dpis = dpi_ladder(PAGE_DPI, OCR.adaptive_dpis)
+
+    def first(item: tuple[int, fitz.Pixmap]) -> AdaptiveResult:
+        pno, img = item
+        with stats.stage("page", page=pno):
+            return ocr_with_confidence(img, dpis[0], lang=OCR_LANG,
+                                       cache=cache, stats=stats)
+
+    def render(pno: int, dpi: int) -> fitz.Pixmap:
+        with stats.stage("render", page=pno):
+            return render_page(ctx, pno, dpi)
+
+    results = ordered_map(first, _rendered(ctx, pnos, stats, dpis[0]), workers)
+    for pno, res in zip(pnos, results):
+        yield adaptive_ocr(partial(render, pno), dpis, lang=OCR_LANG,
+                           min_conf=OCR.adaptive_min_conf, cache=cache,
+                           stats=stats, first=res)
+
+def _plain_pipeline(ctx, workers: int = 1, cache=None, stats: Stats = NULL_STATS,
+                    pages: Sequence[int] | None = None,
+                    adaptive_dpi: bool = False,
+                    journal: Journal | None = None) -> Iterator[Document]:
+    pnos = _page_list(ctx, pages)
+    if adaptive_dpi:
+        run = partial(_adaptive_pages, ctx, workers=workers, cache=cache, stats=stats)
+        results = run(pnos) if journal is None else resume_map(
+            journal, _ADAPTIVE.stage, pnos, run, _ADAPTIVE.encode, _ADAPTIVE.decode, stats)
+        for i, res in zip(pnos, results):
+            if res.text:
+                yield Document(res.text, metadata={
+                    "page": i, "ocr_dpi": res.dpi, "ocr_conf": round(res.conf, 1),
+                })
+        return
+    ocr = partial(_ocr_plain, cache=cache, stats=stats)
+    for i, text in zip(pnos, _map_pages(ocr, ctx, workers, stats, pnos, journal, _PLAIN)):
+        if text:
+            yield Document(text, metadata={"page": i})
+
+_PIPELINES = ("docling", "layout", "plain")
+
+def _run_pipelines(ctx, embedding_limit, workers, cache, pipeline=None,
+                   stats: Stats = NULL_STATS,
+                   pages: Sequence[int] | None = None,
+                   adaptive_dpi: bool = False,
+                   journal: Journal | None = None) -> Iterator[Document]:
+    if pipeline is not None and pipeline not in _PIPELINES:
+        raise ValueError(f"pipeline deve ser um de {_PIPELINES}, não {pipeline!r}")
 
     # 1) tenta pipeline preciso
-    try:
-        return _docling_pipeline(pages, embedding_limit)
-    except ImportError:
-        logger.info("Docling não instalado – tentando pipeline LayoutLMv2…")
+    if pipeline in (None, "docling"):
+        try:
+            docs = _docling_pipeline(ctx, embedding_limit, workers, cache, stats,
+                                     pages, journal)
+        except ImportError:
+            if pipeline:
+                raise
+            logger.info("Docling não instalado – tentando pipeline LayoutLMv2…")
+        else:
+            stats.label("image_pipeline", "docling")
+            yield from docs
+            return
 
     # 2) tenta LayoutLMv2 leve
-    try:
-        return _layout_pipeline(pages, embedding_limit)
-    except ImportError:
-        logger.info("transformers não instalado – fallback OCR simples.")
+    if pipeline in (None, "layout"):
+        try:
+            docs = _layout_pipeline(ctx, embedding_limit, workers, cache, stats,
+                                    pages, journal)
+        except ImportError:
+            if pipeline:
+                raise
+            logger.info("transformers não instalado – fallback OCR simples.")
+        else:
+            stats.label("image_pipeline", "layout")
+            yield from docs
+            return
 
     # 3) OCR plano (mínimo)
-    docs: List[Document] = []
-    for i, pg in enumerate(pages, 1):
-        text = pytesseract.image_to_string(pg, lang=OCR_LANG).strip()
-        if text:
-            docs.append(Document(text, metadata={"page": i}))
-    return docs
+    stats.label("image_pipeline", "plain")
+    yield from _plain_pipeline(ctx, workers, cache, stats, pages, adaptive_dpi, journal)
+
+def iter_layout_ocr_from_pdf(
+    file_path: PDFSource,
+    embedding_limit: int | None = None,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    pipeline: str | None = None,
+    stats: Stats = NULL_STATS,
+    pages: Sequence[int] | None = None,
+    adaptive_dpi: bool = False,
+    checkpoint: Checkpoint | None = None,
+) -> Iterator[Document]:
+    """
+    Versão streaming de `layout_ocr_from_pdf`: as páginas são
+    renderizadas uma a uma. Docling/LayoutLMv2 precisam do documento
+    inteiro para agrupar chunks; o OCR plano devolve página a página.
+    Aceita caminho, bytes/memoryview/mmap, objeto-arquivo ou um
+    PDFContext já aberto (router).
+    `pipeline` ('docling' | 'layout' | 'plain') força um pipeline
+    específico, sem fallback; None tenta na ordem.
+    `pages` (1-based) restringe o OCR a um subconjunto de páginas –
+    o agrupamento semântico fica então limitado a esse subconjunto.
+    `adaptive_dpi=True` (pipeline plain) OCRiza primeiro em DPI baixo e
+    só sobe se a confiança for baixa; grava `ocr_dpi`/`ocr_conf`.
+    `checkpoint` (Checkpoint) grava o OCR de cada página assim que sai e
+    retoma dali se a extração for interrompida (ver checkpoint.py).
+    """
+    with open_context(file_path) as ctx:
+        journal = None
+        if checkpoint is not None:
+            journal = checkpoint.job(document_hash(ctx), {
+                "scope": "image_ocr", "lang": OCR_LANG, "dpi": PAGE_DPI, "ocr": asdict(OCR),
+            })
+        yield from _run_pipelines(ctx, embedding_limit, workers, cache,
+                                  pipeline, stats, pages, adaptive_dpi, journal)
+
+def layout_ocr_from_pdf(
+    file_path: PDFSource,
+    embedding_limit: int | None = None,
+    *,
+    workers: int = 1,
+    cache: OCRCache | None = None,
+    pipeline: str | None = None,
+    stats: Stats = NULL_STATS,
+    pages: Sequence[int] | None = None,
+    adaptive_dpi: bool = False,
+    checkpoint: Checkpoint | None = None,
+) -> List[Document]:
+    """
+    OCR de PDF 100 % imagem. `workers > 1` OCRiza (Tesseract) páginas em
+    paralelo enquanto as próximas são renderizadas (PyMuPDF), mantendo a
+    ordem das páginas;
+    `cache` evita refazer o OCR de páginas já vistas; `stats` recebe
+    tempos de render/OCR por página (ver lang_hybrid_pdf.stats);
+    `checkpoint` torna a extração retomável página a página.
+    """
+    return list(iter_layout_ocr_from_pdf(file_path, embedding_limit,
+                                         workers=workers, cache=cache,
+                                         pipeline=pipeline, stats=stats,
+                                         pages=pages, adaptive_dpi=adaptive_dpi,
+                                         checkpoint=checkpoint))
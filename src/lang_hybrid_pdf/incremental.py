@@ -0,0 +1,249 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/incremental.py
+"""
+incremental.py – re-extração incremental de PDFs revisados.
+
+Contratos passam por muitas revisões em que só algumas páginas mudam.
+Cada página recebe uma impressão digital estável (content stream +
+digest das imagens/XObjects que ela usa), guardada num MANIFESTO JSON
+junto com os Documents que ela gerou. Na rodada seguinte:
+
+• página com a mesma impressão digital → Documents reaproveitados
+  (também quando só mudou de posição: o nº de página é corrigido)
+• página nova/alterada → extraída de novo
+• a dedup de quase-duplicatas é refeita sobre o conjunto completo, na mesma
+  ordem da extração integral
+
+O resultado traz o diff (`added` / `removed`) por `metadata["doc_id"]`
+(hash do conteúdo + metadados) – só isso precisa ir ao vector store:
+
+    res = HybridPDFLoader("contrato_v7.pdf").load_incremental("contrato.manifest.json")
+    store.delete(ids=[d.metadata["doc_id"] for d in res.removed])
+    store.add_documents(res.added, ids=[d.metadata["doc_id"] for d in res.added])
+
+Um manifesto gerado com outra configuração (idioma, DPIs, token_limit,
+filtro, tokenizer…) é descartado: tudo é extraído de novo.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+import fitz                       # PyMuPDF
+from langchain_core.documents import Document
+
+from .document import PDFContext
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DOC_ID_KEY       = "doc_id"
+
+# Documents de uma página por etapa do loader. Ficam separados porque a
+# saída integral é etapa a etapa (todo o texto nativo primeiro) e a
+# dedup mantém a primeira ocorrência.
+STAGES   = ("text", "image", "blocks")
+PageDocs = Tuple[List[Document], ...]
+
+
+# ----------------------------------------------------------------------
+# Impressão digital por página
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def page_fingerprint(page: fitz.Page, xref_digests: Dict[int, bytes] | None = None) -> str:
+    """
+    Hash estável do que a página desenha: geometria, content stream
+    (descomprimido), fontes e o conteúdo de cada imagem/Form XObject
+    referenciado – também descomprimido, pois `save(deflate=True)` ou
+    outra ferramenta pode recomprimir sem mudar nada. Os nºs de xref NÃO
+    entram (mudam a cada salvamento); `xref_digests` memoriza o digest
+    de cada xref entre páginas.
+    """
+    doc   = page.parent
+    memo  = {} if xref_digests is None else xref_digests
+    h     = hashlib.blake2b(digest_size=16)
+    h.update(repr((tuple(page.rect), page.rotation)).encode())
+    h.update(page.read_contents())
+
+    def xref_digest(xref: int) -> bytes:
+        d = memo.get(xref)
+        if d is None:
+            d = memo[xref] = _digest(doc.xref_stream(xref) or b"")
+        return d
+
+    for img in page.get_images(full=True):          # (xref, …, name, …)
+        h.update(img[7].encode())
+        h.update(xref_digest(img[0]))
+    for xobj in page.get_xobjects():                # (xref, name, invoker, bbox)
+        h.update(xobj[1].encode())
+        h.update(xref_digest(xobj[0]))
+    for font in page.get_fonts(full=True):          # (xref, ext, type, basefont, name, …)
+        h.update(f"{font[3]}/{font[4]}".encode())
+    return h.hexdigest()
+
+
+def page_fingerprints(ctx: PDFContext) -> Dict[int, str]:
+    """Impressão digital de cada página (1-based), sem renderizar nada."""
+    memo: Dict[int, bytes] = {}
+    return {pno: page_fingerprint(ctx.page(pno), memo)
+            for pno in range(1, ctx.page_count + 1)}
+
+
+# ----------------------------------------------------------------------
+# Identidade de Documents
+def _jsonable(meta: dict) -> dict:
+    return {k: v for k, v in meta.items() if k != DOC_ID_KEY}
+
+
+def doc_id(doc: Document) -> str:
+    """Hash do texto + metadados (sem o próprio `doc_id`)."""
+    payload = json.dumps([doc.page_content, _jsonable(doc.metadata)],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def with_id(doc: Document) -> Document:
+    doc.metadata[DOC_ID_KEY] = doc_id(doc)
+    return doc
+
+
+def shift_page(doc: Document, delta: int) -> Document:
+    """Página que mudou de posição: corrige `page` e o `page_no` do Docling."""
+    if not delta:
+        return doc
+    meta = dict(doc.metadata)
+    if isinstance(meta.get("page"), int):
+        meta["page"] += delta
+    dl_meta = meta.get("dl_meta")
+    if isinstance(dl_meta, dict):
+        dl_meta = json.loads(json.dumps(dl_meta))     # cópia profunda
+        for item in dl_meta.get("doc_items", []):
+            for prov in item.get("prov", []):
+                if isinstance(prov.get("page_no"), int):
+                    prov["page_no"] += delta
+        meta["dl_meta"] = dl_meta
+    return Document(doc.page_content, metadata=meta)
+
+
+# ----------------------------------------------------------------------
+# Manifesto
+def _dump_docs(docs: Iterable[Document]) -> List[dict]:
+    return [{"page_content": d.page_content, "metadata": _jsonable(d.metadata)}
+            for d in docs]
+
+
+def _load_docs(items: Iterable[dict]) -> List[Document]:
+    return [Document(i["page_content"], metadata=i["metadata"]) for i in items]
+
+
+def _normalize(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Como a configuração volta do JSON (tuplas → listas etc.)."""
+    return json.loads(json.dumps(config, sort_keys=True, default=str))
+
+
+def make_manifest(
+    config: Dict[str, Any],
+    kind: str,
+    fingerprints: Dict[int, str],
+    labels: Dict[int, str | None],
+    page_docs: Dict[int, PageDocs],
+    ids: List[str],
+) -> dict:
+    pages = []
+    for p in sorted(fingerprints):
+        docs = page_docs.get(p) or tuple([] for _ in STAGES)
+        pages.append({"page": p, "fp": fingerprints[p], "label": labels.get(p),
+                      **{s: _dump_docs(d) for s, d in zip(STAGES, docs)}})
+    return {
+        "version": MANIFEST_VERSION,
+        "config":  _normalize(config),
+        "kind":    kind,
+        "pages":   pages,
+        "ids":     ids,
+    }
+
+
+def read_manifest(manifest: str | os.PathLike | dict | None) -> dict | None:
+    """Manifesto de um caminho (inexistente → None) ou já em dict."""
+    if manifest is None or isinstance(manifest, dict):
+        return manifest
+    try:
+        with open(manifest, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def write_manifest(path: str | os.PathLike, manifest: dict) -> None:
+    """Grava de forma atômica (arquivo temporário + rename)."""
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+
+
+def reusable_pages(
+    old: dict | None,
+    config: Dict[str, Any],
+    kind: str,
+    fingerprints: Dict[int, str],
+    labels: Dict[int, str | None],
+) -> Dict[int, PageDocs]:
+    """
+    Páginas atuais cujos Documents podem vir do manifesto antigo: mesma
+    impressão digital (e mesmo rótulo text/ocr) na mesma página ou, se
+    ela mudou de lugar, em outra (com o nº de página corrigido).
+    """
+    if not old:
+        return {}
+    if (old.get("version") != MANIFEST_VERSION
+            or old.get("config") != _normalize(config)
+            or old.get("kind") != kind):
+        logger.info("Manifesto de outra configuração/tipo – extração completa.")
+        return {}
+
+    by_page = {e["page"]: e for e in old["pages"]}
+    by_key: Dict[tuple, dict] = {}
+    for e in old["pages"]:
+        by_key.setdefault((e["fp"], e.get("label")), e)
+
+    out: Dict[int, PageDocs] = {}
+    for pno, fp in fingerprints.items():
+        key   = (fp, labels.get(pno))
+        entry = by_page.get(pno)
+        if entry is None or (entry["fp"], entry.get("label")) != key:
+            entry = by_key.get(key)
+        if entry is not None:
+            delta    = pno - entry["page"]
+            out[pno] = tuple(
+                [shift_page(d, delta) for d in _load_docs(entry[stage])]
+                for stage in STAGES
+            )
+    return out
+
+
+def old_documents(old: dict | None) -> Dict[str, Document]:
+    """`doc_id` → Document de todas as páginas do manifesto antigo."""
+    if not old:
+        return {}
+    return {d.metadata[DOC_ID_KEY]: d
+            for e in old["pages"] for stage in STAGES
+            for d in map(with_id, _load_docs(e[stage]))}
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class IncrementalResult:
+    """Conjunto completo + o que mudou em relação ao manifesto anterior."""
+
+    documents:     List[Document]
+    added:         List[Document]
+    removed:       List[Document]
+    changed_pages: List[int]
+    manifest:      dict = field(repr=False)
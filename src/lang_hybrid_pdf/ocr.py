@@ -0,0 +1,221 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/ocr.py
+"""
+ocr.py – ponto único de chamada ao Tesseract.
+
+Todas as etapas (router, loader, OCR de PDF-imagem) passam por aqui,
+o que permite plugar um `OCRCache`, a instrumentação (`Stats`) e o
+cancelamento (`cancel.CancelScope`) sem espalhar essa lógica pelas etapas. O motor em si vem de
+`ocr_backends.get_backend()` (pytesseract ou tesserocr persistente).
+
+As imagens podem ser `PIL.Image` ou `fitz.Pixmap` – este último vai
+direto para o backend, sem conversão intermediária.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, NamedTuple, Sequence, TypeVar
+
+from PIL import Image
+
+from .cancel import raise_if_cancelled
+from .ocr_backends import get_backend
+from .ocr_cache import OCRCache, cache_key
+from .stats import NULL_STATS, Stats
+
+_V = TypeVar("_V")
+
+OCRImage = Any                    # PIL.Image.Image | fitz.Pixmap
+
+
+def _key_payload(img: OCRImage) -> tuple[bytes | memoryview, str, tuple]:
+    if isinstance(img, Image.Image):
+        return img.tobytes(), img.mode, img.size
+    return img.samples_mv, f"pix{img.n}", (img.width, img.height)
+
+
+def _nbytes(img: OCRImage) -> int:
+    """Bytes de pixels entregues ao backend (cinza = 1/3 do RGB)."""
+    if isinstance(img, Image.Image):
+        return img.width * img.height * len(img.getbands())
+    return img.stride * img.height
+
+# ----------------------------------------------------------------------
+def _cached(
+    cache: OCRCache | None,
+    stats: Stats,
+    img: OCRImage,
+    compute: Callable[[], _V],
+    encode: Callable[[_V], bytes],
+    decode: Callable[[bytes], _V],
+    **settings: Any,
+) -> _V:
+    def run() -> _V:
+        raise_if_cancelled()
+        stats.ocr_call(settings["op"], img.width, img.height, settings.get("dpi"),
+                       _nbytes(img))
+        with stats.stage("ocr"):
+            return compute()
+
+    if cache is None:
+        return run()
+    payload, mode, size = _key_payload(img)
+    key = cache_key(payload, mode=mode, size=size, **settings)
+    hit = cache.get(key)
+    if hit is not None:
+        stats.incr("cache.hits")
+        return decode(hit)
+    stats.incr("cache.misses")
+    value = run()
+    cache.set(key, encode(value))
+    return value
+
+
+def image_to_string(
+    img: OCRImage,
+    *,
+    lang: str,
+    config: str = "",
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    **key_extra: Any,
+) -> str:
+    """
+    Texto OCR (equivalente a `pytesseract.image_to_string`) com cache opcional. `key_extra`
+    (dpi, clip…) entra na chave junto com os pixels.
+    """
+    return _cached(
+        cache, stats, img,
+        lambda: get_backend().image_to_string(img, lang=lang, config=config),
+        str.encode, bytes.decode,
+        op="string", lang=lang, config=config, **key_extra,
+    )
+
+
+def image_to_data(
+    img: OCRImage,
+    *,
+    lang: str,
+    config: str = "",
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    **key_extra: Any,
+) -> Dict[str, list]:
+    """Dados por palavra (dict no formato Output.DICT) com cache opcional."""
+    return _cached(
+        cache, stats, img,
+        lambda: get_backend().image_to_data(img, lang=lang, config=config),
+        lambda d: json.dumps(d).encode(), json.loads,
+        op="data", lang=lang, config=config, **key_extra,
+    )
+
+
+def image_to_pdf(
+    img: OCRImage,
+    *,
+    lang: str,
+    config: str = "",
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    **key_extra: Any,
+) -> bytes:
+    """PDF de 1 página com camada de texto OCR, com cache opcional."""
+    return _cached(
+        cache, stats, img,
+        lambda: get_backend().image_to_pdf(img, lang=lang, config=config),
+        bytes, bytes,
+        op="pdf", lang=lang, config=config, **key_extra,
+    )
+
+
+# ----------------------------------------------------------------------
+# DPI adaptativo: OCR em DPI baixo, sobe só se a confiança for baixa
+class AdaptiveResult(NamedTuple):
+    text: str
+    dpi:  int
+    conf: float                   # média (0–100) ponderada pelo tamanho das palavras
+
+
+def mean_confidence(data: Dict[str, list]) -> float:
+    """Confiança média das palavras de `image_to_data` (0 se não houver)."""
+    total = weight = 0.0
+    for txt, conf in zip(data.get("text", []), data.get("conf", [])):
+        txt, conf = (txt or "").strip(), float(conf)
+        if txt and conf >= 0:
+            total  += conf * len(txt)
+            weight += len(txt)
+    return total / weight if weight else 0.0
+
+
+def data_to_text(data: Dict[str, list]) -> str:
+    """Reconstrói o texto (linhas e parágrafos) a partir de `image_to_data`."""
+    lines: list[str] = []
+    last_par = last_line = None
+    words: list[str] = []
+    for i, txt in enumerate(data.get("text", [])):
+        txt = (txt or "").strip()
+        if not txt:
+            continue
+        par  = (data["block_num"][i], data["par_num"][i])
+        line = par + (data["line_num"][i],)
+        if line != last_line and words:
+            lines.append(" ".join(words))
+            words = []
+            if par != last_par:
+                lines.append("")
+        words.append(txt)
+        last_par, last_line = par, line
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines).strip()
+
+
+def dpi_ladder(max_dpi: int, steps: Sequence[int]) -> list[int]:
+    """DPIs a tentar, crescente, terminando em `max_dpi` (o DPI fixo antigo)."""
+    return sorted({d for d in steps if d < max_dpi} | {max_dpi})
+
+
+def ocr_with_confidence(
+    img: OCRImage,
+    dpi: int,
+    *,
+    lang: str,
+    config: str = "",
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    **key_extra: Any,
+) -> AdaptiveResult:
+    """Um passo do modo adaptativo: texto + confiança num único DPI."""
+    data = image_to_data(img, lang=lang, config=config, cache=cache,
+                         stats=stats, dpi=dpi, **key_extra)
+    return AdaptiveResult(data_to_text(data), dpi, mean_confidence(data))
+
+
+def adaptive_ocr(
+    render: Callable[[int], OCRImage],
+    dpis: Sequence[int],
+    *,
+    lang: str,
+    min_conf: float,
+    config: str = "",
+    cache: OCRCache | None = None,
+    stats: Stats = NULL_STATS,
+    first: AdaptiveResult | None = None,
+    **key_extra: Any,
+) -> AdaptiveResult:
+    """
+    Renderiza (`render(dpi)`) e OCRiza em cada DPI de `dpis`, do menor
+    para o maior, parando no primeiro cuja confiança média ≥ `min_conf`.
+    Sem palavras reconhecidas conta como confiança 0 (sobe o DPI).
+    `first` é o resultado já obtido em `dpis[0]` (ex.: num worker).
+    """
+    res = first
+    for n, dpi in enumerate(dpis):
+        if n or res is None:
+            res = ocr_with_confidence(render(dpi), dpi, lang=lang, config=config,
+                                      cache=cache, stats=stats, **key_extra)
+        if res.conf >= min_conf:
+            break
+    stats.incr("ocr.adaptive_escalations", dpis.index(res.dpi))
+    stats.incr(f"ocr.adaptive_dpi_{res.dpi}")
+    return res
@@ -0,0 +1,239 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/ocr_backends.py
+"""
+ocr_backends.py – motores de OCR atrás de uma interface única.
+
+• PytesseractBackend – um subprocesso `tesseract` por chamada (fallback,
+  sempre disponível; é o caminho original do pacote)
+• TesserocrBackend   – handles persistentes da libtesseract (tesserocr)
+  num pool por (lang, psm), emprestados a cada chamada: o traineddata é
+  carregado uma vez por handle – no máximo um por chamada simultânea –,
+  não a cada pool de threads novo, e os pixels do Pixmap do PyMuPDF são
+  entregues direto, sem PIL nem arquivo temporário
+
+Seleção: `set_backend("tesserocr" | "pytesseract" | "auto")` ou a
+variável de ambiente LANG_HYBRID_PDF_OCR_BACKEND. "auto" (default) usa
+tesserocr quando instalado (extra [tesserocr]).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shlex
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from PIL import Image
+
+from .cancel import TrackedPopen
+
+logger = logging.getLogger(__name__)
+
+_PSM_RE = re.compile(r"^\s*(?:--psm\s+(\d+))?\s*$")
+
+
+# ----------------------------------------------------------------------
+def to_pil(img) -> Image.Image:
+    """PIL.Image a partir de PIL.Image ou fitz.Pixmap (RGB/GRAY)."""
+    if isinstance(img, Image.Image):
+        return img
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[img.n]
+    # view própria: o `Pixmap.__del__` libera `samples_mv` e daria
+    # BufferError se o PIL exportasse dela (ex.: ciclo de um traceback);
+    # a referência ao Pixmap mantém os pixels vivos enquanto a imagem existir
+    pil = Image.frombuffer(mode, (img.width, img.height), memoryview(img.samples_mv),
+                           "raw", mode, img.stride, 1)
+    pil._pixmap = img
+    return pil
+
+
+class OCRBackend:
+    """Interface: texto, dados por palavra (dict estilo pytesseract) e PDF."""
+
+    name = "base"
+
+    def image_to_string(self, img, *, lang: str, config: str = "") -> str:
+        raise NotImplementedError                     # pragma: no cover
+
+    def image_to_data(self, img, *, lang: str, config: str = "") -> Dict[str, list]:
+        raise NotImplementedError                     # pragma: no cover
+
+    def image_to_pdf(self, img, *, lang: str, config: str = "") -> bytes:
+        raise NotImplementedError                     # pragma: no cover
+
+
+class PytesseractBackend(OCRBackend):
+    """
+    Um subprocesso por chamada. O pytesseract só empresta os utilitários
+    (arquivo temporário, `tesseract_cmd`, erros, parser do TSV); o
+    processo é lançado aqui, com `cancel.TrackedPopen`, e fica registrado
+    no `CancelScope` ativo – que o mata se a extração for cancelada –
+    só enquanto a chamada dura. O módulo do pytesseract não é alterado.
+    """
+
+    name = "pytesseract"
+
+    def __init__(self) -> None:
+        import pytesseract                    # ~0,2 s: só quando o backend nasce
+        self._pt = pytesseract.pytesseract
+
+    def _run(self, img, extension: str, lang: str, config: str) -> bytes:
+        """Mesma linha de comando do `pytesseract.run_tesseract`; devolve a saída."""
+        pt = self._pt
+        with pt.save(to_pil(img)) as (base, input_name):
+            cmd = [pt.tesseract_cmd, input_name, base, "-l", lang, *shlex.split(config)]
+            if extension not in ("box", "osd", "tsv", "xml"):
+                cmd.append(extension)
+            try:
+                proc = TrackedPopen(cmd, **pt.subprocess_args())
+            except FileNotFoundError:
+                raise pt.TesseractNotFoundError() from None
+            _, errors = proc.communicate()
+            if proc.returncode:
+                raise pt.TesseractError(proc.returncode, pt.get_errors(errors))
+            with open(f"{base}.{extension}", "rb") as fh:
+                return fh.read()
+
+    def image_to_string(self, img, *, lang: str, config: str = "") -> str:
+        return self._run(img, "txt", lang, config).decode("utf-8")
+
+    def image_to_data(self, img, *, lang: str, config: str = "") -> Dict[str, list]:
+        tsv = self._run(img, "tsv", lang, f"-c tessedit_create_tsv=1 {config}")
+        return self._pt.file_to_dict(tsv.decode("utf-8"), "\t", -1)
+
+    def image_to_pdf(self, img, *, lang: str, config: str = "") -> bytes:
+        return self._run(img, "pdf", lang, config)
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    Reaproveita `PyTessBaseAPI`s de um pool por (lang, psm): cada chamada
+    empresta um handle livre (ou cria um) e o devolve ao terminar, então
+    os handles sobrevivem às threads – `ordered_map` abre um pool de
+    threads novo por etapa. Só entende `config` vazio
+    ou `--psm N`; qualquer outra coisa (e a saída em PDF, que a API não
+    expõe) cai no PytesseractBackend.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self) -> None:
+        import tesserocr                      # ImportError → "auto" usa pytesseract
+        self._tesserocr = tesserocr
+        self._lock      = threading.Lock()
+        self._idle: Dict[tuple, List[Any]] = {}     # (lang, psm) → handles livres
+        self._fallback  = PytesseractBackend()
+
+    @contextmanager
+    def _api(self, lang: str, psm: int | None) -> Iterator[Any]:
+        """Empresta um handle livre de (lang, psm); cria um se todos estão em uso."""
+        key = (lang, psm)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            api  = idle.pop() if idle else None
+        if api is None:
+            tr  = self._tesserocr
+            api = tr.PyTessBaseAPI(lang=lang)
+            if psm is not None:
+                api.SetPageSegMode(tr.PSM(psm))
+        try:
+            yield api
+        finally:
+            with self._lock:
+                self._idle[key].append(api)
+
+    def _set_image(self, api, img) -> None:
+        if isinstance(img, Image.Image):
+            api.SetImage(img)
+        else:                                  # fitz.Pixmap → pixels crus, sem PNG
+            api.SetImageBytes(img.samples, img.width, img.height, img.n, img.stride)
+
+    def _parse(self, config: str) -> tuple[bool, int | None]:
+        m = _PSM_RE.match(config or "")
+        if not m:
+            return False, None
+        return True, int(m.group(1)) if m.group(1) else None
+
+    def image_to_string(self, img, *, lang: str, config: str = "") -> str:
+        ok, psm = self._parse(config)
+        if not ok:
+            return self._fallback.image_to_string(img, lang=lang, config=config)
+        with self._api(lang, psm) as api:
+            self._set_image(api, img)
+            return api.GetUTF8Text()
+
+    def image_to_data(self, img, *, lang: str, config: str = "") -> Dict[str, list]:
+        ok, psm = self._parse(config)
+        if not ok:
+            return self._fallback.image_to_data(img, lang=lang, config=config)
+        with self._api(lang, psm) as api:
+            self._set_image(api, img)
+            api.Recognize()
+            return self._words(api)
+
+    def _words(self, api) -> Dict[str, list]:
+        """Palavras do último `Recognize()` no formato dict do pytesseract."""
+        tr   = self._tesserocr
+        keys = ("level", "page_num", "block_num", "par_num", "line_num",
+                "word_num", "left", "top", "width", "height", "conf", "text")
+        out: Dict[str, List[Any]] = {k: [] for k in keys}
+        block = par = line = word = 0
+        it = api.GetIterator()
+        if it is None:
+            return out
+        RIL = tr.RIL
+        for w in tr.iterate_level(it, RIL.WORD):
+            if w.IsAtBeginningOf(RIL.BLOCK):
+                block, par, line, word = block + 1, 0, 0, 0
+            if w.IsAtBeginningOf(RIL.PARA):
+                par, line, word = par + 1, 0, 0
+            if w.IsAtBeginningOf(RIL.TEXTLINE):
+                line, word = line + 1, 0
+            word += 1
+            bbox = w.BoundingBox(RIL.WORD) or (0, 0, 0, 0)
+            x0, y0, x1, y1 = bbox
+            for k, v in zip(keys, (5, 1, block, par, line, word, x0, y0,
+                                   x1 - x0, y1 - y0, w.Confidence(RIL.WORD),
+                                   w.GetUTF8Text(RIL.WORD) or "")):
+                out[k].append(v)
+        return out
+
+    def image_to_pdf(self, img, *, lang: str, config: str = "") -> bytes:
+        return self._fallback.image_to_pdf(img, lang=lang, config=config)
+
+
+# ----------------------------------------------------------------------
+_BACKENDS = {"pytesseract": PytesseractBackend, "tesserocr": TesserocrBackend}
+_lock     = threading.Lock()
+_current: OCRBackend | None = None
+
+
+def _make(name: str) -> OCRBackend:
+    if name == "auto":
+        try:
+            return TesserocrBackend()
+        except ImportError:
+            return PytesseractBackend()
+    try:
+        return _BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"backend de OCR desconhecido: {name!r} (use {sorted(_BACKENDS)} ou 'auto')"
+        ) from None
+
+
+def set_backend(backend: str | OCRBackend = "auto") -> OCRBackend:
+    """Define o motor global de OCR (nome ou instância)."""
+    global _current
+    with _lock:
+        _current = backend if isinstance(backend, OCRBackend) else _make(backend)
+    logger.info("Backend de OCR: %s", _current.name)
+    return _current
+
+
+def get_backend() -> OCRBackend:
+    if _current is None:
+        set_backend(os.environ.get("LANG_HYBRID_PDF_OCR_BACKEND", "auto"))
+    return _current
@@ -0,0 +1,170 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/ocr_cache.py
+"""
+ocr_cache.py – cache endereçado por conteúdo para resultados de OCR.
+
+Cada entrada é indexada por um hash dos pixels renderizados + as
+configurações que influenciam o resultado (lang, DPI, clip, config…).
+Páginas inalteradas entre versões de um PDF (ou re-indexações) saem
+direto do cache, sem nova chamada ao Tesseract.
+
+Backends:
+• MemoryOCRCache – LRU em memória (processo atual, testes)
+• SQLiteOCRCache – arquivo local, persistente, com LRU por tamanho
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict
+
+# ----------------------------------------------------------------------
+def cache_key(payload: bytes | memoryview, **settings: Any) -> str:
+    """Hash (blake2b) dos bytes da imagem + configurações ordenadas."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(payload)
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+# ----------------------------------------------------------------------
+class OCRCache:
+    """
+    Interface mínima de cache. Subclasses implementam `_get`/`_set`;
+    os contadores de hit/miss ficam aqui, sob o `_lock` (também o das
+    subclasses) – o cache é usado pelas threads do pool de OCR.
+    """
+
+    def __init__(self) -> None:
+        self.hits   = 0
+        self.misses = 0
+        self._lock  = threading.Lock()
+
+    def _get(self, key: str) -> bytes | None:          # pragma: no cover
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes) -> None:     # pragma: no cover
+        raise NotImplementedError
+
+    def get(self, key: str) -> bytes | None:
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self._set(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+class MemoryOCRCache(OCRCache):
+    """LRU em memória limitado a `max_bytes`."""
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes and len(self._data) > 1:
+                _, ev = self._data.popitem(last=False)
+                self._size -= len(ev)
+
+
+class SQLiteOCRCache(OCRCache):
+    """
+    Cache persistente em SQLite. Quando o total passa de `max_bytes`,
+    remove as entradas menos usadas recentemente (coluna `atime`).
+    Seguro para uso a partir de várias threads (pool de OCR).
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 1 * 2**30):
+        super().__init__()
+        self.path      = str(Path(path).expanduser())
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, atime REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ocr_cache_atime ON ocr_cache(atime)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM ocr_cache"
+        ).fetchone()[0]
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE ocr_cache SET atime = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return bytes(row[0])
+
+    def _set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, value, size, atime)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            self._size += len(value) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM ocr_cache ORDER BY atime LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM ocr_cache WHERE key = ?", (row[0],))
+            self._size -= row[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ocr_cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {**super().stats(), "bytes": self._size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,105 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/preload.py
+"""
+preload.py – pré-carga das dependências pesadas.
+
+`import lang_hybrid_pdf` não importa PyMuPDF, PIL, pytesseract,
+rapidfuzz, LangChain nem Docling: cada etapa importa o que usa na
+primeira execução. Isso é o certo para CLIs e processos de vida curta;
+workers de vida longa (pool do `extract_many`, servidores) podem pagar
+esse custo de uma vez, antes do primeiro PDF:
+
+    warmup()                          # todas as etapas disponíveis
+    warmup("classify", "hybrid")      # só o necessário
+
+    ProcessPoolExecutor(initializer=warmup)
+
+Etapas ("stages"):
+
+• classify  – PyMuPDF + classificador (`extractor_router`)
+• hybrid    – loader híbrido (rapidfuzz, filtro pré-OCR, BlockStore)
+• image     – caminho de PDFs 100 % imagem
+• docling   – wrapper do Docling e o próprio Docling (extra [docling]);
+              cria o DocumentConverter do processo e o pipeline de PDF
+• ocr       – backend de OCR global; com tesserocr carrega o traineddata
+              do idioma padrão com um OCR de 1 px
+• tokenizer – contador de tokens global (ex.: encoding do tiktoken)
+
+Dependência opcional ausente não é erro (`strict=False`): a etapa é
+registrada como indisponível e o resto segue.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from typing import Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def _modules(*names: str) -> Callable[[], None]:
+    def run() -> None:
+        for name in names:
+            importlib.import_module(name, __package__)
+    return run
+
+
+def _docling() -> None:
+    from .text_docling import _converter, _require
+    _require("langchain_docling", "docling")
+    base = _require("docling.datamodel.base_models", "docling")
+    _converter().initialize_pipeline(base.InputFormat.PDF)
+
+
+def _ocr() -> None:
+    from .ocr_backends import get_backend
+    from .settings import OCR
+
+    backend = get_backend()
+    if backend.name == "tesserocr":               # traineddata fica no handle
+        from PIL import Image
+        backend.image_to_string(Image.new("L", (1, 1), 255), lang=OCR.lang)
+
+
+def _tokenizer() -> None:
+    from .tokenizer import resolve_tokenizer
+    resolve_tokenizer(None)("aquecimento")
+
+
+STAGES: Dict[str, Callable[[], None]] = {
+    "classify":  _modules(".document", ".raster", ".ocr", ".extractor_router"),
+    "hybrid":    _modules(".hybrid_pdf_loader", "rapidfuzz.fuzz", "rapidfuzz.process"),
+    "image":     _modules(".image_layout_ocr"),
+    "docling":   _docling,
+    "ocr":       _ocr,
+    "tokenizer": _tokenizer,
+}
+
+
+def warmup(*stages: str, strict: bool = False) -> Dict[str, float | None]:
+    """
+    Importa/inicializa as etapas pedidas (default: todas) e devolve os
+    segundos gastos por etapa (None = indisponível). `strict=True`
+    propaga o erro de uma dependência ausente.
+    """
+    names: Iterable[str] = stages or STAGES
+    out: Dict[str, float | None] = {}
+    for name in names:
+        try:
+            run = STAGES[name]
+        except KeyError:
+            raise ValueError(
+                f"etapa desconhecida: {name!r} (use {sorted(STAGES)})"
+            ) from None
+        t0 = time.perf_counter()
+        try:
+            run()
+        except Exception as err:
+            if strict:
+                raise
+            logger.info("warmup: etapa %r indisponível (%s)", name, err)
+            out[name] = None
+            continue
+        out[name] = time.perf_counter() - t0
+    return out
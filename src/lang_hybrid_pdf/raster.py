@@ -0,0 +1,107 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/raster.py
+"""
+raster.py – rasterização para o OCR com o mínimo de bytes movidos.
+
+O Tesseract binariza a imagem internamente; a cor só custa memória. Por
+isso páginas e blocos são renderizados direto em cinza pelo PyMuPDF
+(`csGRAY`, 1 byte/pixel em vez de 3) e, opcionalmente, binarizados no
+próprio buffer do Pixmap com NumPy (limiar de Otsu), sem cópias:
+
+• "rgb"    – caminho antigo (3 bytes/pixel)
+• "gray"   – default; 3× menos bytes até o backend
+• "binary" – cinza + limiar (0/255); o PNG temporário do pytesseract
+             fica bem menor e o ruído de fundo some
+
+O Pixmap segue direto para o backend (`ocr_backends`): o tesserocr lê os
+pixels crus e o pytesseract os embrulha num PIL.Image sem copiar.
+Modo global em `OCR.render_mode` (settings).
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import fitz                       # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from .ocr_backends import to_pil
+from .settings import OCR
+
+RENDER_MODES = ("rgb", "gray", "binary")
+
+
+def _check(mode: str) -> str:
+    if mode not in RENDER_MODES:
+        raise ValueError(f"render_mode deve ser um de {RENDER_MODES}, não {mode!r}")
+    return mode
+
+
+# ----------------------------------------------------------------------
+def otsu_threshold(hist: Sequence[int] | np.ndarray) -> int:
+    """Limiar de Otsu (0–255) a partir de um histograma de 256 níveis."""
+    h = np.asarray(hist, dtype=np.float64)[:256]
+    total = h.sum()
+    if total == 0:
+        return 128
+    levels = np.arange(h.size, dtype=np.float64)
+    w0 = np.cumsum(h)                              # pixels ≤ t
+    m0 = np.cumsum(h * levels)
+    w1 = total - w0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m0[-1] * w0 - total * m0) ** 2 / (w0 * w1)
+    between[~np.isfinite(between)] = -1.0
+    if between.max() < 0:                          # imagem de um só tom
+        return 128
+    return int(np.argmax(between))
+
+
+def binarize_pixmap(pix: fitz.Pixmap, threshold: int | None = None) -> fitz.Pixmap:
+    """
+    Binariza um Pixmap cinza (n = 1) NO PRÓPRIO buffer: > limiar vira
+    255, o resto 0. Sem `threshold`, usa Otsu. Devolve o mesmo Pixmap.
+    """
+    if pix.n != 1 or pix.alpha:
+        raise ValueError("binarize_pixmap espera um Pixmap cinza sem alfa")
+    if threshold is None:                # histograma em C, sobre o mesmo buffer
+        threshold = otsu_threshold(to_pil(pix).histogram())
+    buf = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    np.greater(buf, threshold, out=buf.view(np.bool_))   # 0/1 in place
+    np.multiply(buf, 255, out=buf)                       # 0/255 in place
+    return pix
+
+
+def binarize_image(img: Image.Image, threshold: int | None = None) -> Image.Image:
+    """Equivalente para PIL (cinza): limiar via tabela, uma alocação em C."""
+    if img.mode != "L":
+        img = img.convert("L")
+    if threshold is None:
+        threshold = otsu_threshold(img.histogram())
+    return img.point([255 if v > threshold else 0 for v in range(256)])
+
+
+# ----------------------------------------------------------------------
+def render_pixmap(
+    page: fitz.Page,
+    dpi: int,
+    clip: fitz.Rect | Sequence[float] | None = None,
+    mode: str | None = None,
+) -> fitz.Pixmap:
+    """Renderiza `page` (ou o recorte `clip`) para OCR no modo pedido."""
+    mode = _check(mode or OCR.render_mode)
+    cs   = fitz.csRGB if mode == "rgb" else fitz.csGRAY
+    pix  = page.get_pixmap(dpi=dpi, clip=fitz.Rect(*clip) if clip is not None else None,
+                           colorspace=cs, alpha=False)
+    if mode == "binary":
+        binarize_pixmap(pix)
+    return pix
+
+
+def prepare_image(img: Image.Image, mode: str | None = None) -> Image.Image:
+    """Aplica o modo a uma imagem já renderizada (ex.: PIL vinda de fora)."""
+    mode = _check(mode or OCR.render_mode)
+    if mode == "rgb":
+        return img
+    if mode == "binary":
+        return binarize_image(img)
+    return img if img.mode == "L" else img.convert("L")
@@ -0,0 +1,155 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/region_ocr.py
+"""
+region_ocr.py – OCR de uma página híbrida numa única passada.
+
+Scanners que "fatiam" a página geram dezenas de blocos-imagem; no modo
+bloco a bloco cada um custa uma renderização e uma chamada ao Tesseract
+(um processo, no pytesseract). No modo página:
+
+• os blocos-imagem candidatos definem o recorte (a união dos bboxes)
+• a página é renderizada UMA vez nesse recorte e todo bloco que não é
+  candidato (texto nativo, logos barrados pelo filtro…) é pintado de
+  branco no próprio Pixmap – o Tesseract não relê o texto nativo
+• uma chamada `image_to_data` devolve as palavras com caixa e confiança
+• cada palavra volta ao bloco que contém o seu centro; o texto do bloco
+  é remontado com `ocr.data_to_text` e as palavras (texto, confiança,
+  bbox em pt) vão para `metadata["ocr_words"]`
+
+`use_page_mode` escolhe o modo pelo nº de candidatos e pela área
+(`RegionCfg`); com 0 ou 1 candidato o modo bloco já é uma passada só.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import fitz                       # PyMuPDF
+import numpy as np
+
+from .ocr import data_to_text, mean_confidence
+from .raster import render_pixmap
+from .settings import REGION, RegionCfg
+
+REGION_MODES = ("auto", "page", "block")
+_DATA_KEYS   = ("text", "conf", "block_num", "par_num", "line_num")
+
+BBox = Tuple[float, float, float, float]
+
+
+class RegionPlan(NamedTuple):
+    """O que OCRizar numa passada: recorte, blocos candidatos e máscaras."""
+    clip:  BBox
+    boxes: List[Tuple[int, BBox]]         # (idx do bloco, bbox) candidatos
+    masks: List[BBox]                     # pintados de branco antes do OCR
+
+
+def _area(b: Sequence[float]) -> float:
+    return max(0.0, b[2] - b[0]) * max(0.0, b[3] - b[1])
+
+
+def _union(boxes: Sequence[Sequence[float]]) -> BBox:
+    a = np.asarray(boxes, dtype=np.float64)
+    return (float(a[:, 0].min()), float(a[:, 1].min()),
+            float(a[:, 2].max()), float(a[:, 3].max()))
+
+
+def use_page_mode(
+    page_rect: Sequence[float],
+    cands: Sequence[Tuple[int, Sequence[float]]],
+    cfg: RegionCfg = REGION,
+) -> bool:
+    """
+    True se vale OCRizar os candidatos numa passada só: muitos blocos
+    (≥ `min_blocks`) ou cobrindo boa parte da página (≥ `min_cover`), e
+    juntos o bastante para o recorte não ser quase todo vazio
+    (`max_spread`).
+    """
+    if cfg.mode not in REGION_MODES:
+        raise ValueError(f"RegionCfg.mode deve ser um de {REGION_MODES}, não {cfg.mode!r}")
+    if cfg.mode == "block" or not cands:
+        return False
+    if cfg.mode == "page":
+        return True
+    if len(cands) < 2:
+        return False
+    area = sum(_area(b) for _, b in cands)
+    if not area or _area(_union([b for _, b in cands])) > cfg.max_spread * area:
+        return False
+    return len(cands) >= cfg.min_blocks or area >= cfg.min_cover * _area(page_rect)
+
+
+def make_plan(
+    blocks: Sequence[dict],
+    cands: Sequence[Tuple[int, Sequence[float]]],
+) -> RegionPlan:
+    """Recorte = união dos candidatos; máscara = os outros blocos que o tocam."""
+    boxes = [(idx, tuple(bbox)) for idx, bbox in cands]
+    if not boxes:
+        return RegionPlan((0.0, 0.0, 0.0, 0.0), [], [])
+    clip  = _union([b for _, b in boxes])
+    keep  = {idx for idx, _ in boxes}
+    masks = [tuple(b["bbox"]) for i, b in enumerate(blocks)
+             if i not in keep and fitz.Rect(b["bbox"]).intersects(clip)]
+    return RegionPlan(clip, boxes, masks)
+
+
+def _origin(clip: BBox, dpi: int) -> Tuple[int, int]:
+    """Pixel (0, 0) do Pixmap do recorte, em pixels da página (= pix.x, pix.y)."""
+    s = dpi / 72
+    return math.floor(clip[0] * s + 1e-3), math.floor(clip[1] * s + 1e-3)
+
+
+def render_region(page: fitz.Page, plan: RegionPlan, dpi: int) -> fitz.Pixmap:
+    """Renderiza o recorte do plano e pinta as máscaras de branco (in place)."""
+    pix   = render_pixmap(page, dpi, plan.clip)       # irect em pixels da página
+    mat   = fitz.Matrix(dpi / 72, dpi / 72)
+    white = (255,) * pix.n
+    for bbox in plan.masks:
+        rect = (fitz.Rect(bbox) * mat).irect & pix.irect
+        if not rect.is_empty:
+            pix.set_rect(rect, white)
+    return pix
+
+
+def split_words(
+    data: Dict[str, list], plan: RegionPlan, dpi: int
+) -> Tuple[Dict[int, Tuple[str, dict]], int]:
+    """
+    Distribui as palavras de `image_to_data` (coordenadas em pixels do
+    recorte) pelos blocos do plano. Devolve ({idx: (texto, metadados)},
+    nº de palavras fora de todo bloco). Blocos sem palavra não aparecem.
+    """
+    words = [i for i, t in enumerate(data.get("text", [])) if (t or "").strip()]
+    if not words or not plan.boxes:
+        return {}, len(words)
+
+    scale  = 72 / dpi
+    x0, y0 = _origin(plan.clip, dpi)
+    left   = (np.asarray([data["left"][i] for i in words], dtype=np.float64) + x0) * scale
+    top    = (np.asarray([data["top"][i] for i in words], dtype=np.float64) + y0) * scale
+    width  = np.asarray([data["width"][i] for i in words], dtype=np.float64) * scale
+    height = np.asarray([data["height"][i] for i in words], dtype=np.float64) * scale
+    cx, cy = left + width / 2, top + height / 2
+
+    b      = np.asarray([bbox for _, bbox in plan.boxes], dtype=np.float64)
+    inside = ((cx[:, None] >= b[:, 0]) & (cx[:, None] <= b[:, 2])
+              & (cy[:, None] >= b[:, 1]) & (cy[:, None] <= b[:, 3]))
+    owner  = np.where(inside.any(axis=1), inside.argmax(axis=1), -1)   # 1º bloco
+
+    out: Dict[int, Tuple[str, dict]] = {}
+    for k, (idx, _) in enumerate(plan.boxes):
+        sel = np.flatnonzero(owner == k)
+        if not sel.size:
+            continue
+        rows = [words[j] for j in sel]
+        sub  = {key: [data[key][i] for i in rows] for key in _DATA_KEYS}
+        meta = [{"text": sub["text"][n].strip(),
+                 "conf": round(float(sub["conf"][n]), 1),
+                 "bbox": tuple(round(float(v), 2) for v in
+                               (left[j], top[j], left[j] + width[j], top[j] + height[j]))}
+                for n, j in enumerate(sel)]
+        out[idx] = (data_to_text(sub), {"ocr_dpi": dpi,
+                                        "ocr_conf": round(mean_confidence(sub), 1),
+                                        "ocr_words": meta})
+    return out, int((owner < 0).sum())
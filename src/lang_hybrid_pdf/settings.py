@@ -4,11 +4,53 @@ from dataclasses import dataclass
 class OCRCfg:
     min_native_chars: int = 60          #OCR.min_native_chars
     min_ocr_chars:   int = 30           #OCR.min_ocr_chars
-    batch_size:      int = 3            #OCR.batch_size
+    batch_size:      int = 3            #OCR.batch_size (obsoleto: fast_classify não para mais cedo)
     quick_ocr_dpi:   int = 120          #OCR.quick_ocr_dpi
     lang:            str = "por+eng"    #OCR.lang
     page_image_dpi:  int = 300          #OCR.page_image_dpi
+    image_cover_min: float = 0.05       #OCR.image_cover_min  (abaixo: sem OCR)
+    image_cover_full: float = 0.6       #OCR.image_cover_full (acima, sem texto: página escaneada)
+    adaptive_dpis:   tuple[int, ...] = (150, 225)   #OCR.adaptive_dpis (+ o DPI máximo da etapa)
+    adaptive_min_conf: float = 80.0     #OCR.adaptive_min_conf (confiança média p/ parar)
+    classify_strata: int = 16           #OCR.classify_strata (amostra estratificada do fast_classify)
+    classify_budget_s: float = 30.0     #OCR.classify_budget_s (teto p/ OCR rápido; depois infere)
+    render_mode:     str = "gray"       #OCR.render_mode ("rgb" | "gray" | "binary", ver raster.py)
 
 OCR = OCRCfg()          # uso: OCR.min_native_chars, etc.
 
+@dataclass(slots=True, frozen=True)
+class GateCfg:
+    """Filtro pré-OCR de blocos-imagem (ver block_gate.py)."""
+    min_area:   float = 600.0           # pt² (≈ 2 × 1 cm); menor: ícones, bullets
+    min_side:   float = 4.0             # pt; lado menor abaixo disso: filetes, linhas
+    thumb_dpi:  int   = 50              # miniatura em cinza para as estatísticas
+    min_ink:    float = 0.005           # fração de pixels "escuros" (< 192)
+    max_ink:    float = 0.95            # quase tudo escuro: tarja, bloco sólido
+    min_edges:  float = 0.04            # transições fortes por pixel; texto ≈ 0.25
+
+GATE = GateCfg()        # uso: HybridPDFLoader(block_gate=GATE | None)
+
+@dataclass(slots=True, frozen=True)
+class DedupCfg:
+    """Dedup de quase-duplicatas por MinHash + LSH (ver dedup.py)."""
+    shingle:   int   = 4                # k-gramas de caracteres (1–8) do texto normalizado
+    num_perm:  int   = 128              # tamanho da assinatura MinHash
+    bands:     int   = 32               # LSH: bandas × (num_perm / bandas) linhas
+    threshold: float = 0.7              # Jaccard estimado que basta p/ ser duplicata
+    min_ratio: float = 90.0             # abaixo dele: confirma com fuzz.ratio (0 = desliga)…
+    verify_from: float = 0.4            # …só p/ candidatos com Jaccard estimado ≥ isto
+    seed:      int   = 1                # permutações reprodutíveis entre processos
+
+DEDUP = DedupCfg()      # uso: HybridPDFLoader(dedup=DEDUP | None)
+
+@dataclass(slots=True, frozen=True)
+class RegionCfg:
+    """OCR da página inteira com máscara, em vez de bloco a bloco (ver region_ocr.py)."""
+    mode:       str   = "auto"          # "auto" | "page" (sempre) | "block" (nunca)
+    min_blocks: int   = 4               # auto: ≥ isto de blocos-imagem candidatos → página
+    min_cover:  float = 0.5             # …ou eles cobrem ≥ isto da área da página
+    max_spread: float = 4.0             # área do recorte ÷ soma dos blocos; acima → por bloco
+
+REGION = RegionCfg()    # uso: HybridPDFLoader(region_ocr=REGION | None)
+
 #OCR.page_image_dpi
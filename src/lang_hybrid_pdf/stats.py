@@ -0,0 +1,150 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/stats.py
+"""
+stats.py – instrumentação opt-in (tempo por etapa/página e contadores).
+
+    stats = Stats()
+    docs  = extract_text("contrato.pdf", stats=stats)
+    stats.snapshot()        # dict serializável (JSON)
+    stats.to_prometheus()   # formato de exposição texto do Prometheus
+
+Para OpenTelemetry/StatsD/etc., passe `sinks=[callback]`: cada evento
+chega como `callback(kind, name, value, attrs)`, com kind em
+{"timing", "counter", "label"}.
+
+Quando nenhum `Stats` é passado, usa-se `NULL_STATS`, que não faz nada.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+Sink = Callable[[str, str, float | str, Dict[str, Any]], None]
+
+
+# ----------------------------------------------------------------------
+class Stats:
+    """Coletor thread-safe (o pool de OCR grava em paralelo)."""
+
+    enabled = True
+
+    def __init__(self, sinks: Iterable[Sink] = ()):
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.stage_calls:   Dict[str, int]   = defaultdict(int)
+        self.page_seconds:  Dict[int, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.labels:   Dict[str, str]   = {}
+
+    # ------------------------------------------------------------------
+    def _emit(self, kind: str, name: str, value, attrs: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            sink(kind, name, value, attrs)
+
+    @contextmanager
+    def stage(self, name: str, page: int | None = None) -> Iterator[None]:
+        """Cronometra um bloco (wall time) por etapa e, opcionalmente, por página."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, time.perf_counter() - t0, page)
+
+    def timing(self, name: str, seconds: float, page: int | None = None) -> None:
+        with self._lock:
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name]   += 1
+            if page is not None:
+                self.page_seconds[page][name] += seconds
+        self._emit("timing", name, seconds, {"page": page} if page else {})
+
+    def incr(self, name: str, value: float = 1, **attrs: Any) -> None:
+        with self._lock:
+            self.counters[name] += value
+        self._emit("counter", name, value, attrs)
+
+    def label(self, name: str, value: str) -> None:
+        with self._lock:
+            self.labels[name] = value
+        self._emit("label", name, value, {})
+
+    def ocr_call(self, op: str, width: int, height: int, dpi: int | None = None,
+                 nbytes: int | None = None) -> None:
+        """Registra uma chamada ao Tesseract (nº, pixels, bytes e DPI)."""
+        attrs = {"op": op, "dpi": dpi}
+        self.incr("ocr.calls", **attrs)
+        self.incr("ocr.pixels", width * height, **attrs)
+        if nbytes is not None:
+            self.incr("ocr.bytes", nbytes, **attrs)
+        if dpi:
+            self.incr(f"ocr.calls.dpi_{dpi}")
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {
+                    k: {"seconds": round(v, 6), "calls": self.stage_calls[k]}
+                    for k, v in self.stage_seconds.items()
+                },
+                "pages": {
+                    p: {k: round(v, 6) for k, v in st.items()}
+                    for p, st in sorted(self.page_seconds.items())
+                },
+                "counters": dict(self.counters),
+                "labels":   dict(self.labels),
+            }
+
+    def to_prometheus(self, prefix: str = "lang_hybrid_pdf") -> str:
+        """Exposição texto (sem dependência do prometheus_client)."""
+        snap, out = self.snapshot(), []
+        out.append(f"# TYPE {prefix}_stage_seconds_total counter")
+        for k, v in snap["stages"].items():
+            out.append(f'{prefix}_stage_seconds_total{{stage="{k}"}} {v["seconds"]}')
+        out.append(f"# TYPE {prefix}_stage_calls_total counter")
+        for k, v in snap["stages"].items():
+            out.append(f'{prefix}_stage_calls_total{{stage="{k}"}} {v["calls"]}')
+        for k, v in snap["counters"].items():
+            name = k.replace(".", "_")
+            out.append(f"# TYPE {prefix}_{name}_total counter")
+            out.append(f"{prefix}_{name}_total {v}")
+        for k, v in snap["labels"].items():
+            out.append(f'{prefix}_info{{{k}="{v}"}} 1')
+        return "\n".join(out) + "\n"
+
+
+class _NullStats(Stats):
+    """Implementação no-op: custo ~zero quando a instrumentação está desligada."""
+
+    enabled = False
+
+    def __init__(self) -> None:          # sem estruturas internas
+        pass
+
+    @contextmanager
+    def stage(self, name: str, page: int | None = None) -> Iterator[None]:
+        yield
+
+    def timing(self, *a, **k) -> None:
+        pass
+
+    def incr(self, *a, **k) -> None:
+        pass
+
+    def label(self, *a, **k) -> None:
+        pass
+
+    def ocr_call(self, *a, **k) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {}
+
+
+NULL_STATS: Stats = _NullStats()
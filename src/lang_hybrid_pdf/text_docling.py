@@ -1,10 +1,17 @@
 #lang-hybrid-pdf/src/lang_hybrid_pdf/text_docling.py 
 
 from __future__ import annotations
+import io
 import logging
-from typing import List, Any
+import os
+import tempfile
+import threading
+from contextlib import nullcontext
+from typing import List, Any, Sequence
 from langchain_core.documents import Document
 from .helpers import adjust_chunks_to_token_limit        # se quiser usar
+from .document import PDFContext, PDFSource, open_context, page_runs
+from .stats import NULL_STATS, Stats
 # Se você tiver um decorator log_time comum ao pacote,
 # faça from .helpers import log_time
 
@@ -19,24 +26,98 @@ def _require(pkg: str, extra: str):
             f'  pip install "lang-hybrid-pdf[{extra}]"'
         ) from err
 
+_converter_lock = threading.Lock()
+_CONVERTER: Any = None
+
+
+def _converter():
+    """
+    DocumentConverter único do processo. Cada `DocumentConverter` novo
+    inicializa de novo o pipeline (modelos de layout/tabela); com um só,
+    páginas fragmentadas ([1, 3, 5…] → um intervalo por página) e as
+    faixas de 4 páginas do `batch` pagam essa partida uma vez por processo.
+    """
+    global _CONVERTER
+    with _converter_lock:
+        if _CONVERTER is None:
+            mod = _require("docling.document_converter", "docling")
+            _CONVERTER = mod.DocumentConverter()
+        return _CONVERTER
+
+def _docling_source(source: str | os.PathLike | PDFContext):
+    """
+    Caminho (str) ou DocumentStream em memória para o Docling. O Docling
+    só lê de um BytesIO próprio: é a única cópia dos bytes (nada em disco).
+    """
+    if not isinstance(source, PDFContext):
+        return os.fspath(source)
+    if source.path is not None:
+        return source.path
+    name, data = source.name, source.data
+    DocumentStream = _require("docling.datamodel.base_models", "docling").DocumentStream
+    return DocumentStream(name=name, stream=io.BytesIO(data))
+
+def _pypdf_load(source: str | os.PathLike | PDFContext) -> List[Document]:
+    from langchain_community.document_loaders import PyPDFLoader
+    if not isinstance(source, PDFContext):
+        return PyPDFLoader(os.fspath(source)).load()
+    if source.path is not None:
+        return PyPDFLoader(source.path).load()
+    data = source.data
+
+    # PyPDFLoader só lê de disco → arquivo temporário inevitável
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+        tmp.write(data)
+    try:
+        return PyPDFLoader(tmp.name).load()
+    finally:
+        os.remove(tmp.name)
+
 def load_with_docling(
-    file_path: str,
+    file_path: PDFSource,
     export_type: Any | None = None,
+    *,
+    pages: Sequence[int] | None = None,
+    stats: Stats = NULL_STATS,
 ) -> List[Document]:
     """
     Tenta carregar via Docling; se não disponível, usa PyPDFLoader.
+    Aceita caminho, bytes/memoryview/mmap, objeto-arquivo ou um
+    PDFContext já aberto. `pages` (1-based)
+    restringe o Docling aos intervalos contíguos dessas páginas.
     """
+    if isinstance(file_path, (str, os.PathLike, PDFContext)):
+        src = nullcontext(file_path)
+    else:                                 # bytes, mmap, objeto-arquivo: lido uma vez
+        src = open_context(file_path)
+    with src as source, stats.stage("docling"):
+        return _load(source, export_type, pages)
+
+def _load(file_path, export_type, pages) -> List[Document]:
     try:
         lc = _require("langchain_docling", "docling")
         ExportType = lc.loader.ExportType
         if export_type is None:
             export_type = ExportType.DOC_CHUNKS
-        loader = lc.DoclingLoader(file_path=file_path, export_type=export_type)
-        docs = loader.load()
+
+        ranges    = page_runs(list(pages)) if pages else [None]
+        converter = _converter()
+        docs: List[Document] = []
+        for rng in ranges:
+            loader = lc.DoclingLoader(
+                file_path=[_docling_source(file_path)],
+                converter=converter,
+                export_type=export_type,
+                convert_kwargs={"page_range": rng} if rng else None,
+            )
+            docs.extend(loader.load())
         logger.info("✅ Docling retornou %d chunks.", len(docs))
         return docs
 
     except ImportError:
-        from langchain_community.document_loaders import PyPDFLoader
         logger.warning("Docling não instalado – usando PyPDFLoader.")
-        return PyPDFLoader(file_path).load()
+        docs = _pypdf_load(file_path)
+        if pages:
+            wanted = set(pages)
+            docs = [d for d in docs if (d.metadata.get("page") or 0) + 1 in wanted]
+        return docs
@@ -0,0 +1,92 @@
+#lang-hybrid-pdf/src/lang_hybrid_pdf/tokenizer.py
+"""
+tokenizer.py – contagem de tokens para o corte de chunks.
+
+• "approx" (default) – estimativa por regex (~4 caracteres por token em
+  cada palavra/pontuação); rápida, sem rede e sem dependências
+• "tiktoken:<encoding>" – ex.: "tiktoken:cl100k_base" (pip install tiktoken)
+• "hf:<modelo>" – tokenizer do Hugging Face (transformers.AutoTokenizer)
+• qualquer callable `str -> int`
+
+Seleção: `set_tokenizer(...)` ou a variável de ambiente
+LANG_HYBRID_PDF_TOKENIZER. O tokenizer é carregado uma vez por nome e as
+contagens ficam num LRU (textos repetidos não são re-tokenizados).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[str], int]
+
+_TOKEN_RE   = re.compile(r"\w+|[^\w\s]")
+_COUNT_LRU  = 16_384
+
+
+# ----------------------------------------------------------------------
+def approx_token_count(text: str) -> int:
+    """Estimativa: cada palavra/pontuação vale ceil(len / 4) tokens."""
+    return sum((len(m) + 3) // 4 for m in _TOKEN_RE.findall(text))
+
+
+def _require(mod: str, extra: str):
+    try:
+        return __import__(mod, fromlist=["*"])
+    except ImportError as exc:            # pragma: no cover
+        raise ImportError(
+            f"Tokenizer requer o pacote '{mod}'. Instale com "
+            f"`pip install {extra}`."
+        ) from exc
+
+
+@lru_cache(maxsize=8)
+def _load(name: str) -> TokenCounter:
+    if name == "approx":
+        return approx_token_count
+    kind, _, arg = name.partition(":")
+    if kind == "tiktoken" and arg:
+        enc = _require("tiktoken", "tiktoken").get_encoding(arg)
+        count = lambda s: len(enc.encode(s, disallowed_special=()))
+    elif kind == "hf" and arg:
+        tok = _require("transformers", "transformers").AutoTokenizer.from_pretrained(arg)
+        count = lambda s: len(tok.encode(s, add_special_tokens=False))
+    else:
+        raise ValueError(
+            f"tokenizer desconhecido: {name!r} "
+            "(use 'approx', 'tiktoken:<encoding>', 'hf:<modelo>' ou um callable)"
+        )
+    return lru_cache(maxsize=_COUNT_LRU)(count)
+
+
+# ----------------------------------------------------------------------
+_lock = threading.Lock()
+_current: TokenCounter | None = None
+
+
+def resolve_tokenizer(tokenizer: str | TokenCounter | None = None) -> TokenCounter:
+    """Nome/callable → contador; `None` devolve o tokenizer global."""
+    if tokenizer is None:
+        return get_tokenizer()
+    return tokenizer if callable(tokenizer) else _load(tokenizer)
+
+
+def set_tokenizer(tokenizer: str | TokenCounter = "approx") -> TokenCounter:
+    """Define o contador de tokens global (nome ou callable `str -> int`)."""
+    global _current
+    with _lock:
+        _current = resolve_tokenizer(tokenizer)
+    logger.info("Tokenizer: %s", tokenizer if isinstance(tokenizer, str) else tokenizer)
+    return _current
+
+
+def get_tokenizer() -> TokenCounter:
+    if _current is None:
+        set_tokenizer(os.environ.get("LANG_HYBRID_PDF_TOKENIZER", "approx"))
+    return _current
@@ -0,0 +1,105 @@
+"""
+Fixtures compartilhadas: PDFs sintéticos de blocos-imagem e um backend
+de OCR falso configurável (nenhum teste daqui exige o Tesseract).
+"""
+import hashlib
+import threading
+
+import fitz
+import pytest
+
+from lang_hybrid_pdf import ocr_backends
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+
+
+# ----------------------------------------------------------------------
+def _label_pixmap(text: str, width: float, fontsize: float) -> fitz.Pixmap:
+    tmp  = fitz.open()
+    page = tmp.new_page(width=width, height=60)
+    page.insert_textbox(page.rect + (4, 4, -4, -4), text, fontsize=fontsize)
+    return page.get_pixmap(dpi=150)
+
+
+def _image_pdf(labels, width: float = 420, fontsize: float = 14) -> bytes:
+    """Uma página por rótulo, cada uma com o rótulo rasterizado num bloco-imagem."""
+    doc = fitz.open()
+    for text in labels:
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(40, 100, 40 + width, 160),
+                          pixmap=_label_pixmap(text, width, fontsize))
+    return doc.tobytes()
+
+
+@pytest.fixture
+def image_pdf():
+    """`image_pdf(labels, width=420, fontsize=14)` → bytes do PDF."""
+    return _image_pdf
+
+
+@pytest.fixture
+def ocr_loader():
+    """HybridPDFLoader que OCRiza os blocos das páginas 1…`pages` (sem filtro pré-OCR)."""
+    def make(data, pages: int, **kw) -> HybridPDFLoader:
+        return HybridPDFLoader(data, text_pages=[], ocr_pages=list(range(1, pages + 1)),
+                               block_gate=None, **kw)
+    return make
+
+
+# ----------------------------------------------------------------------
+def pixel_text(img) -> str:
+    """Texto determinístico derivado dos pixels (mesma imagem → mesmo texto)."""
+    tag = hashlib.blake2b(bytes(img.samples_mv), digest_size=6).hexdigest()
+    return f"Cláusula {tag} – texto reconhecido do bloco."
+
+
+class Killed(Exception):
+    """O processo "morreu" no meio do OCR (ver `FakeOCR.die_at`)."""
+
+
+class FakeOCR(ocr_backends.OCRBackend):
+    """
+    OCR falso: `text(img)` dá a saída de `image_to_string` (default:
+    `pixel_text`) e `data(img)` o dict de `image_to_data`. Anota cada
+    imagem recebida e a thread da chamada; `die_at=n` levanta `Killed`
+    na n-ésima chamada.
+    """
+
+    name   = "fake"
+    Killed = Killed
+
+    def __init__(self, text=pixel_text, data=None, die_at: int | None = None):
+        self.text    = text
+        self.data    = data
+        self.die_at  = die_at
+        self.calls   = 0
+        self.images  = []
+        self.threads = []
+        self._lock   = threading.Lock()
+
+    def _called(self, img) -> None:
+        with self._lock:
+            self.calls += 1
+            self.images.append(img)
+            self.threads.append(threading.get_ident())
+            if self.calls == self.die_at:
+                raise Killed
+
+    def image_to_string(self, img, *, lang, config=""):
+        self._called(img)
+        return self.text(img)
+
+    def image_to_data(self, img, *, lang, config=""):
+        if self.data is None:
+            return super().image_to_data(img, lang=lang, config=config)
+        self._called(img)
+        return self.data(img)
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """`fake_ocr(**kw)` instala um `FakeOCR(**kw)` como backend atual e o devolve."""
+    def install(**kw) -> FakeOCR:
+        fake = FakeOCR(**kw)
+        monkeypatch.setattr(ocr_backends, "_current", fake)
+        return fake
+    return install
@@ -0,0 +1,63 @@
+"""
+Testes do OCR com DPI adaptativo (ocr.adaptive_ocr + HybridPDFLoader).
+"""
+import fitz
+
+from lang_hybrid_pdf import ocr
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.stats import Stats
+
+WORDS = "CLÁUSULA PRIMEIRA DO OBJETO DO CONTRATO DE PRESTAÇÃO".split()
+
+
+def _data(words, conf):
+    n = len(words)
+    return {"text": words, "conf": [conf] * n, "block_num": [1] * n,
+            "par_num": [1] * n, "line_num": [1 + i // 4 for i in range(n)]}
+
+
+def _conf_by_width(img):
+    """Confiança cresce com a resolução: < 1000 px de largura = borrado."""
+    return _data(WORDS, 95 if img.width >= 1000 else 40)
+
+
+# ----------------------------------------------------------------------
+def test_data_to_text_and_confidence():
+    d = _data(["a", "bb", ""], 90)
+    d["conf"][1] = 60
+    assert ocr.data_to_text(d) == "a bb"
+    assert ocr.mean_confidence(d) == (90 * 1 + 60 * 2) / 3
+    assert ocr.mean_confidence(_data([], 0)) == 0.0
+    assert ocr.dpi_ladder(300, (150, 225, 400)) == [150, 225, 300]
+
+
+def test_adaptive_ocr_stops_at_first_confident_dpi(fake_ocr):
+    fake_ocr(data=_conf_by_width)
+    stats = Stats()
+    rendered = []
+
+    def render(dpi):
+        rendered.append(dpi)
+        return fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, dpi * 5, 10), False)
+
+    res = ocr.adaptive_ocr(render, [150, 225, 300], lang="por", min_conf=80,
+                           stats=stats)
+    assert (res.dpi, res.conf) == (225, 95)
+    assert rendered == [150, 225]
+    assert res.text == "CLÁUSULA PRIMEIRA DO OBJETO\nDO CONTRATO DE PRESTAÇÃO"
+    assert stats.counters["ocr.adaptive_escalations"] == 1
+
+
+def test_loader_adaptive_serial_matches_parallel(fake_ocr, image_pdf):
+    data = image_pdf([" ".join(WORDS)] * 3, width=400, fontsize=11)
+
+    runs = []
+    for workers in (1, 3):
+        fake_ocr(data=_conf_by_width)                  # 400 pt a 225 DPI = 1250 px
+        loader = HybridPDFLoader(data, text_pages=[], ocr_pages=[1, 2, 3],
+                                 workers=workers, adaptive_dpi=True)
+        docs = loader.load()
+        runs.append([(d.page_content, d.metadata["ocr_dpi"], d.metadata["ocr_conf"])
+                     for d in docs])
+    assert runs[0] == runs[1]
+    assert runs[0][0][1:] == (225, 95.0)
@@ -0,0 +1,95 @@
+"""
+Testes da API asyncio (aextract_text / HybridPDFLoader.alazy_load).
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from lang_hybrid_pdf import ocr_backends
+from lang_hybrid_pdf.extractor_router import aextract_text, extract_text
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+# ----------------------------------------------------------------------
+def test_aextract_text_matches_sync():
+    pdf = str(DATA_DIR / "texto_total.pdf")
+    got = asyncio.run(aextract_text(pdf, limiter=asyncio.Semaphore(1)))
+    assert [d.page_content for d in got] == [d.page_content for d in extract_text(pdf)]
+
+
+def test_process_pool_executor_is_rejected():
+    pdf = str(DATA_DIR / "texto_total.pdf")
+    with ProcessPoolExecutor(1) as pool:
+        with pytest.raises(TypeError, match="ThreadPoolExecutor"):
+            asyncio.run(aextract_text(pdf, executor=pool))
+        with pytest.raises(TypeError, match="ThreadPoolExecutor"):
+            asyncio.run(HybridPDFLoader(pdf).aload(executor=pool))
+
+
+def test_factory_error_reaches_the_consumer():
+    """Se `factory()` falha antes de gerar, o erro sobe no `async for`."""
+    from lang_hybrid_pdf.aio import aiter_in_executor
+
+    def factory():
+        raise ValueError("PDF inválido")
+
+    async def main():
+        return [d async for d in aiter_in_executor(factory)]
+
+    with pytest.raises(ValueError, match="PDF inválido"):
+        asyncio.run(asyncio.wait_for(main(), timeout=10))
+
+
+def test_cancel_kills_tesseract_subprocesses(tmp_path, monkeypatch, image_pdf):
+    """Cancelar a task mata o tesseract em andamento e não inicia outros."""
+    pids = tmp_path / "pids"
+    fake = tmp_path / "tesseract"
+    fake.write_text(f'#!/bin/sh\necho $$ >> "{pids}"\nexec sleep 30\n')
+    fake.chmod(0o755)
+
+    import pytesseract
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(fake))
+    monkeypatch.setattr(ocr_backends, "_current", ocr_backends.PytesseractBackend())
+
+    # uma imagem diferente por página: cópias da mesma imagem esperam o
+    # 1º OCR (filtro pré-OCR) e não rodariam em paralelo
+    data   = image_pdf([f"CLÁUSULA {n} – DO OBJETO " * 3 for n in range(1, 7)])
+    loader = HybridPDFLoader(data, text_pages=[],
+                             ocr_pages=list(range(1, 7)), workers=2)
+
+    async def main():
+        task = asyncio.create_task(loader.aload())
+        while not pids.exists() or len(pids.read_text().split()) < 2:
+            await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    t0 = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - t0 < 10
+
+    started = [int(p) for p in pids.read_text().split()]
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        alive = [p for p in started if _alive(p)]
+        if not alive:
+            break
+        time.sleep(0.05)
+    assert not alive
+    assert len(started) <= 3                     # a fila não foi adiante
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            return "zombie" not in fh.read()
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,129 @@
+"""
+Testes da ingestão em lote (lang_hybrid_pdf.batch).
+"""
+import json
+import os
+from pathlib import Path
+
+import fitz
+import pytest
+
+from lang_hybrid_pdf import ocr_backends
+from lang_hybrid_pdf.batch import extract_many, iter_paths, main
+from lang_hybrid_pdf.extractor_router import extract_text
+
+DATA_DIR = Path(__file__).parent / "data"
+TEXT_PDF = str(DATA_DIR / "texto_total.pdf")
+
+# a frase que o tesseract falso "lê" em toda imagem (modo fixo)
+OCR_TEXT = "Texto da imagem que repete a cláusula nativa da última página."
+
+NATIVE = [
+    "Cláusula primeira: o objeto deste contrato é a locação do imóvel.",
+    "O aluguel mensal será pago até o quinto dia útil de cada mês vencido.",
+    "Fica eleito o foro da comarca da capital para dirimir quaisquer dúvidas.",
+]
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    """
+    Um `tesseract` falso no PATH – herdado pelos processos do pool (spawn),
+    ao contrário de um backend instalado por monkeypatch. `fixed=True`:
+    toda imagem vira `OCR_TEXT`; senão o texto depende da imagem (cksum).
+    """
+    def install(fixed: bool) -> None:
+        words = f'"{OCR_TEXT}"' if fixed else '"Página digitalizada $(cksum < "$1" | cut -d" " -f1)"'
+        script = tmp_path / "bin" / "tesseract"
+        script.parent.mkdir()
+        script.write_text(
+            "#!/bin/sh\n"
+            f"text={words}\n"
+            'case "$*" in\n'
+            '  *tessedit_create_tsv=1*)\n'
+            '    printf "level\\tpage_num\\tblock_num\\tpar_num\\tline_num\\tword_num\\t'
+            'left\\ttop\\twidth\\theight\\tconf\\ttext\\n'
+            '5\\t1\\t1\\t1\\t1\\t1\\t0\\t0\\t10\\t10\\t95\\t%s\\n" "$text" > "$2.tsv" ;;\n'
+            '  *) printf "%s\\n" "$text" > "$2.txt" ;;\n'
+            "esac\n"
+        )
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(ocr_backends, "_current", ocr_backends.PytesseractBackend())
+
+    return install
+
+
+def _scanned_pdf(path: Path, pages: int) -> str:
+    """Páginas 100 % imagem, cada uma com um texto diferente."""
+    tmp, doc = fitz.open(), fitz.open()
+    for n in range(pages):
+        src = tmp.new_page(width=300, height=80)
+        src.insert_text((10, 40), f"Página {n + 1} digitalizada", fontsize=14)
+        page = doc.new_page(width=300, height=80)
+        page.insert_image(page.rect, pixmap=src.get_pixmap(dpi=100))
+    doc.save(path)
+    return str(path)
+
+
+def _hybrid_pdf(path: Path) -> str:
+    """Texto nativo + um bloco-imagem por página; a última traz `OCR_TEXT`."""
+    pages = len(NATIVE) + 1
+    tmp, doc = fitz.open(), fitz.open()
+    for n in range(pages):
+        native = OCR_TEXT if n == pages - 1 else NATIVE[n]
+        src = tmp.new_page(width=400, height=120)
+        for y in range(20, 120, 18):         # texto denso: passa pelo filtro pré-OCR
+            src.insert_text((10, y), f"Quadro {n + 1} – linha {y} do anexo " * 2, fontsize=12)
+        page = doc.new_page()
+        page.insert_text((50, 80), native, fontsize=11)
+        page.insert_image(fitz.Rect(50, 300, 450, 420), pixmap=src.get_pixmap(dpi=150))
+    doc.save(path)
+    return str(path)
+
+
+# ----------------------------------------------------------------------
+def test_iter_paths_expands_dirs_and_globs():
+    pdfs = sorted(str(p) for p in DATA_DIR.glob("*.pdf"))
+    assert list(iter_paths(DATA_DIR)) == pdfs
+    assert list(iter_paths(str(DATA_DIR / "*.pdf"))) == pdfs
+    assert list(iter_paths([TEXT_PDF, "x.pdf"])) == [TEXT_PDF, "x.pdf"]
+
+
+def test_extract_many_matches_extract_text_and_reports_errors(tmp_path):
+    missing = str(tmp_path / "missing.pdf")
+    results = dict(extract_many([TEXT_PDF, missing], workers=2, chunk_pages=1))
+
+    assert isinstance(results[missing], Exception)
+    got = [d.page_content for d in results[TEXT_PDF]]
+    assert got == [d.page_content for d in extract_text(TEXT_PDF)]
+
+
+def test_cli_writes_jsonl(tmp_path):
+    out = tmp_path / "corpus.jsonl"
+    assert main([TEXT_PDF, "-o", str(out), "-w", "1"]) == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert rows and all(r["path"] == TEXT_PDF and r["page_content"] for r in rows)
+
+
+def test_extract_many_matches_extract_text_on_image_route(tmp_path, fake_tesseract):
+    fake_tesseract(fixed=False)
+    pdf = _scanned_pdf(tmp_path / "scan.pdf", 5)
+
+    (path, docs), = extract_many(pdf, workers=2, chunk_pages=2)
+    want = [(d.page_content, d.metadata["page"]) for d in extract_text(pdf)]
+    assert len(want) == 5
+    assert [(d.page_content, d.metadata["page"]) for d in docs] == want
+
+
+def test_extract_many_merges_hybrid_in_loader_order(tmp_path, fake_tesseract):
+    """Texto nativo de todas as faixas antes dos blocos, depois a dedup."""
+    fake_tesseract(fixed=True)
+    pdf = _hybrid_pdf(tmp_path / "hybrid.pdf")
+
+    (path, docs), = extract_many(pdf, workers=2, chunk_pages=1)
+    want = [(d.page_content, d.metadata["page"]) for d in extract_text(pdf)]
+    # o OCR dos blocos é duplicata do texto nativo da última página: fica
+    # o texto nativo (que sai antes de todos os blocos)
+    assert [t for t, _ in want] == NATIVE + [OCR_TEXT]
+    assert [(d.page_content, d.metadata["page"]) for d in docs] == want
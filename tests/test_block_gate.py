@@ -0,0 +1,97 @@
+"""
+Testes do filtro pré-OCR de blocos-imagem (block_gate.BlockGate).
+"""
+import fitz
+
+from lang_hybrid_pdf.block_gate import BlockGate
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+
+TEXT = "CLÁUSULA 1 – DO OBJETO. Prestação de serviços de digitalização."
+
+
+def _text_pixmap(text: str, width: float) -> fitz.Pixmap:
+    tmp  = fitz.open()
+    page = tmp.new_page(width=width, height=40)
+    page.insert_textbox(page.rect + (4, 4, -4, -4), text, fontsize=11)
+    return page.get_pixmap(dpi=150)
+
+
+def _make_pdf(pages: int = 3) -> bytes:
+    body  = _text_pixmap(TEXT, 420)
+    logo  = _text_pixmap("ACME", 120)                   # timbre repetido
+    blank = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 300, 100), False)
+    blank.clear_with(255)
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(40, 20, 160, 60), pixmap=logo)
+        page.insert_image(fitz.Rect(40, 100, 460, 140), pixmap=body)
+        page.insert_image(fitz.Rect(40, 200, 440, 203), pixmap=blank,
+                          keep_proportion=False)                  # filete
+        page.insert_image(fitz.Rect(40, 300, 340, 400), pixmap=blank)    # vazio
+        page.insert_image(fitz.Rect(40, 500, 52, 512), pixmap=body)      # ícone
+    return doc.tobytes()
+
+
+def _body_or_logo(img) -> str:
+    """OCR falso: só o bloco de texto (largo) rende caracteres suficientes."""
+    return TEXT if img.width > 1000 else "ACME"
+
+
+# ----------------------------------------------------------------------
+def test_gate_reasons():
+    doc  = fitz.open(stream=_make_pdf(2), filetype="pdf")
+    gate = BlockGate()
+    for pno, page in enumerate(doc):
+        imgs = [b for b in page.get_text("dict")["blocks"] if b["type"] == 1]
+        logo, body, line, empty, icon = sorted(imgs, key=lambda b: b["bbox"][1])
+        assert gate.check(page, body) is None
+        assert gate.check(page, line) == "thin"
+        assert gate.check(page, empty) == "blank"
+        assert gate.check(page, icon) == "small"
+        if pno == 0:
+            assert gate.check(page, logo) is None
+            gate.useless(logo)                         # OCR curto
+        else:
+            assert gate.check(page, logo) == "repeat"
+
+
+def test_gate_keeps_single_line_text_image():
+    """Uma linha de texto em imagem (500 × 20 pt) não é filete."""
+    tmp = fitz.open()
+    src = tmp.new_page(width=500, height=20)
+    src.insert_text((4, 15), TEXT, fontsize=11)
+    doc  = fitz.open()
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(40, 100, 540, 120), pixmap=src.get_pixmap(dpi=150))
+    blk, = [b for b in page.get_text("dict")["blocks"] if b["type"] == 1]
+    assert BlockGate().check(page, blk) is None
+
+
+def test_loader_gate_cuts_ocr_calls(fake_ocr):
+    data = _make_pdf(3)
+    runs = {}
+    for cfg in ("default", None):
+        rec = fake_ocr(text=_body_or_logo)
+        kw = {} if cfg == "default" else {"block_gate": None}
+        docs = HybridPDFLoader(data, text_pages=[], ocr_pages=[1, 2, 3],
+                               region_ocr=None, **kw).load()     # conta por bloco
+        runs[cfg] = (rec.calls, [d.page_content for d in docs])
+
+    (gated_calls, gated_docs), (all_calls, all_docs) = runs["default"], runs[None]
+    assert gated_docs == all_docs == [TEXT]          # dedup de quase-duplicatas
+    assert all_calls == 15
+    assert gated_calls == 4                          # 3 textos + 1º logo
+
+
+def test_parallel_logo_is_ocred_once(fake_ocr):
+    """Com workers > 1 as cópias do logo esperam o 1º OCR (saiu curto)."""
+    data = _make_pdf(6)
+    kw   = dict(text_pages=[], ocr_pages=list(range(1, 7)), region_ocr=None)
+    rec  = fake_ocr(text=_body_or_logo)
+    serial = HybridPDFLoader(data, **kw).load()
+    serial_calls, rec.calls = rec.calls, 0
+
+    parallel = HybridPDFLoader(data, workers=4, **kw).load()
+    assert rec.calls == serial_calls == 7            # 6 textos + 1º logo
+    assert [d.page_content for d in parallel] == [d.page_content for d in serial]
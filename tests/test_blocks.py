@@ -0,0 +1,54 @@
+"""
+Testes do BlockStore (blocks.py): mesma saída que o caminho com Documents.
+"""
+import pytest
+
+from lang_hybrid_pdf.blocks import (
+    NATIVE,
+    OCR_SRC,
+    BlockStore,
+    chunk_spans,
+    iter_documents,
+    span_text,
+)
+from lang_hybrid_pdf.helpers import adjust_chunks_to_token_limit
+
+
+def _store() -> BlockStore:
+    store = BlockStore()
+    for i in range(12):
+        page = 1 + i // 5
+        text = f"Cláusula {i}. " + "O contratante pagará o valor devido. " * (1 + i % 4)
+        if i % 3 == 2:
+            store.add(page, (10.0, 20.0 * i, 300.0, 20.0 * i + 15), text,
+                      OCR_SRC, conf=80.0 + i, dpi=300 + 10 * i)
+        else:
+            store.add(page, (10.0, 20.0 * i, 200.0 + i, 20.0 * i + 12), text, NATIVE)
+    return store
+
+
+def _plain(docs):
+    return [(d.page_content, d.metadata) for d in docs]
+
+
+def test_buffer_offsets_and_metadata():
+    store = BlockStore()
+    a = store.add(1, (0, 0, 10, 10), "abc")
+    b = store.add(2, (1, 2, 3, 4), "défg", OCR_SRC, conf=91.5, dpi=400)
+    assert len(store) == 2 and store.buffer == "abcdéfg"
+    assert store.text(a) == "abc" and store.text(b) == "défg"
+    assert store.meta(a) == {"page": 1, "bbox": (0.0, 0.0, 10.0, 10.0)}
+    assert store.meta(b, chunk=1) == {"page": 2, "bbox": (1.0, 2.0, 3.0, 4.0),
+                                      "ocr_dpi": 400, "ocr_conf": 91.5, "chunk": 1}
+    c = store.add(2, (5, 5, 6, 6), "h")              # buffer cresce depois de juntado
+    assert store.text(c) == "h" and store.text(b) == "défg"
+
+
+@pytest.mark.parametrize("limit", [None, 8, 20, 60, 400])
+def test_spans_match_adjust_chunks(limit):
+    store = _store()
+    expected = adjust_chunks_to_token_limit(
+        [store.document(i) for i in range(len(store))], limit)
+    assert _plain(iter_documents(store, limit)) == _plain(expected)
+    assert [span_text(store, s) for s in chunk_spans(store, limit)] == \
+           [d.page_content for d in expected]
@@ -0,0 +1,104 @@
+"""
+Testes da extração retomável (checkpoint.py + loader / OCR de PDF-imagem).
+"""
+import hashlib
+
+import pytest
+from langchain_core.documents import Document
+
+from lang_hybrid_pdf.checkpoint import Checkpoint, decode_docs, encode_docs, resume_map
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.image_layout_ocr import layout_ocr_from_pdf
+from lang_hybrid_pdf.stats import Stats
+
+
+def _labels(n: int) -> list:
+    return [f"Página {k}" for k in range(1, n + 1)]
+
+
+@pytest.fixture
+def ckpt(tmp_path):
+    with Checkpoint(tmp_path / "job.ckpt.sqlite") as c:
+        yield c
+
+
+def test_docs_roundtrip():
+    docs = [Document("a", metadata={"page": 1, "bbox": (1.0, 2.0, 3.0, 4.0),
+                                    "ocr_words": [{"text": "a", "bbox": (1, 2, 3, 4)}]})]
+    assert decode_docs(encode_docs(docs)) == docs
+
+
+def test_loader_resumes_after_kill(fake_ocr, image_pdf, ocr_loader, ckpt):
+    data = image_pdf(_labels(5))
+    fake_ocr()
+    expected = ocr_loader(data, 5).load()
+
+    with pytest.raises(fake_ocr(die_at=4).Killed):
+        ocr_loader(data, 5, checkpoint=ckpt).load()       # páginas 1–3 gravadas
+
+    ocr   = fake_ocr()
+    stats = Stats()
+    docs = ocr_loader(data, 5, checkpoint=ckpt, stats=stats).load()
+    assert ocr.calls == 2                              # só as páginas 4 e 5
+    assert stats.counters["checkpoint.pages_resumed"] == 3
+    assert [(d.page_content, d.metadata) for d in docs] == \
+           [(d.page_content, d.metadata) for d in expected]
+
+    ocr.calls = 0                                      # concluído: nada a refazer,
+    again = ocr_loader(memoryview(data), 5, checkpoint=ckpt).load()   # vindo de onde vier
+    assert ocr.calls == 0 and again == docs
+
+
+def test_other_config_is_another_job(fake_ocr, image_pdf, ocr_loader, ckpt):
+    data = image_pdf(_labels(2))
+    ocr  = fake_ocr()
+    ocr_loader(data, 2, checkpoint=ckpt).load()
+    ocr_loader(data, 2, checkpoint=ckpt, ocr_lang="eng").load()
+    assert ocr.calls == 4
+
+
+def test_classification_is_journaled(monkeypatch, fake_ocr, image_pdf, ckpt):
+    data = image_pdf(_labels(2))
+    fake_ocr()
+    docs = HybridPDFLoader(data, block_gate=None, checkpoint=ckpt).load()
+
+    calls = []
+    monkeypatch.setattr(HybridPDFLoader, "_classify_pages",
+                        lambda self, ctx: calls.append(1))
+    assert HybridPDFLoader(data, block_gate=None, checkpoint=ckpt).load() == docs
+    assert calls == []
+
+
+def test_image_ocr_resumes_after_kill(fake_ocr, image_pdf, ckpt):
+    data = image_pdf(_labels(4))
+    fake_ocr()
+    expected = layout_ocr_from_pdf(data, pipeline="plain")
+
+    with pytest.raises(fake_ocr(die_at=3).Killed):
+        layout_ocr_from_pdf(data, pipeline="plain", checkpoint=ckpt)
+
+    ocr = fake_ocr()
+    docs = layout_ocr_from_pdf(data, pipeline="plain", checkpoint=ckpt, workers=3)
+    assert ocr.calls == 2 and docs == expected
+
+    assert ckpt.discard(hashlib.blake2b(data, digest_size=20).hexdigest()) == 1
+    layout_ocr_from_pdf(data, pipeline="plain", checkpoint=ckpt)
+    assert ocr.calls == 6
+
+
+def test_page_subset_does_not_close_the_job(fake_ocr, image_pdf, ckpt):
+    data = image_pdf(_labels(4))
+    ocr  = fake_ocr()
+    layout_ocr_from_pdf(data, pipeline="plain", checkpoint=ckpt, pages=[1, 2])
+    docs = layout_ocr_from_pdf(data, pipeline="plain", checkpoint=ckpt)
+    assert ocr.calls == 4 and [d.metadata["page"] for d in docs] == [1, 2, 3, 4]
+
+
+def test_short_compute_names_the_missing_page(ckpt):
+    journal = ckpt.job("doc", {})
+    run = resume_map(journal, "s", [1, 2, 3], lambda pnos: iter(["a"]),
+                     str.encode, bytes.decode)
+    assert next(run) == "a"
+    with pytest.raises(RuntimeError, match="página 2"):
+        next(run)
+    assert journal.pages("s") == {1: b"a"}
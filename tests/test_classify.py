@@ -0,0 +1,92 @@
+"""
+Testes do classificador em camadas (extractor_router.fast_classify).
+"""
+from pathlib import Path
+
+import fitz
+import pytest
+
+from lang_hybrid_pdf.document import PDFContext
+from lang_hybrid_pdf.extractor_router import (
+    Classification,
+    fast_classify,
+    stratified_sample,
+)
+
+TEXT = ("CLÁUSULA 1 – DO OBJETO. O presente contrato tem por objeto a prestação "
+        "de serviços de digitalização e indexação de documentos.")
+
+
+def _scan() -> fitz.Pixmap:
+    tmp  = fitz.open()
+    page = tmp.new_page()
+    page.insert_textbox(page.rect + (50, 50, -50, -50), TEXT * 4, fontsize=11)
+    return page.get_pixmap(dpi=40)
+
+
+def _make_pdf(layout: str) -> bytes:
+    """t = texto nativo, s = página escaneada, a = texto + figura (ambígua)."""
+    scan = _scan()
+    doc  = fitz.open()
+    for c in layout:
+        page = doc.new_page()
+        if c in "ta":
+            page.insert_textbox(fitz.Rect(50, 50, 545, 300), TEXT, fontsize=11)
+        if c == "s":
+            page.insert_image(page.rect, pixmap=scan)
+        if c == "a":
+            page.insert_image(fitz.Rect(50, 400, 400, 700), pixmap=scan)
+    return doc.tobytes()
+
+
+@pytest.fixture
+def ocr(fake_ocr):
+    return fake_ocr(text=lambda img: "Texto reconhecido pelo OCR rápido." * 2)
+
+
+def test_stratified_sample_spreads_over_the_document():
+    sample = stratified_sample(1000, 16)
+    assert len(sample) == 16 and sample[0] <= 63 and sample[-1] >= 938
+    assert stratified_sample(3, 16) == [1, 2, 3]
+
+
+def test_page_lists_are_complete(ocr):
+    # o laço antigo parava na pág. 6 (6 % batch_size == 0) e perdia 7–10
+    res = fast_classify(_make_pdf("tttttsttts"), tiered=True)
+    kind, text_pages, ocr_pages = res                    # compatível com a tupla
+    assert isinstance(res, Classification) and kind == "hybrid"
+    assert text_pages == [1, 2, 3, 4, 5, 7, 8, 9]
+    assert ocr_pages == [6, 10]
+    assert len(res.labels) == 10
+    assert {l.method for l in res.labels} == {"native"}
+    assert res.confidence >= 0.5
+
+
+def test_ambiguous_pages_use_quick_ocr_in_parallel(ocr):
+    data = _make_pdf("tatats")
+    serial   = fast_classify(data, workers=1)
+    parallel = fast_classify(data, workers=4)
+    assert serial == parallel
+    assert [l.method for l in serial.labels].count("quick_ocr") == 2
+    assert serial.ocr_pages == [2, 4, 6]
+
+
+def test_budget_exhausted_infers_remaining_pages(ocr):
+    with PDFContext(_make_pdf("tatats")) as ctx:
+        res = fast_classify(ctx, time_budget=0)
+        assert ctx.classification is res
+    assert ocr.calls == 1                                # só o sanity-check
+    inferred = [l for l in res.labels if l.method == "inferred"]
+    assert [l.page for l in inferred] == [2, 4]
+    assert all(l.has_ocr and l.confidence < 0.5 for l in inferred)
+    assert res.low_confidence_pages == [2, 4]
+    assert res.ocr_pages == [2, 4, 6]
+
+
+def test_text_pages_with_images_are_hybrid(ocr):
+    # texto nativo em todas as páginas não basta para 'text': as imagens
+    # com texto das págs. 1 e 3 ainda precisam de OCR
+    pdf = Path(__file__).parent / "data" / "ocr_e_texto.pdf"
+    kind, text_pages, ocr_pages = fast_classify(str(pdf))
+    assert kind == "hybrid"
+    assert text_pages == [1, 2, 3] and ocr_pages == [1, 3]
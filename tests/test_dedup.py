@@ -0,0 +1,95 @@
+"""
+Testes do índice de quase-duplicatas (dedup.py).
+"""
+import pytest
+
+from lang_hybrid_pdf.dedup import (ExactIndex, NearDupIndex, make_index, normalize,
+                                   page_index)
+from lang_hybrid_pdf.helpers import fingerprint
+from lang_hybrid_pdf.settings import DedupCfg
+
+HEADER = ("PREFEITURA MUNICIPAL DE SÃO JOSÉ – SECRETARIA DE ADMINISTRAÇÃO – "
+          "CONTRATO ADMINISTRATIVO Nº 045/2023 – PROCESSO LICITATÓRIO 112/2023 – "
+          "PREGÃO ELETRÔNICO 031/2023 – FOLHA DE CONTINUAÇÃO ")
+BODY_A = ("Cláusula terceira: o prazo de vigência será de doze meses, contados "
+          "da assinatura, podendo ser prorrogado por igual período.")
+BODY_B = ("Cláusula quarta: o valor global do contrato é de R$ 1.250.000,00, "
+          "pago em parcelas mensais mediante medição aprovada.")
+
+
+def _noisy(text: str) -> str:
+    """Erros típicos de OCR: l→1, o→0, espaços perdidos."""
+    return text.replace("l", "1", 3).replace("o", "0", 2).replace(" d", "d", 2)
+
+
+def test_shared_header_is_not_a_duplicate():
+    assert fingerprint(HEADER + BODY_A) == fingerprint(HEADER + BODY_B)
+    index = NearDupIndex()
+    assert index.add(HEADER + BODY_A) is None
+    assert index.add(HEADER + BODY_B) is None
+    assert len(index) == 2
+
+
+def test_ocr_noise_and_formatting_are_duplicates():
+    index = NearDupIndex()
+    assert index.add(BODY_A) is None
+    assert index.add(BODY_B) is None
+    assert index.add(BODY_A.upper().replace(" ", "  ")) == 0
+    assert index.query(_noisy(BODY_A)) == 0
+    assert index.add(_noisy(BODY_B)) == 1
+    assert len(index) == 2
+
+
+def test_signatures_are_deterministic():
+    a, b = NearDupIndex(), NearDupIndex()
+    norm = normalize(BODY_A)
+    assert (a._hasher.signature(norm) == b._hasher.signature(norm)).all()
+    other = NearDupIndex(DedupCfg(seed=2))
+    assert (a._hasher.signature(norm) != other._hasher.signature(norm)).any()
+
+
+def test_short_texts_only_match_exactly():
+    index = NearDupIndex()
+    assert index.add("Art. 1") is None
+    assert index.add("art 1") == 0
+    assert index.add("Art. 2") is None
+
+
+def test_without_ratio_uses_minhash_only():
+    index = NearDupIndex(DedupCfg(min_ratio=0))
+    index.add(BODY_A)
+    assert index.add(BODY_A + " ") == 0
+    assert index.add(BODY_B) is None
+
+
+def test_page_index_is_exhaustive_ratio():
+    from rapidfuzz.fuzz import ratio
+
+    swapped = BODY_B + " " + BODY_A                   # mesmas frases, outra ordem
+    doc, page = NearDupIndex(), page_index()
+    for index in (doc, page):
+        index.add(BODY_A + " " + BODY_B)
+        assert index.query(_noisy(BODY_A + " " + BODY_B)) == 0    # ratio ≥ 90
+    assert doc.query(swapped) == 0                    # Jaccard ≥ 0.7 basta no documento
+    assert page.query(swapped) is None                # na página, ratio < 90 não
+
+    # todo par com ratio ≥ 90 é duplicata, mesmo sem colidir no LSH
+    short = ["Valor: R$ 12,00", "Valor: R$ 12.00!", "Prazo: 30 dias", "Prazo: 3O dias"]
+    assert ratio(short[0], short[1]) >= 90 and ratio(short[2], short[3]) >= 90
+    page = page_index()
+    assert [page.add(t) for t in short] == [None, 0, None, 1] and len(page) == 2
+    assert isinstance(page_index(DedupCfg(min_ratio=0)), NearDupIndex)
+
+def test_exact_index_and_factory():
+    assert isinstance(make_index(None), ExactIndex)
+    assert isinstance(make_index(), NearDupIndex)
+    exact = ExactIndex()
+    assert exact.add(BODY_A) is None
+    assert exact.add(BODY_A.lower()) == 0
+    assert exact.add(_noisy(BODY_A)) is None
+
+
+@pytest.mark.parametrize("cfg", [DedupCfg(shingle=9), DedupCfg(num_perm=100, bands=32)])
+def test_invalid_config(cfg):
+    with pytest.raises(ValueError):
+        NearDupIndex(cfg)
@@ -0,0 +1,62 @@
+"""
+Testes do contexto compartilhado por documento (lang_hybrid_pdf.document).
+"""
+import io
+import mmap
+from pathlib import Path
+
+import pytest
+
+from lang_hybrid_pdf.document import PDFContext, open_context, page_runs
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+# ----------------------------------------------------------------------
+def test_page_runs():
+    assert page_runs([8, 1, 2, 3, 7]) == [(1, 3), (7, 8)]
+    assert page_runs([]) == []
+
+
+def test_context_from_bytes_matches_path():
+    pdf_path = DATA_DIR / "ocr_e_texto.pdf"
+    with PDFContext(pdf_path) as a, PDFContext(pdf_path.read_bytes()) as b:
+        assert a.page_count == b.page_count
+        assert [a.text(p) for p in range(1, a.page_count + 1)] == \
+               [b.text(p) for p in range(1, b.page_count + 1)]
+
+
+@pytest.mark.parametrize("kind", ["bytearray", "memoryview", "BytesIO", "file", "mmap"])
+def test_context_from_buffers_and_files(kind):
+    pdf_path = DATA_DIR / "ocr_e_texto.pdf"
+    data = pdf_path.read_bytes()
+    with PDFContext(pdf_path) as ref:
+        expected = [ref.text(p) for p in range(1, ref.page_count + 1)]
+
+    with open(pdf_path, "rb") as fh:
+        mm  = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        src = {"bytearray": bytearray(data), "memoryview": memoryview(data),
+               "BytesIO": io.BytesIO(data), "file": fh, "mmap": mm}[kind]
+        with PDFContext(src) as ctx:
+            assert ctx.path is None and isinstance(ctx.data, memoryview)  # sem cópia
+            assert [ctx.text(p) for p in range(1, ctx.page_count + 1)] == expected
+        if kind == "file":
+            assert ctx.name == "ocr_e_texto.pdf"
+        if kind == "BytesIO":
+            src.write(b"%")                # buffer interno liberado no close
+        mm.close()                         # nenhuma view nossa sobrou
+
+
+def test_open_context_borrows_existing():
+    with PDFContext(DATA_DIR / "texto_total.pdf") as ctx:
+        with open_context(ctx) as same:
+            assert same is ctx
+        assert not ctx.doc.is_closed        # emprestado → não fecha
+
+
+def test_loader_accepts_bytes():
+    pdf_path = DATA_DIR / "ocr_e_texto.pdf"
+    from_path  = HybridPDFLoader(str(pdf_path)).load()
+    from_bytes = HybridPDFLoader(pdf_path.read_bytes()).load()
+    assert [d.page_content for d in from_bytes] == [d.page_content for d in from_path]
@@ -0,0 +1,110 @@
+"""
+Testes unitários das utilidades leves de lang_hybrid_pdf.helpers.
+"""
+import time
+
+from lang_hybrid_pdf.helpers import ordered_map
+
+
+# ----------------------------------------------------------------------
+def test_ordered_map_preserves_order():
+    def slow(x):
+        time.sleep(0.01 * (5 - x % 5))    # itens “anteriores” terminam depois
+        return x * x
+
+    items = list(range(20))
+    assert list(ordered_map(slow, items, workers=4)) == [x * x for x in items]
+    assert list(ordered_map(slow, items, workers=1)) == [x * x for x in items]
+
+
+# ----------------------------------------------------------------------
+def test_group_similar_single_batched_encode():
+    """Embeddings em uma única chamada; merge compara com o início do grupo."""
+    import numpy as np
+    from lang_hybrid_pdf.image_layout_ocr import _group_similar
+
+    vecs = {"a1": [1, 0], "a2": [0.9, 0.1], "b1": [0, 1], "b2": [0.1, 0.9]}
+
+    class FakeModel:
+        calls = 0
+
+        def encode(self, texts, normalize_embeddings=False, **kw):
+            FakeModel.calls += 1
+            m = np.array([vecs[t] for t in texts], dtype=float)
+            return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+    model = FakeModel()
+    assert _group_similar(["a1", "a2", "b1", "b2"], model) == ["a1\na2", "b1\nb2"]
+    assert FakeModel.calls == 1
+    assert _group_similar([], model) == []
+
+
+# ----------------------------------------------------------------------
+def test_adjust_chunks_splits_and_merges():
+    from langchain_core.documents import Document
+    from lang_hybrid_pdf.helpers import adjust_chunks_to_token_limit
+
+    words = lambda s: len(s.split())               # tokenizer plugável
+    docs = [
+        Document("a b", metadata={"page": 1, "bbox": (0, 0, 10, 10)}),
+        Document("c d", metadata={"page": 1, "bbox": (0, 20, 10, 30)}),
+        Document("e", metadata={"page": 2, "bbox": (0, 0, 5, 5)}),
+        Document(" ".join(f"w{i}" for i in range(25)), metadata={"page": 2}),
+    ]
+    assert adjust_chunks_to_token_limit(docs, None) is docs
+
+    out = adjust_chunks_to_token_limit(docs, 10, tokenizer=words)
+    assert all(words(d.page_content) <= 10 for d in out)
+    # pequenos da mesma página juntados, bbox = união
+    assert out[0].page_content == "a b\nc d"
+    assert out[0].metadata["bbox"] == (0, 0, 10, 30)
+    # nunca junta páginas diferentes; grande é dividido sem perder texto
+    assert all(d.metadata["page"] == 2 for d in out[1:])
+    assert " ".join(d.page_content for d in out[1:]).split() == (
+        ["e"] + [f"w{i}" for i in range(25)]
+    )
+
+
+def test_adjust_chunks_keeps_pageless_chunks_and_metadata():
+    from langchain_core.documents import Document
+    from lang_hybrid_pdf.helpers import _merge_meta, adjust_chunks_to_token_limit
+
+    words = lambda s: len(s.split())
+    dl = lambda n: {"dl_meta": {"doc_items": [{"prov": [{"page_no": n}]}]}}
+    docling = [Document("a", metadata=dl(1)), Document("b", metadata=dl(2))]
+    out = adjust_chunks_to_token_limit(docling, 10, tokenizer=words)
+    assert [d.metadata for d in out] == [d.metadata for d in docling]   # sem `page`
+
+    merged = _merge_meta({"page": 1, **dl(1)}, {"page": 1, "line": 7, "extra": "x", **dl(1)})
+    assert merged["line"] == 7 and merged["extra"] == "x"
+    assert len(merged["dl_meta"]["doc_items"]) == 2
+
+def test_approx_tokenizer_hard_split():
+    from lang_hybrid_pdf.helpers import _split_text
+    from lang_hybrid_pdf.tokenizer import approx_token_count
+
+    pieces = _split_text("x" * 400, 10, approx_token_count)
+    assert "".join(p for p, _ in pieces) == "x" * 400
+    assert all(n <= 10 for _, n in pieces)
+
+
+# ----------------------------------------------------------------------
+def test_box_index_matches_boxes_iou():
+    import random
+    from lang_hybrid_pdf.helpers import BoxIndex, boxes_iou
+
+    rnd = random.Random(0)
+    def box():
+        x, y = rnd.uniform(0, 500), rnd.uniform(0, 700)
+        return (x, y, x + rnd.uniform(0, 200), y + rnd.uniform(0, 200))
+
+    idx, boxes = BoxIndex(capacity=2), []
+    assert not idx.overlaps(box())
+    for _ in range(300):                      # força o crescimento do array
+        b = box()
+        idx.add(b)
+        boxes.append(b)
+    for _ in range(50):
+        q = box()
+        assert list(idx.iou(q)) == [boxes_iou(q, b) for b in boxes]
+        assert idx.overlaps(q) == any(boxes_iou(q, b) >= 0.5 for b in boxes)
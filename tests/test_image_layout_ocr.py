@@ -0,0 +1,56 @@
+"""
+Testes do OCR de PDFs 100 % imagem (image_layout_ocr) que não dependem
+do Tesseract nem dos extras.
+"""
+import io
+
+import fitz
+from langchain_core.documents import Document
+
+from lang_hybrid_pdf.document import PDFContext
+from lang_hybrid_pdf.image_layout_ocr import (
+    _build_ocr_pdf,
+    _remap_pages,
+    layout_ocr_from_pdf,
+    render_page,
+)
+
+
+def _one_page_pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    return doc.tobytes()
+
+
+# ----------------------------------------------------------------------
+def test_build_ocr_pdf_in_memory():
+    pages = (_one_page_pdf(f"pagina {i}") for i in range(3))
+    with fitz.open(stream=_build_ocr_pdf(pages), filetype="pdf") as doc:
+        assert doc.page_count == 3
+        assert [p.get_text().strip() for p in doc] == ["pagina 0", "pagina 1", "pagina 2"]
+
+
+def test_remap_pages_of_partial_chunk():
+    docs = [
+        Document("a", metadata={"page": 1}),
+        Document("b", metadata={"dl_meta": {"doc_items": [{"prov": [{"page_no": 2}]}]}}),
+    ]
+    _remap_pages(docs, [33, 34])
+    assert docs[0].metadata["page"] == 33                     # 0-based
+    assert docs[1].metadata["dl_meta"]["doc_items"][0]["prov"][0]["page_no"] == 34
+
+
+def test_render_page_uses_the_open_document():
+    with PDFContext(memoryview(_one_page_pdf("x"))) as ctx:
+        pix = render_page(ctx, 1, dpi=72)
+        assert isinstance(pix, fitz.Pixmap) and (pix.width, pix.height) == (595, 842)
+
+
+def test_plain_pipeline_from_memory_in_parallel(fake_ocr):
+    ocr   = fake_ocr(text=lambda img: f"pagina {img.width}x{img.height}")
+    data  = bytearray(_one_page_pdf("a"))
+    docs  = layout_ocr_from_pdf(data, pipeline="plain", workers=3)
+    again = layout_ocr_from_pdf(io.BytesIO(data), pipeline="plain")
+    assert [d.page_content for d in docs] == ["pagina 2480x3509"]
+    assert [d.page_content for d in again] == [d.page_content for d in docs]
+    assert all(isinstance(img, fitz.Pixmap) for img in ocr.images)   # PyMuPDF, sem poppler
@@ -0,0 +1,65 @@
+"""
+Import rápido: `import lang_hybrid_pdf` não carrega dependências pesadas.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import lang_hybrid_pdf
+
+SRC   = str(Path(lang_hybrid_pdf.__file__).resolve().parents[1])
+HEAVY = ("fitz", "pymupdf", "PIL", "numpy", "pytesseract", "pdf2image",
+         "rapidfuzz", "langchain_core", "langchain_community", "docling")
+
+# orçamento (µs, acumulado do pacote) – folgado p/ máquinas de CI lentas
+BUDGET_US = int(os.environ.get("LANG_HYBRID_PDF_IMPORT_BUDGET_US", 100_000))
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": SRC + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def _heavy_loaded(code: str) -> list:
+    probe = f"{code}; import sys; print([m for m in {HEAVY!r} if m in sys.modules])"
+    return eval(_python(probe).stdout.strip().splitlines()[-1])
+
+
+def test_import_time_budget():
+    err = _python("import lang_hybrid_pdf", "-X", "importtime").stderr
+    row = next(l for l in err.splitlines() if l.rstrip().endswith("| lang_hybrid_pdf"))
+    cumulative = int(row.split("|")[1])
+    assert cumulative < BUDGET_US, row
+
+
+@pytest.mark.parametrize("code", [
+    "import lang_hybrid_pdf",
+    "from lang_hybrid_pdf import Stats, set_tokenizer, OCRCache, warmup",
+    "import lang_hybrid_pdf.batch",
+])
+def test_no_heavy_dependency_on_import(code):
+    assert _heavy_loaded(code) == []
+
+
+def test_public_api_resolves_lazily():
+    assert set(lang_hybrid_pdf.__all__) <= set(dir(lang_hybrid_pdf))
+    from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+    assert lang_hybrid_pdf.HybridPDFLoader is HybridPDFLoader
+    assert isinstance(lang_hybrid_pdf.__version__, str)
+    with pytest.raises(AttributeError):
+        lang_hybrid_pdf.nao_existe
+
+
+def test_warmup_preloads_stages():
+    loaded = _heavy_loaded("import lang_hybrid_pdf as m; m.warmup('classify', 'hybrid')")
+    assert {"fitz", "rapidfuzz", "langchain_core"} <= set(loaded)
+    assert "pytesseract" not in loaded
+
+    took = lang_hybrid_pdf.warmup("hybrid", "tokenizer")
+    assert set(took) == {"hybrid", "tokenizer"} and None not in took.values()
+    with pytest.raises(ValueError):
+        lang_hybrid_pdf.warmup("gpu")
@@ -0,0 +1,80 @@
+"""
+Testes da re-extração incremental (incremental.py + HybridPDFLoader.load_incremental).
+"""
+import json
+
+import fitz
+
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.incremental import DOC_ID_KEY, page_fingerprints
+from lang_hybrid_pdf.document import PDFContext
+
+
+def _plain(docs):
+    return [json.loads(json.dumps(
+        [d.page_content, {k: v for k, v in d.metadata.items() if k != DOC_ID_KEY}]))
+        for d in docs]
+
+
+def test_fingerprint_is_stable_across_resave(image_pdf):
+    data = image_pdf(["A", "B", "A"])
+    with PDFContext(data) as ctx:
+        fps = page_fingerprints(ctx)
+    resaved = fitz.open(stream=data, filetype="pdf").tobytes(garbage=4, deflate=True)
+    with PDFContext(resaved) as ctx:
+        assert page_fingerprints(ctx) == fps
+    assert fps[1] == fps[3] != fps[2]
+
+
+def test_only_changed_pages_are_reextracted(fake_ocr, image_pdf, ocr_loader, tmp_path):
+    ocr = fake_ocr()
+    manifest = tmp_path / "contrato.manifest.json"
+
+    v1  = image_pdf(["Página 1", "Página 2", "Página 3", "Página 4"])
+    r1  = ocr_loader(v1, 4).load_incremental(manifest)
+    assert ocr.calls == 4 and r1.changed_pages == [1, 2, 3, 4]
+    assert len(r1.added) == 4 and r1.removed == []
+    assert manifest.exists()
+
+    ocr.calls = 0
+    again = ocr_loader(v1, 4).load_incremental(manifest)
+    assert ocr.calls == 0 and again.changed_pages == []
+    assert again.added == again.removed == []
+    assert _plain(again.documents) == _plain(r1.documents)
+
+    ocr.calls = 0
+    v2 = image_pdf(["Página 1", "Página 2", "Página 3 (revisada)", "Página 4"])
+    r2 = ocr_loader(v2, 4).load_incremental(manifest)
+    assert ocr.calls == 1 and r2.changed_pages == [3]
+    assert [d.metadata["page"] for d in r2.added] == [3]
+    assert [d.metadata["page"] for d in r2.removed] == [3]
+    assert r2.removed[0].page_content == r1.documents[2].page_content
+
+    full = ocr_loader(v2, 4).load()
+    assert _plain(r2.documents) == _plain(full)
+
+
+def test_moved_pages_are_reused_with_new_numbers(fake_ocr, image_pdf, ocr_loader):
+    ocr = fake_ocr()
+
+    r1 = ocr_loader(image_pdf(["Página 1", "Página 2"]), 2).load_incremental()
+    ocr.calls = 0
+    v2 = image_pdf(["Capa nova", "Página 1", "Página 2"])
+    r2 = ocr_loader(v2, 3).load_incremental(r1.manifest)
+
+    assert ocr.calls == 1 and r2.changed_pages == [1]
+    assert [d.metadata["page"] for d in r2.documents] == [1, 2, 3]
+    assert _plain(r2.documents) == _plain(ocr_loader(v2, 3).load())
+    assert len(r2.removed) == 2                       # nº de página mudou
+
+
+def test_other_config_discards_manifest(fake_ocr, image_pdf, ocr_loader):
+    ocr = fake_ocr()
+    data = image_pdf(["Página 1", "Página 2"])
+
+    r1 = ocr_loader(data, 2).load_incremental()
+    ocr.calls = 0
+    other = HybridPDFLoader(data, text_pages=[], ocr_pages=[1, 2], block_gate=None,
+                            ocr_lang="eng")
+    r2 = other.load_incremental(r1.manifest)
+    assert ocr.calls == 2 and r2.changed_pages == [1, 2]
@@ -10,6 +10,7 @@ Requisitos:
 from pathlib import Path
 import pytest
 
+from lang_hybrid_pdf.dedup import NearDupIndex
 from lang_hybrid_pdf.extractor_router import extract_text, fast_classify
 from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
 
@@ -43,6 +44,47 @@ def test_loader_direct_use():
     loader = HybridPDFLoader(str(pdf_path))
     docs = loader.load()
     assert len(docs) > 0, "Loader não retornou chunks"
-    # Não deve haver duplicatas pelo fingerprint (prefixo de 120 chars)
-    prefixes = [d.page_content[:120] for d in docs]
-    assert len(prefixes) == len(set(prefixes)), "Deduplicação falhou"
+    # Não deve haver quase-duplicatas (mesmo índice MinHash/LSH do loader)
+    index = NearDupIndex()
+    assert all(index.add(d.page_content) is None for d in docs), "Deduplicação falhou"
+
+# ----------------------------------------------------------------------
+def test_loader_parallel_matches_serial(fake_ocr):
+    """workers > 1 deve produzir exatamente a mesma saída do modo serial."""
+    import threading
+
+    ocr = fake_ocr()                       # determinístico; anota a thread de cada chamada
+    pdf_path = str(DATA_DIR / "ocr_e_texto.pdf")
+    kw = dict(text_pages=[1, 2, 3], ocr_pages=[1, 3], block_gate=None, region_ocr=None)
+
+    serial = HybridPDFLoader(pdf_path, **kw).load()
+    assert ocr.threads and set(ocr.threads) == {threading.get_ident()}
+
+    ocr.threads.clear()
+    parallel = HybridPDFLoader(pdf_path, workers=4, **kw).load()
+    assert ocr.threads and threading.get_ident() not in ocr.threads   # no pool
+    assert [(d.page_content, d.metadata) for d in parallel] == \
+           [(d.page_content, d.metadata) for d in serial]
+    assert any("texto reconhecido do bloco" in d.page_content for d in parallel)
+
+# ----------------------------------------------------------------------
+def test_lazy_load_matches_load():
+    """lazy_load() é um gerador e produz a mesma sequência de load()."""
+    import types
+    loader = HybridPDFLoader(str(DATA_DIR / "ocr_e_texto.pdf"))
+    lazy = loader.lazy_load()
+    assert isinstance(lazy, types.GeneratorType)
+    assert [d.page_content for d in lazy] == [d.page_content for d in loader.load()]
+
+# ----------------------------------------------------------------------
+def test_tiered_classify_skips_quick_ocr_on_native_text(monkeypatch):
+    """Páginas só com texto nativo são decididas sem renderizar/OCR."""
+    from lang_hybrid_pdf import extractor_router
+
+    def boom(*a, **k):
+        raise AssertionError("OCR rápido não deveria rodar")
+
+    # _quick_ocr_chars: o OCR das páginas ambíguas e do _quick_ocr
+    monkeypatch.setattr(extractor_router, "_quick_ocr_chars", boom)
+    kind, text_pages, ocr_pages = fast_classify(str(DATA_DIR / "texto_total.pdf"))
+    assert (kind, text_pages, ocr_pages) == ("text", [1, 2], [])
@@ -0,0 +1,77 @@
+"""
+Testes dos motores de OCR (ocr_backends).
+"""
+import sys
+import threading
+import time
+import types
+
+import fitz
+import pytest
+
+from lang_hybrid_pdf import ocr_backends
+from lang_hybrid_pdf.helpers import ordered_map
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    """Módulo `tesserocr` falso: conta quantos handles (traineddata) nascem."""
+    created = []
+
+    class PyTessBaseAPI:
+        def __init__(self, lang):
+            created.append(lang)
+            self.busy = threading.Lock()
+
+        def SetPageSegMode(self, psm):
+            pass
+
+        def SetImageBytes(self, *args):
+            assert self.busy.acquire(blocking=False), "handle usado por 2 threads"
+
+        def GetUTF8Text(self):
+            time.sleep(0.005)
+            self.busy.release()
+            return "texto"
+
+    mod = types.SimpleNamespace(PyTessBaseAPI=PyTessBaseAPI, PSM=int)
+    monkeypatch.setitem(sys.modules, "tesserocr", mod)
+    return created
+
+
+def test_tesserocr_handles_outlive_the_thread_pools(fake_tesserocr):
+    backend = ocr_backends.TesserocrBackend()
+    pix     = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 8, 8))
+
+    def run(_):
+        return backend.image_to_string(pix, lang="por")
+
+    for _ in range(3):                       # um ThreadPoolExecutor por chamada
+        assert list(ordered_map(run, range(16), workers=4)) == ["texto"] * 16
+    assert 1 <= len(fake_tesserocr) <= 4     # nunca mais handles que chamadas simultâneas
+
+    backend.image_to_string(pix, lang="eng", config="--psm 6")
+    assert fake_tesserocr.count("eng") == 1
+
+
+def test_pytesseract_runs_tracked_without_patching_the_module(tmp_path, monkeypatch):
+    """O tesseract roda num TrackedPopen nosso; o pytesseract fica intacto."""
+    import subprocess
+
+    import pytesseract
+
+    from lang_hybrid_pdf.cancel import CancelScope, cancel_scope
+
+    fake = tmp_path / "tesseract"           # tesseract IN OUT -l LANG [ext]
+    fake.write_text('#!/bin/sh\nprintf "texto %s" "$4" > "$2.txt"\n')
+    fake.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(fake))
+
+    backend = ocr_backends.PytesseractBackend()
+    assert pytesseract.pytesseract.subprocess is subprocess
+
+    scope = CancelScope()
+    with cancel_scope(scope):
+        pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 8, 8))
+        assert backend.image_to_string(pix, lang="por") == "texto por"
+    assert not scope._procs                   # desregistrado ao terminar
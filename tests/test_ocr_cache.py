@@ -0,0 +1,79 @@
+"""
+Testes do cache de OCR (lang_hybrid_pdf.ocr_cache) – não exigem Tesseract.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from lang_hybrid_pdf import ocr, ocr_backends
+from lang_hybrid_pdf.ocr_cache import MemoryOCRCache, SQLiteOCRCache, cache_key
+
+
+# ----------------------------------------------------------------------
+def test_cache_key_depends_on_pixels_and_settings():
+    a = cache_key(b"\x00" * 16, lang="por", dpi=300)
+    assert a == cache_key(b"\x00" * 16, dpi=300, lang="por")
+    assert a != cache_key(b"\x01" * 16, lang="por", dpi=300)
+    assert a != cache_key(b"\x00" * 16, lang="por", dpi=120)
+
+
+def test_sqlite_cache_lru_eviction(tmp_path):
+    cache = SQLiteOCRCache(tmp_path / "ocr.sqlite", max_bytes=25)
+    cache.set("a", b"x" * 10)
+    cache.set("b", b"x" * 10)
+    assert cache.get("a") == b"x" * 10         # “a” passa a ser o mais recente
+    cache.set("c", b"x" * 10)                  # estoura → remove “b”
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats() == {"hits": 2, "misses": 1, "bytes": 20}
+
+    # persistente entre instâncias
+    cache.close()
+    assert len(SQLiteOCRCache(tmp_path / "ocr.sqlite", max_bytes=25)) == 2
+
+
+
+
+def test_counters_exact_under_threads():
+    """hits/misses não perdem incrementos vindos do pool de OCR."""
+    cache = MemoryOCRCache()
+    cache.set("a", b"x")
+
+    def hammer(_):
+        for _ in range(2000):
+            cache.get("a")
+            cache.get("b")
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(hammer, range(8)))
+    assert cache.stats() == {"hits": 16000, "misses": 16000}
+def test_image_to_string_served_from_cache(monkeypatch):
+    calls = []
+
+    def fake_run(self, img, extension, lang, config):     # o subprocesso tesseract
+        calls.append(img.size)
+        return "texto reconhecido".encode()
+
+    monkeypatch.setattr(ocr_backends.PytesseractBackend, "_run", fake_run)
+    monkeypatch.setattr(ocr_backends, "_current", ocr_backends.PytesseractBackend())
+    cache = MemoryOCRCache()
+    img   = Image.new("RGB", (40, 20), "white")
+
+    for _ in range(3):
+        assert ocr.image_to_string(img, lang="por", cache=cache, dpi=300) \
+            == "texto reconhecido"
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_pixmap_goes_to_backend_without_pil_copy(fake_ocr):
+    """fitz.Pixmap é aceito diretamente e entra na chave do cache."""
+    import fitz
+
+    rec   = fake_ocr(text=lambda img: "ok")
+    pix   = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 30, 10), False)
+    cache = MemoryOCRCache()
+    assert ocr.image_to_string(pix, lang="por", cache=cache) == "ok"
+    assert ocr.image_to_string(pix, lang="por", cache=cache) == "ok"
+    assert [type(img).__name__ for img in rec.images] == ["Pixmap"]
+    assert ocr_backends.to_pil(pix).size == (30, 10)
@@ -0,0 +1,78 @@
+"""
+Testes da rasterização cinza/binarizada para o OCR (raster.py).
+"""
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+
+from lang_hybrid_pdf.raster import (
+    binarize_image,
+    binarize_pixmap,
+    otsu_threshold,
+    prepare_image,
+    render_pixmap,
+)
+from lang_hybrid_pdf.stats import Stats
+from lang_hybrid_pdf.ocr import image_to_string
+
+
+def _page() -> fitz.Page:
+    doc  = fitz.open()
+    page = doc.new_page(width=300, height=200)
+    page.draw_rect(fitz.Rect(0, 0, 300, 200), color=None, fill=(0.85, 0.85, 0.85))
+    page.insert_text((20, 60), "Contrato 2024", fontsize=18)
+    return page
+
+
+def test_otsu_splits_bimodal_histogram():
+    hist = np.zeros(256)
+    hist[30], hist[220] = 500, 1500
+    t = otsu_threshold(hist)
+    assert 30 <= t < 220
+    assert otsu_threshold(np.zeros(256)) == 128
+    assert otsu_threshold(np.eye(256)[77] * 10) == 128   # um só tom
+
+
+def test_gray_render_moves_a_third_of_the_bytes():
+    page = _page()
+    rgb  = render_pixmap(page, 100, mode="rgb")
+    gray = render_pixmap(page, 100, mode="gray")
+    assert (gray.n, rgb.n) == (1, 3)
+    assert rgb.stride * rgb.height >= 3 * gray.stride * gray.height
+
+
+def test_binarize_pixmap_is_in_place():
+    page = _page()
+    pix  = render_pixmap(page, 100, mode="gray")
+    assert len(set(pix.samples)) > 2                      # fundo cinza + texto
+    out  = binarize_pixmap(pix)
+    assert out is pix
+    assert set(pix.samples) == {0, 255}
+    assert pix.pixel(2, 2) == (255,)                      # fundo cinza → branco
+
+    with pytest.raises(ValueError):
+        binarize_pixmap(render_pixmap(page, 50, mode="rgb"))
+
+
+def test_binary_mode_and_pil_path_agree():
+    page = _page()
+    pix  = render_pixmap(page, 72, mode="binary")
+    img  = Image.frombytes("L", (pix.width, pix.height),
+                           render_pixmap(page, 72, mode="gray").samples)
+    assert binarize_image(img).tobytes() == pix.samples
+    assert prepare_image(img.convert("RGB"), mode="gray").mode == "L"
+    assert prepare_image(img, mode="rgb") is img
+
+    with pytest.raises(ValueError):
+        render_pixmap(page, 72, mode="cmyk")
+
+
+def test_backend_receives_gray_pixmap(fake_ocr):
+    seen  = fake_ocr(text=lambda img: "ok").images
+    stats = Stats()
+    pix   = render_pixmap(_page(), 100)
+    image_to_string(pix, lang="por", stats=stats)
+
+    assert seen == [pix] and seen[0].n == 1               # sem conversão no meio
+    assert stats.snapshot()["counters"]["ocr.bytes"] == pix.stride * pix.height
@@ -0,0 +1,134 @@
+"""
+Testes do OCR da página numa passada (region_ocr + HybridPDFLoader).
+"""
+import fitz
+import numpy as np
+import pytest
+
+from lang_hybrid_pdf.hybrid_pdf_loader import HybridPDFLoader
+from lang_hybrid_pdf.region_ocr import make_plan, render_region, split_words, use_page_mode
+from lang_hybrid_pdf.settings import RegionCfg
+from lang_hybrid_pdf.stats import Stats
+
+NATIVE = fitz.Rect(40, 300, 500, 330)          # texto nativo entre as fatias
+SLICES = [fitz.Rect(40, y, 500, y + 45) for y in (100, 150, 200, 250, 340, 390)]
+
+
+def _slice_pixmap(n: int) -> fitz.Pixmap:
+    tmp  = fitz.open()
+    page = tmp.new_page(width=460, height=45)
+    page.insert_text((8, 28), f"Fatia {n} do contrato escaneado", fontsize=16)
+    return page.get_pixmap(dpi=150)
+
+
+def _make_pdf() -> bytes:
+    """Uma página 'fatiada' pelo scanner + uma linha de texto nativo."""
+    doc  = fitz.open()
+    page = doc.new_page()
+    for n, rect in enumerate(SLICES):
+        page.insert_image(rect, pixmap=_slice_pixmap(n))
+    page.insert_text((NATIVE.x0, NATIVE.y1 - 10), "Texto nativo que não deve ir ao OCR.",
+                     fontsize=14)
+    return doc.tobytes()
+
+
+def _bands(img):
+    """Caixas (left, top, width, height) das faixas horizontais de tinta."""
+    a   = np.frombuffer(img.samples_mv, dtype=np.uint8)
+    a   = a.reshape(img.height, img.stride)[:, : img.width * img.n : img.n]
+    ink = a < 128
+    rows = np.flatnonzero(ink.any(axis=1))
+    if not rows.size:
+        return []
+    cuts = np.flatnonzero(np.diff(rows) > 1)
+    out  = []
+    for top, bottom in zip(np.r_[rows[0], rows[cuts + 1]], np.r_[rows[cuts], rows[-1]]):
+        cols = np.flatnonzero(ink[top:bottom + 1].any(axis=0))
+        out.append((int(cols[0]), int(top), int(cols[-1] - cols[0] + 1),
+                    int(bottom - top + 1)))
+    return out
+
+
+def _band_data(img):
+    """OCR falso: cada faixa horizontal de tinta vira uma palavra (com caixa)."""
+    bands = _bands(img)
+    return {
+        "text":      [f"faixa{k}" for k in range(len(bands))],
+        "conf":      [91.0] * len(bands),
+        "left":      [b[0] for b in bands],
+        "top":       [b[1] for b in bands],
+        "width":     [b[2] for b in bands],
+        "height":    [b[3] for b in bands],
+        "block_num": [1] * len(bands),
+        "par_num":   [1] * len(bands),
+        "line_num":  list(range(1, len(bands) + 1)),
+    }
+
+
+@pytest.fixture
+def ocr(fake_ocr):
+    return fake_ocr(data=_band_data)
+
+
+def _loader(data, **kw) -> HybridPDFLoader:
+    return HybridPDFLoader(data, text_pages=[], ocr_pages=[1], block_gate=None,
+                           min_ocr_chars=5, **kw)
+
+
+def test_page_mode_choice():
+    page = (0, 0, 595, 842)
+    few  = [(0, (40, 100, 500, 145)), (1, (40, 150, 500, 195))]
+    assert not use_page_mode(page, few)                          # poucos e pequenos
+    assert use_page_mode(page, few + [(2, (40, 200, 500, 245)), (3, (40, 250, 500, 295))])
+    assert use_page_mode(page, [(0, (0, 0, 595, 420)), (1, (0, 421, 595, 842))])  # área
+    spread = [(k, (x, y, x + 40, y + 40)) for k, (x, y) in
+              enumerate([(0, 0), (550, 0), (0, 800), (550, 800)])]
+    assert not use_page_mode(page, spread)                       # recorte quase vazio
+    assert use_page_mode(page, few[:1], RegionCfg(mode="page"))
+    assert not use_page_mode(page, spread, RegionCfg(mode="block"))
+    with pytest.raises(ValueError):
+        use_page_mode(page, few, RegionCfg(mode="x"))
+
+
+def test_native_text_is_masked(ocr):
+    with fitz.open(stream=_make_pdf(), filetype="pdf") as doc:
+        page   = doc[0]
+        blocks = page.get_text("dict")["blocks"]
+        cands  = [(i, b["bbox"]) for i, b in enumerate(blocks) if b["type"] == 1]
+        plan   = make_plan(blocks, cands)
+        assert len(plan.boxes) == 6 and len(plan.masks) == 1
+        texts, lost = split_words(ocr.image_to_data(render_region(page, plan, 100),
+                                                    lang="por"), plan, 100)
+    assert lost == 0
+    assert sorted(texts) == [i for i, _ in cands]
+    for idx, bbox in cands:
+        for word in texts[idx][1]["ocr_words"]:
+            assert fitz.Rect(bbox).contains(fitz.Rect(word["bbox"]))
+
+
+def test_single_pass_replaces_per_block_ocr(ocr):
+    data  = _make_pdf()
+    stats = Stats()
+    docs  = _loader(data, stats=stats).load()
+    assert ocr.calls == 1 and stats.counters["blocks.region_pages"] == 1
+    ocr_docs = [d for d in docs if "ocr_words" in d.metadata]
+    assert len(ocr_docs) == 6
+    for d in ocr_docs:
+        words = d.metadata["ocr_words"]
+        assert d.page_content == "\n".join(w["text"] for w in words)
+        assert d.metadata["ocr_conf"] == 91.0 and d.metadata["ocr_dpi"] > 0
+        assert all(fitz.Rect(d.metadata["bbox"]).contains(fitz.Rect(w["bbox"]))
+                   for w in words)
+    assert any("Texto nativo" in d.page_content for d in docs)
+
+    ocr.calls = 0
+    per_block = _loader(data, region_ocr=None).load()
+    assert ocr.calls == 6 and len(per_block) == len(docs)
+
+
+def test_parallel_matches_serial(ocr):
+    data = _make_pdf()
+    serial   = _loader(data).load()
+    parallel = _loader(data, workers=4).load()
+    assert [(d.page_content, d.metadata) for d in parallel] == \
+           [(d.page_content, d.metadata) for d in serial]
@@ -0,0 +1,44 @@
+"""
+Testes da instrumentação opt-in (lang_hybrid_pdf.stats).
+"""
+from pathlib import Path
+
+from lang_hybrid_pdf import Stats, extract_text
+from lang_hybrid_pdf.stats import NULL_STATS
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+# ----------------------------------------------------------------------
+def test_stats_records_stages_counters_and_sinks():
+    events = []
+    stats  = Stats(sinks=[lambda *ev: events.append(ev)])
+
+    with stats.stage("ocr", page=2):
+        pass
+    stats.ocr_call("string", 100, 50, dpi=300)
+    stats.label("route", "hybrid")
+
+    snap = stats.snapshot()
+    assert snap["stages"]["ocr"]["calls"] == 1
+    assert "ocr" in snap["pages"][2]
+    assert snap["counters"]["ocr.calls"] == 1
+    assert snap["counters"]["ocr.pixels"] == 5000
+    assert snap["labels"] == {"route": "hybrid"}
+    assert {e[0] for e in events} == {"timing", "counter", "label"}
+    assert 'stage="ocr"' in stats.to_prometheus()
+
+
+def test_null_stats_is_noop():
+    with NULL_STATS.stage("x"):
+        NULL_STATS.incr("y")
+    assert NULL_STATS.snapshot() == {}
+
+
+def test_extract_text_reports_route():
+    stats = Stats()
+    docs  = extract_text(str(DATA_DIR / "texto_total.pdf"), stats=stats)
+    assert docs
+    snap = stats.snapshot()
+    assert snap["labels"]["route"] == "text"
+    assert {"classify", "docling"} <= set(snap["stages"])
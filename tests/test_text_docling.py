@@ -0,0 +1,46 @@
+"""
+Testes do wrapper do Docling (text_docling) com módulos falsos.
+"""
+import sys
+import types
+
+import pytest
+from langchain_core.documents import Document
+
+from lang_hybrid_pdf import text_docling
+
+
+@pytest.fixture
+def fake_docling(monkeypatch):
+    """langchain_docling / docling falsos: anotam conversores e intervalos."""
+    made, calls = [], []
+
+    class DocumentConverter:
+        def __init__(self):
+            made.append(self)
+
+    class DoclingLoader:
+        def __init__(self, file_path, export_type, converter=None, convert_kwargs=None):
+            calls.append((converter, (convert_kwargs or {}).get("page_range")))
+
+        def load(self):
+            return [Document("trecho")]
+
+    lc = types.SimpleNamespace(
+        DoclingLoader=DoclingLoader,
+        loader=types.SimpleNamespace(ExportType=types.SimpleNamespace(DOC_CHUNKS="chunks")),
+    )
+    monkeypatch.setitem(sys.modules, "langchain_docling", lc)
+    monkeypatch.setitem(sys.modules, "docling.document_converter",
+                        types.SimpleNamespace(DocumentConverter=DocumentConverter))
+    monkeypatch.setattr(text_docling, "_CONVERTER", None)
+    return made, calls
+
+
+def test_one_converter_per_process(fake_docling):
+    made, calls = fake_docling
+    docs = text_docling.load_with_docling("a.pdf", pages=[1, 3, 5])
+    text_docling.load_with_docling("b.pdf", pages=[2, 3])
+    assert len(docs) == 3 and len(made) == 1
+    assert [rng for _, rng in calls] == [(1, 1), (3, 3), (5, 5), (2, 3)]
+    assert all(conv is made[0] for conv, _ in calls)